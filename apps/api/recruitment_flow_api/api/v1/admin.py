@@ -0,0 +1,159 @@
+"""
+Admin endpoints.
+
+This module contains operational endpoints restricted to
+administrators, such as infrastructure diagnostics and maintenance
+jobs.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+
+from recruitment_flow_api.api.v1.auth import get_current_user
+from recruitment_flow_api.api.v1.jobs import JobAcceptedResponse
+from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.instrumentation import query_stats
+from recruitment_flow_api.core.jobs import job_queue
+from recruitment_flow_api.core.keyspace import analyze_keyspace
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import get_redis_stats
+
+# Create router
+router = APIRouter()
+
+# Logger
+logger = get_logger("admin")
+
+
+# Admin dependencies
+async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    """
+    Require an administrator.
+    
+    Args:
+        current_user: Current authenticated user
+        
+    Returns:
+        User data
+        
+    Raises:
+        HTTPException: If the user is not an administrator
+    """
+    if "*" not in current_user.get("permissions", []):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required",
+        )
+    return current_user
+
+
+# Endpoints
+@router.get("/redis/stats")
+async def redis_stats(current_user: dict = Depends(require_admin)):
+    """
+    Get Redis server, pool and cache statistics.
+    
+    Args:
+        current_user: Current authenticated administrator
+        
+    Returns:
+        Redis statistics
+    """
+    return await get_redis_stats()
+
+
+@router.get("/redis/keyspace")
+async def redis_keyspace(
+    sample_size: Optional[int] = Query(None, ge=1, le=1000000, description="Maximum keys to inspect"),
+    match: str = Query("*", description="SCAN MATCH pattern"),
+    depth: int = Query(1, ge=1, le=5, description="Key segments that form a prefix"),
+    oversized_bytes: Optional[int] = Query(None, ge=1, description="Flag keys at least this large"),
+    top: int = Query(20, ge=1, le=500, description="Keys listed per flag"),
+    current_user: dict = Depends(require_admin),
+):
+    """
+    Report Redis memory usage by key prefix.
+    
+    Args:
+        sample_size: Maximum keys to inspect
+        match: SCAN MATCH pattern
+        depth: Key segments that form a prefix
+        oversized_bytes: Flag keys at least this large
+        top: Keys listed per flag
+        current_user: Current authenticated administrator
+        
+    Returns:
+        Key-space report
+    """
+    logger.info(f"Key-space analysis requested by user: {current_user['id']}")
+    
+    return await analyze_keyspace(
+        sample_size=sample_size,
+        match=match,
+        prefix_depth=depth,
+        oversized_bytes=oversized_bytes,
+        top_n=top,
+    )
+
+
+@router.get("/db/queries")
+async def database_queries(
+    limit: int = Query(10, ge=1, le=100, description="Number of fingerprints"),
+    order_by: str = Query(
+        "total_time",
+        pattern="^(total_time|mean_time|max_time|calls)$",
+        description="Sort order",
+    ),
+    current_user: dict = Depends(require_admin),
+):
+    """
+    Get the most expensive database statements by fingerprint.
+    
+    Statistics are per API worker process.
+    
+    Args:
+        limit: Number of fingerprints
+        order_by: Sort order
+        current_user: Current authenticated administrator
+        
+    Returns:
+        Statement fingerprint statistics
+    """
+    return {"queries": query_stats.top(limit, order_by=order_by)}
+
+
+@router.post("/eeo/rollups/rebuild", response_model=JobAcceptedResponse, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_eeo_rollups(
+    organization_id: Optional[str] = Query(None, description="Rebuild one organization (defaults to all)"),
+    current_user: dict = Depends(require_admin),
+):
+    """
+    Rebuild the daily EEO rollups from the stage event log.
+    
+    Args:
+        organization_id: Rebuild one organization (defaults to all)
+        current_user: Current authenticated administrator
+        
+    Returns:
+        Queued rebuild job
+        
+    Raises:
+        HTTPException: If EEO reporting is disabled
+    """
+    if not settings.EEO_REPORTING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="EEO reporting is disabled",
+        )
+    
+    logger.info(f"EEO rollup rebuild requested by user: {current_user['id']}")
+    
+    job_id = await job_queue.enqueue(
+        "eeo_rollups.rebuild",
+        {"organization_id": organization_id},
+        priority="low",
+        organization_id=current_user["organization_id"],
+    )
+    
+    return JobAcceptedResponse.for_job(job_id)
@@ -5,13 +5,21 @@ This module contains all analytics and reporting endpoints
 including pipeline analytics, EEO reporting, and adverse impact analysis.
 """
 
+from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from recruitment_flow_api.api.v1.auth import get_current_user
+from recruitment_flow_api.core.analytics_engine import analytics_engine
+from recruitment_flow_api.core.caching import cached_endpoint
+from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.database import get_db_for
+from recruitment_flow_api.core.eeo import adverse_impact_report, analyze_counts, eeo_report, load_selection_counts
 from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.pipeline_counters import get_stage_counts
 
 # Create router
 router = APIRouter()
@@ -44,47 +52,62 @@ class AdverseImpactAnalysis(BaseModel):
 
 # Endpoints
 @router.get("/pipeline", response_model=PipelineAnalytics)
+@cached_endpoint(tags=["candidates", "roles"])
 async def get_pipeline_analytics(
-    date_from: Optional[str] = Query(None, description="Start date for analytics"),
-    date_to: Optional[str] = Query(None, description="End date for analytics"),
+    date_from: Optional[date] = Query(None, description="Start date for analytics"),
+    date_to: Optional[date] = Query(None, description="End date for analytics"),
     role_id: Optional[str] = Query(None, description="Filter by role"),
     current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_for("analytics")),
 ):
     """
     Get pipeline analytics.
     
+    Stage counts come from the materialized pipeline-stage counters,
+    so the cost does not grow with the number of candidates.
+    
     Args:
         date_from: Start date for analytics
         date_to: End date for analytics
         role_id: Filter by role
         current_user: Current authenticated user
+        session: Analytics database session
         
     Returns:
         Pipeline analytics data
     """
-    # TODO: Implement actual pipeline analytics logic
-    # This is a placeholder implementation
-    
     logger.info(f"Pipeline analytics request by user: {current_user['id']}")
     
-    # Mock analytics data
+    counts = await get_stage_counts(
+        session,
+        current_user["organization_id"],
+        role_id=role_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    entered = counts["entered"]
+    
+    def conversion(from_status: str, to_status: str) -> float:
+        return round(entered[to_status] / entered[from_status], 2) if entered[from_status] else 0.0
+    
+    history = await analytics_engine.time_to_hire(
+        current_user["organization_id"],
+        date_from=date_from,
+        date_to=date_to,
+        role_id=role_id,
+    )
+    
     analytics = PipelineAnalytics(
-        total_candidates=150,
-        pipeline_stages={
-            "applied": 45,
-            "screening": 30,
-            "interviewing": 20,
-            "offered": 10,
-            "hired": 5,
-        },
+        total_candidates=sum(counts["current"].values()),
+        pipeline_stages=counts["current"],
         conversion_rates={
-            "screening_to_interview": 0.67,
-            "interview_to_offer": 0.50,
-            "offer_to_hire": 0.50,
+            "screening_to_interview": conversion("screening", "interviewing"),
+            "interview_to_offer": conversion("interviewing", "offered"),
+            "offer_to_hire": conversion("offered", "hired"),
         },
         time_to_hire={
-            "average_days": 25,
-            "median_days": 22,
+            "average_days": history["average_time_to_hire"],
+            "median_days": history["median_time_to_hire"],
         },
     )
     
@@ -93,10 +116,11 @@ async def get_pipeline_analytics(
 
 @router.get("/eeo", response_model=EEOReport)
 async def get_eeo_report(
-    date_from: Optional[str] = Query(None, description="Start date for report"),
-    date_to: Optional[str] = Query(None, description="End date for report"),
+    date_from: Optional[date] = Query(None, description="Start date for report"),
+    date_to: Optional[date] = Query(None, description="End date for report"),
     role_id: Optional[str] = Query(None, description="Filter by role"),
     current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_for("analytics")),
 ):
     """
     Get EEO compliance data.
@@ -106,166 +130,89 @@ async def get_eeo_report(
         date_to: End date for report
         role_id: Filter by role
         current_user: Current authenticated user
+        session: Analytics database session
         
     Returns:
         EEO compliance report
     """
-    # TODO: Implement actual EEO reporting logic
-    # This is a placeholder implementation
-    
     logger.info(f"EEO report request by user: {current_user['id']}")
     
-    # Mock EEO data
-    eeo_report = EEOReport(
-        total_applications=150,
-        applications_by_demographic={
-            "gender": {
-                "male": 80,
-                "female": 60,
-                "non_binary": 5,
-                "prefer_not_to_say": 5,
-            },
-            "race": {
-                "white": 70,
-                "black": 20,
-                "hispanic": 25,
-                "asian": 25,
-                "other": 10,
-            },
-        },
-        selection_rates={
-            "gender": {
-                "male": 0.15,
-                "female": 0.12,
-                "non_binary": 0.20,
-                "prefer_not_to_say": 0.20,
-            },
-            "race": {
-                "white": 0.14,
-                "black": 0.10,
-                "hispanic": 0.12,
-                "asian": 0.16,
-                "other": 0.10,
-            },
-        },
-        adverse_impact_analysis={
-            "gender": {
-                "impact_ratio": 0.80,
-                "statistically_significant": False,
-                "four_fifths_rule_violation": False,
-            },
-            "race": {
-                "impact_ratio": 0.71,
-                "statistically_significant": True,
-                "four_fifths_rule_violation": True,
-            },
-        },
+    if not settings.EEO_REPORTING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="EEO reporting is disabled",
+        )
+    
+    counts = await load_selection_counts(
+        session,
+        current_user["organization_id"],
+        date_from=date_from,
+        date_to=date_to,
+        role_id=role_id,
     )
+    analyses = await analyze_counts(counts)
     
-    return eeo_report
+    return EEOReport(**eeo_report(counts, analyses))
 
 
 @router.get("/adverse-impact", response_model=AdverseImpactAnalysis)
 async def get_adverse_impact_analysis(
-    date_from: Optional[str] = Query(None, description="Start date for analysis"),
-    date_to: Optional[str] = Query(None, description="End date for analysis"),
+    date_from: Optional[date] = Query(None, description="Start date for analysis"),
+    date_to: Optional[date] = Query(None, description="End date for analysis"),
     role_id: Optional[str] = Query(None, description="Filter by role"),
     current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_for("analytics")),
 ):
     """
     Get adverse impact analysis.
     
+    Each dimension's lowest-rated group is compared with its
+    highest-rated group (four-fifths rule, Fisher exact, chi-square
+    and z tests), pooled and stratified by role.
+    
     Args:
         date_from: Start date for analysis
         date_to: End date for analysis
         role_id: Filter by role
         current_user: Current authenticated user
+        session: Analytics database session
         
     Returns:
         Adverse impact analysis
     """
-    # TODO: Implement actual adverse impact analysis logic
-    # This is a placeholder implementation
-    
     logger.info(f"Adverse impact analysis request by user: {current_user['id']}")
     
-    # Mock adverse impact data
-    adverse_impact = AdverseImpactAnalysis(
-        protected_groups={
-            "gender": ["male", "female", "non_binary"],
-            "race": ["white", "black", "hispanic", "asian", "other"],
-            "age": ["18-24", "25-34", "35-44", "45-54", "55+"],
-        },
-        selection_rates={
-            "gender": {
-                "male": 0.15,
-                "female": 0.12,
-                "non_binary": 0.20,
-            },
-            "race": {
-                "white": 0.14,
-                "black": 0.10,
-                "hispanic": 0.12,
-                "asian": 0.16,
-                "other": 0.10,
-            },
-            "age": {
-                "18-24": 0.08,
-                "25-34": 0.16,
-                "35-44": 0.14,
-                "45-54": 0.12,
-                "55+": 0.10,
-            },
-        },
-        four_fifths_rule={
-            "gender": {
-                "impact_ratio": 0.80,
-                "violation": False,
-                "threshold": 0.80,
-            },
-            "race": {
-                "impact_ratio": 0.71,
-                "violation": True,
-                "threshold": 0.80,
-            },
-            "age": {
-                "impact_ratio": 0.83,
-                "violation": False,
-                "threshold": 0.80,
-            },
-        },
-        statistical_significance={
-            "gender": {
-                "p_value": 0.15,
-                "significant": False,
-                "confidence_level": 0.95,
-            },
-            "race": {
-                "p_value": 0.03,
-                "significant": True,
-                "confidence_level": 0.95,
-            },
-            "age": {
-                "p_value": 0.08,
-                "significant": False,
-                "confidence_level": 0.95,
-            },
-        },
+    if not settings.EEO_REPORTING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="EEO reporting is disabled",
+        )
+    
+    counts = await load_selection_counts(
+        session,
+        current_user["organization_id"],
+        date_from=date_from,
+        date_to=date_to,
+        role_id=role_id,
     )
+    analyses = await analyze_counts(counts)
     
-    return adverse_impact
+    return AdverseImpactAnalysis(**adverse_impact_report(analyses))
 
 
 @router.get("/time-to-hire")
 async def get_time_to_hire_analytics(
-    date_from: Optional[str] = Query(None, description="Start date for analytics"),
-    date_to: Optional[str] = Query(None, description="End date for analytics"),
+    date_from: Optional[date] = Query(None, description="Start date for analytics"),
+    date_to: Optional[date] = Query(None, description="End date for analytics"),
     role_id: Optional[str] = Query(None, description="Filter by role"),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Get time to hire analytics.
     
+    Computed from the candidate stage event log by the columnar
+    analytics engine; durations are in days.
+    
     Args:
         date_from: Start date for analytics
         date_to: End date for analytics
@@ -275,45 +222,29 @@ async def get_time_to_hire_analytics(
     Returns:
         Time to hire analytics
     """
-    # TODO: Implement actual time to hire analytics logic
-    # This is a placeholder implementation
-    
     logger.info(f"Time to hire analytics request by user: {current_user['id']}")
     
-    return {
-        "average_time_to_hire": 25,
-        "median_time_to_hire": 22,
-        "time_by_stage": {
-            "application_to_screening": 2,
-            "screening_to_interview": 5,
-            "interview_to_offer": 10,
-            "offer_to_acceptance": 3,
-            "acceptance_to_start": 5,
-        },
-        "time_by_role": {
-            "engineering": 28,
-            "product": 22,
-            "sales": 18,
-            "marketing": 20,
-        },
-        "trends": {
-            "last_30_days": 24,
-            "last_90_days": 26,
-            "last_6_months": 25,
-        },
-    }
+    return await analytics_engine.time_to_hire(
+        current_user["organization_id"],
+        date_from=date_from,
+        date_to=date_to,
+        role_id=role_id,
+    )
 
 
 @router.get("/source-effectiveness")
 async def get_source_effectiveness_analytics(
-    date_from: Optional[str] = Query(None, description="Start date for analytics"),
-    date_to: Optional[str] = Query(None, description="End date for analytics"),
+    date_from: Optional[date] = Query(None, description="Start date for analytics"),
+    date_to: Optional[date] = Query(None, description="End date for analytics"),
     role_id: Optional[str] = Query(None, description="Filter by role"),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Get source effectiveness analytics.
     
+    Candidates are grouped by the source they applied through, for
+    applications within the date range.
+    
     Args:
         date_from: Start date for analytics
         date_to: End date for analytics
@@ -323,48 +254,11 @@ async def get_source_effectiveness_analytics(
     Returns:
         Source effectiveness analytics
     """
-    # TODO: Implement actual source effectiveness analytics logic
-    # This is a placeholder implementation
-    
     logger.info(f"Source effectiveness analytics request by user: {current_user['id']}")
     
-    return {
-        "sources": {
-            "linkedin": {
-                "total_candidates": 60,
-                "hired_candidates": 8,
-                "conversion_rate": 0.13,
-                "average_quality_score": 85,
-            },
-            "referral": {
-                "total_candidates": 25,
-                "hired_candidates": 5,
-                "conversion_rate": 0.20,
-                "average_quality_score": 92,
-            },
-            "indeed": {
-                "total_candidates": 40,
-                "hired_candidates": 4,
-                "conversion_rate": 0.10,
-                "average_quality_score": 78,
-            },
-            "greenhouse": {
-                "total_candidates": 15,
-                "hired_candidates": 2,
-                "conversion_rate": 0.13,
-                "average_quality_score": 82,
-            },
-        },
-        "cost_per_hire": {
-            "linkedin": 2500,
-            "referral": 500,
-            "indeed": 1800,
-            "greenhouse": 1200,
-        },
-        "time_to_hire_by_source": {
-            "linkedin": 28,
-            "referral": 18,
-            "indeed": 32,
-            "greenhouse": 25,
-        },
-    }
+    return await analytics_engine.source_effectiveness(
+        current_user["organization_id"],
+        date_from=date_from,
+        date_to=date_to,
+        role_id=role_id,
+    )
@@ -7,7 +7,7 @@ for the FastAPI application.
 
 from fastapi import APIRouter
 
-from recruitment_flow_api.api.v1 import auth, roles, candidates, interviews, offers, analytics
+from recruitment_flow_api.api.v1 import auth, roles, candidates, interviews, offers, analytics, jobs, admin
 
 # Create main API router
 api_router = APIRouter()
@@ -19,3 +19,5 @@ api_router.include_router(candidates.router, prefix="/candidates", tags=["Candid
 api_router.include_router(interviews.router, prefix="/interviews", tags=["Interviews"])
 api_router.include_router(offers.router, prefix="/offers", tags=["Offers"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
@@ -11,7 +11,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
 
 from recruitment_flow_api.api.v1.auth import get_current_user
+from recruitment_flow_api.api.v1.jobs import JobAcceptedResponse
+from recruitment_flow_api.core.bulk_import import bulk_import_candidates
+from recruitment_flow_api.core.caching import invalidate_endpoint_cache, invalidates_cache
+from recruitment_flow_api.core.jobs import job_queue
 from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.pagination import DEFAULT_SORT, KeysetPage
 
 # Create router
 router = APIRouter()
@@ -91,8 +96,14 @@ class ScreeningResult(BaseModel):
 # Endpoints
 @router.get("/", response_model=CandidateListResponse)
 async def list_candidates(
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    sort: str = Query(
+        DEFAULT_SORT,
+        pattern="^-?(created_at|updated_at|name)$",
+        description="Sort key, prefixed with - for descending",
+    ),
+    include_total: bool = Query(False, description="Include the total count"),
     search: Optional[str] = Query(None, description="Search term"),
     role_id: Optional[str] = Query(None, description="Filter by role"),
     status: Optional[str] = Query(None, description="Filter by status"),
@@ -103,8 +114,10 @@ async def list_candidates(
     List candidates with pagination and filtering.
     
     Args:
-        page: Page number
+        cursor: Cursor from the previous page
         limit: Items per page
+        sort: Sort key, prefixed with - for descending
+        include_total: Include the total count
         search: Search term for name or email
         role_id: Filter by role
         status: Filter by status
@@ -156,18 +169,19 @@ async def list_candidates(
         ),
     ]
     
+    candidates, pagination = KeysetPage(cursor, limit, sort).build(
+        mock_candidates,
+        total=150 if include_total else None,
+    )
+    
     return CandidateListResponse(
-        candidates=mock_candidates,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": 150,
-            "pages": 8,
-        },
+        candidates=candidates,
+        pagination=pagination,
     )
 
 
 @router.post("/", response_model=CandidateResponse)
+@invalidates_cache("candidates")
 async def create_candidate(
     candidate_data: CandidateCreate,
     current_user: dict = Depends(get_current_user),
@@ -208,7 +222,7 @@ async def create_candidate(
     return new_candidate
 
 
-@router.post("/import")
+@router.post("/import", response_model=JobAcceptedResponse, status_code=status.HTTP_202_ACCEPTED)
 async def import_candidates(
     import_data: CandidateImportRequest,
     current_user: dict = Depends(get_current_user),
@@ -216,24 +230,30 @@ async def import_candidates(
     """
     Bulk import candidates from various sources.
     
+    The import runs in a background worker; poll the returned job
+    for the import results.
+    
     Args:
         import_data: Import data with candidates
         current_user: Current authenticated user
         
     Returns:
-        Import results
+        Queued import job
     """
-    # TODO: Implement actual candidate import logic
-    # This is a placeholder implementation
-    
     logger.info(f"Candidate import request by user: {current_user['id']}")
     
-    return {
-        "message": f"Successfully imported {len(import_data.candidates)} candidates",
-        "imported_count": len(import_data.candidates),
-        "source": import_data.source,
-        "role_id": import_data.role_id,
-    }
+    job_id = await job_queue.enqueue(
+        "candidates.import",
+        {
+            **import_data.dict(),
+            "user_id": current_user["id"],
+            "organization_id": current_user["organization_id"],
+        },
+        priority="low",
+        organization_id=current_user["organization_id"],
+    )
+    
+    return JobAcceptedResponse.for_job(job_id)
 
 
 @router.get("/{candidate_id}", response_model=CandidateResponse)
@@ -284,6 +304,7 @@ async def get_candidate(
 
 
 @router.put("/{candidate_id}", response_model=CandidateResponse)
+@invalidates_cache("candidates")
 async def update_candidate(
     candidate_id: str,
     candidate_data: CandidateUpdate,
@@ -328,6 +349,7 @@ async def update_candidate(
 
 
 @router.delete("/{candidate_id}")
+@invalidates_cache("candidates")
 async def delete_candidate(
     candidate_id: str,
     current_user: dict = Depends(get_current_user),
@@ -350,7 +372,11 @@ async def delete_candidate(
     return {"message": f"Candidate {candidate_id} deleted successfully"}
 
 
-@router.post("/screen/{role_id}/{candidate_id}", response_model=ScreeningResult)
+@router.post(
+    "/screen/{role_id}/{candidate_id}",
+    response_model=JobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def screen_candidate(
     role_id: str,
     candidate_id: str,
@@ -359,18 +385,86 @@ async def screen_candidate(
     """
     Run AI-powered screening for a candidate.
     
+    Screening runs in a background worker; poll the returned job for
+    the screening results.
+    
     Args:
         role_id: Role identifier
         candidate_id: Candidate identifier
         current_user: Current authenticated user
         
+    Returns:
+        Queued screening job
+    """
+    logger.info(f"Screening request for candidate: {candidate_id}, role: {role_id}")
+    
+    job_id = await job_queue.enqueue(
+        "candidates.screen",
+        {
+            "role_id": role_id,
+            "candidate_id": candidate_id,
+            "user_id": current_user["id"],
+            "organization_id": current_user["organization_id"],
+        },
+        priority="high",
+        organization_id=current_user["organization_id"],
+    )
+    
+    return JobAcceptedResponse.for_job(job_id)
+
+
+# Background jobs
+@job_queue.handler("candidates.import")
+async def run_import(payload: dict) -> dict:
+    """
+    Import a batch of candidates.
+    
+    Args:
+        payload: Import request data with the requesting user
+        
+    Returns:
+        Import results
+    """
+    import_data = CandidateImportRequest(**payload)
+    logger.info(f"Importing {len(import_data.candidates)} candidates for user: {payload['user_id']}")
+    
+    results = await bulk_import_candidates(
+        payload["organization_id"],
+        (candidate.dict() for candidate in import_data.candidates),
+        role_id=import_data.role_id,
+        source=import_data.source,
+    )
+    
+    return {
+        "message": f"Imported {results['rows']} candidates",
+        "imported_count": results["inserted"],
+        "updated_count": results["updated"],
+        "duplicate_count": results["duplicates"],
+        "skipped_count": results["skipped"],
+        "rows_per_second": results["rows_per_second"],
+        "batches": results["batches"],
+        "source": import_data.source,
+        "role_id": import_data.role_id,
+    }
+
+
+@job_queue.handler("candidates.screen")
+async def run_screening(payload: dict) -> dict:
+    """
+    Screen a candidate against a role.
+    
+    Args:
+        payload: Role and candidate identifiers
+        
     Returns:
         Screening results
     """
     # TODO: Implement actual AI screening logic
     # This is a placeholder implementation
     
-    logger.info(f"Screening request for candidate: {candidate_id}, role: {role_id}")
+    role_id = payload["role_id"]
+    candidate_id = payload["candidate_id"]
+    logger.info(f"Screening candidate: {candidate_id}, role: {role_id}")
     
     # Mock screening results
     screening_result = ScreeningResult(
@@ -400,4 +494,6 @@ async def screen_candidate(
         created_at="2024-01-15T10:30:00Z",
     )
     
-    return screening_result
+    await invalidate_endpoint_cache(payload["organization_id"], "candidates")
+    
+    return screening_result.dict()
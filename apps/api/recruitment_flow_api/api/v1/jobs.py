@@ -0,0 +1,81 @@
+"""
+Jobs endpoints.
+
+This module contains endpoints for tracking background jobs
+such as candidate imports and AI screening.
+"""
+
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+
+from recruitment_flow_api.api.v1.auth import get_current_user
+from recruitment_flow_api.core.config import API_V1_STR
+from recruitment_flow_api.core.jobs import job_queue
+from recruitment_flow_api.core.logging import get_logger
+
+# Create router
+router = APIRouter()
+
+# Logger
+logger = get_logger("jobs")
+
+
+# Request/Response models
+class JobAcceptedResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    
+    @classmethod
+    def for_job(cls, job_id: str) -> "JobAcceptedResponse":
+        return cls(
+            job_id=job_id,
+            status="queued",
+            status_url=f"{API_V1_STR}/jobs/{job_id}",
+        )
+
+
+class JobStatusResponse(BaseModel):
+    id: str
+    type: str
+    priority: str
+    status: str
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+    next_attempt_at: Optional[float] = None
+
+
+# Endpoints
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Get background job status and result.
+    
+    Args:
+        job_id: Job identifier
+        current_user: Current authenticated user
+        
+    Returns:
+        Job status
+        
+    Raises:
+        HTTPException: If the job is unknown, expired or owned by another organization
+    """
+    job = await job_queue.get_job(job_id)
+    
+    if job is None or job["organization_id"] not in (None, current_user["organization_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    
+    return JobStatusResponse(**job)
@@ -12,6 +12,7 @@ from pydantic import BaseModel
 
 from recruitment_flow_api.api.v1.auth import get_current_user
 from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.pagination import DEFAULT_SORT, KeysetPage
 
 # Create router
 router = APIRouter()
@@ -66,8 +67,14 @@ class OfferResponseData(BaseModel):
 # Endpoints
 @router.get("/", response_model=OfferListResponse)
 async def list_offers(
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    sort: str = Query(
+        DEFAULT_SORT,
+        pattern="^-?(created_at|updated_at)$",
+        description="Sort key, prefixed with - for descending",
+    ),
+    include_total: bool = Query(False, description="Include the total count"),
     candidate_id: Optional[str] = Query(None, description="Filter by candidate"),
     role_id: Optional[str] = Query(None, description="Filter by role"),
     status: Optional[str] = Query(None, description="Filter by status"),
@@ -77,8 +84,10 @@ async def list_offers(
     List offers with pagination and filtering.
     
     Args:
-        page: Page number
+        cursor: Cursor from the previous page
         limit: Items per page
+        sort: Sort key, prefixed with - for descending
+        include_total: Include the total count
         candidate_id: Filter by candidate
         role_id: Filter by role
         status: Filter by status
@@ -134,14 +143,14 @@ async def list_offers(
         ),
     ]
     
+    offers, pagination = KeysetPage(cursor, limit, sort).build(
+        mock_offers,
+        total=25 if include_total else None,
+    )
+    
     return OfferListResponse(
-        offers=mock_offers,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": 25,
-            "pages": 2,
-        },
+        offers=offers,
+        pagination=pagination,
     )
 
 
@@ -11,7 +11,9 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
 
 from recruitment_flow_api.api.v1.auth import get_current_user
+from recruitment_flow_api.core.caching import cached_endpoint, invalidates_cache
 from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.pagination import DEFAULT_SORT, KeysetPage
 
 # Create router
 router = APIRouter()
@@ -69,9 +71,16 @@ class RoleListResponse(BaseModel):
 
 # Endpoints
 @router.get("/", response_model=RoleListResponse)
+@cached_endpoint(tags=["roles", "candidates"])
 async def list_roles(
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    sort: str = Query(
+        DEFAULT_SORT,
+        pattern="^-?(created_at|updated_at|title)$",
+        description="Sort key, prefixed with - for descending",
+    ),
+    include_total: bool = Query(False, description="Include the total count"),
     search: Optional[str] = Query(None, description="Search term"),
     status: Optional[str] = Query(None, description="Filter by status"),
     department: Optional[str] = Query(None, description="Filter by department"),
@@ -81,8 +90,10 @@ async def list_roles(
     List all roles with pagination and filtering.
     
     Args:
-        page: Page number
+        cursor: Cursor from the previous page
         limit: Items per page
+        sort: Sort key, prefixed with - for descending
+        include_total: Include the total count
         search: Search term for role title
         status: Filter by status
         department: Filter by department
@@ -132,18 +143,19 @@ async def list_roles(
         ),
     ]
     
+    roles, pagination = KeysetPage(cursor, limit, sort).build(
+        mock_roles,
+        total=150 if include_total else None,
+    )
+    
     return RoleListResponse(
-        roles=mock_roles,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": 150,
-            "pages": 8,
-        },
+        roles=roles,
+        pagination=pagination,
     )
 
 
 @router.post("/", response_model=RoleResponse)
+@invalidates_cache("roles")
 async def create_role(
     role_data: RoleCreate,
     current_user: dict = Depends(get_current_user),
@@ -226,6 +238,7 @@ async def get_role(
 
 
 @router.put("/{role_id}", response_model=RoleResponse)
+@invalidates_cache("roles")
 async def update_role(
     role_id: str,
     role_data: RoleUpdate,
@@ -269,6 +282,7 @@ async def update_role(
 
 
 @router.delete("/{role_id}")
+@invalidates_cache("roles")
 async def delete_role(
     role_id: str,
     current_user: dict = Depends(get_current_user),
@@ -0,0 +1,560 @@
+"""
+Columnar analytics over the candidate stage event log.
+
+Time-to-hire and source analytics need every status transition, which
+is too many rows to aggregate per request. The engine loads an
+organization's stage events (see core/stage_events.py) into NumPy
+column arrays, one partition per calendar month, and answers queries
+with vectorized masks and group-bys:
+
+- candidate, role and source strings are dictionary-encoded per
+  organization into int32 codes, statuses into int8 codes;
+- loading is incremental by event ID, since the log is append-only,
+  and new events only grow the partitions of the months they fall in;
+- derived tables (time spent in each stage, application and hire time
+  per candidate) are rebuilt in one pass when events arrive and kept
+  sorted by duration, so any filtered subset is already ordered and
+  percentiles per group only need a stable sort on the group code.
+
+Events are held in process memory per API worker, for up to
+ANALYTICS_ENGINE_MAX_ORGANIZATIONS organizations. New events are
+picked up at most ANALYTICS_ENGINE_REFRESH_INTERVAL seconds late, and
+each organization is reloaded in full in the background after
+ANALYTICS_ENGINE_MAX_AGE seconds, which also picks up events whose
+transaction committed after a higher ID was loaded; requests keep
+being answered from the previous load until the new one is swapped
+in. NumPy work runs in a thread so the event loop keeps serving
+requests.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from recruitment_flow_api.core.config import CANDIDATE_STATUSES, TABLES, settings
+from recruitment_flow_api.core.database import get_engine
+from recruitment_flow_api.core.logging import get_logger
+
+# Logger
+logger = get_logger("analytics_engine")
+
+STATUS_CODES = {status: code for code, status in enumerate(CANDIDATE_STATUSES)}
+HIRED = STATUS_CODES["hired"]
+
+# Code of a missing role, source or status
+MISSING = -1
+
+SECONDS_PER_DAY = 86400
+PERCENTILES = (50, 75, 90)
+
+# Label of events without a role or source
+UNKNOWN = "unknown"
+
+LOAD_SQL = f"""
+SELECT id, candidate_id, role_id, source, from_status, to_status,
+    EXTRACT(EPOCH FROM occurred_at)::bigint AS occurred_at
+FROM {TABLES["candidate_stage_events"]}
+WHERE organization_id = $1 AND id > $2
+ORDER BY id
+LIMIT $3
+"""
+
+
+class _Dictionary:
+    """Dense int32 codes for the distinct strings of a column."""
+    
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+    
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+    
+    def lookup(self, value: str) -> Optional[int]:
+        return self._codes.get(value)
+    
+    def encode(self, values: Sequence[Optional[str]]) -> np.ndarray:
+        return np.fromiter(map(self.code, values), dtype=np.int32, count=len(values))
+
+
+def _encode_statuses(values: Sequence[Optional[str]]) -> np.ndarray:
+    return np.fromiter((STATUS_CODES.get(value, MISSING) for value in values), dtype=np.int8, count=len(values))
+
+
+class _MonthPartition:
+    """Column arrays of one organization's events in one calendar month."""
+    
+    COLUMNS = {
+        "candidate": np.int32,
+        "role": np.int32,
+        "source": np.int32,
+        "from_stage": np.int8,
+        "to_stage": np.int8,
+        "occurred_at": np.int64,
+    }
+    
+    def __init__(self):
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+    
+    def __len__(self) -> int:
+        return len(self.columns["occurred_at"])
+    
+    def append(self, columns: Dict[str, np.ndarray]) -> None:
+        for name, values in columns.items():
+            self.columns[name] = np.concatenate((self.columns[name], values))
+
+
+class _History:
+    """
+    Tables derived from an organization's events.
+    
+    spans holds one row per stage a candidate left (the stage, the
+    candidate's role and source, when it was entered and the days
+    spent in it), sorted by days. applications holds one row per
+    candidate (role and source of the first event, application time,
+    hire time or -1), and hires the hired candidates sorted by days
+    to hire.
+    """
+    
+    def __init__(self, spans: Dict[str, np.ndarray], applications: Dict[str, np.ndarray], hires: Dict[str, np.ndarray]):
+        self.spans = spans
+        self.applications = applications
+        self.hires = hires
+
+
+def _sorted_by(table: Dict[str, np.ndarray], key: str) -> Dict[str, np.ndarray]:
+    order = np.argsort(table[key])
+    return {name: values[order] for name, values in table.items()}
+
+
+def build_history(columns: Dict[str, np.ndarray]) -> _History:
+    """
+    Derive stage spans, applications and hires from event columns.
+    
+    Args:
+        columns: Event columns of all partitions (_MonthPartition.COLUMNS)
+        
+    Returns:
+        Derived tables
+    """
+    # One packed int64 key (candidate code, then seconds since the first event) sorts
+    # several times faster than a two-key lexsort. Partitions hold events in ID order,
+    # so a stable sort keeps same-second events in the order they were logged
+    occurred_at = columns["occurred_at"]
+    offset = occurred_at - occurred_at.min() if len(occurred_at) else occurred_at
+    order = np.argsort((columns["candidate"].astype(np.int64) << 32) | offset, kind="stable")
+    candidate = columns["candidate"][order]
+    role = columns["role"][order]
+    source = columns["source"][order]
+    to_stage = columns["to_stage"][order]
+    occurred_at = columns["occurred_at"][order]
+    
+    # Each event opens a span in its target stage that the candidate's next event closes
+    same_candidate = candidate[1:] == candidate[:-1]
+    closed = np.flatnonzero(same_candidate & (to_stage[:-1] != MISSING))
+    spans = _sorted_by({
+        "stage": to_stage[closed],
+        "role": role[closed],
+        "source": source[closed],
+        "entered_at": occurred_at[closed],
+        "days": (occurred_at[closed + 1] - occurred_at[closed]) / SECONDS_PER_DAY,
+    }, "days")
+    
+    # A candidate's first event is the application, the first move to hired the hire
+    first = np.flatnonzero(np.concatenate(([True], ~same_candidate))[:len(candidate)])
+    hired = np.flatnonzero(to_stage == HIRED)
+    hired_candidates = candidate[hired]
+    hired = hired[np.concatenate(([True], hired_candidates[1:] != hired_candidates[:-1]))[:len(hired)]]
+    
+    hired_at = np.full(len(first), -1, dtype=np.int64)
+    hired_rows = np.searchsorted(candidate[first], candidate[hired])
+    hired_at[hired_rows] = occurred_at[hired]
+    
+    applications = {
+        "role": role[first],
+        "source": source[first],
+        "applied_at": occurred_at[first],
+        "hired_at": hired_at,
+    }
+    hires = _sorted_by({
+        "role": role[first][hired_rows],
+        "source": source[first][hired_rows],
+        "applied_at": occurred_at[first][hired_rows],
+        "hired_at": occurred_at[hired],
+        "days": (occurred_at[hired] - occurred_at[first][hired_rows]) / SECONDS_PER_DAY,
+    }, "days")
+    
+    return _History(spans, applications, hires)
+
+
+def group_stats(groups: np.ndarray, values: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """
+    Count, mean and percentiles of values per group.
+    
+    Values must be sorted ascending: a stable sort on the group code
+    then leaves each group's values in order, and percentiles are read
+    off by position with linear interpolation (as numpy.percentile).
+    
+    Args:
+        groups: Group code per value, in [0, n_groups)
+        values: Values, sorted ascending
+        n_groups: Number of groups
+        
+    Returns:
+        Arrays indexed by group code: "count", "mean" and "p<q>" per
+        percentile in PERCENTILES (NaN for empty groups)
+    """
+    counts = np.bincount(groups, minlength=n_groups)
+    sums = np.bincount(groups, weights=values, minlength=n_groups)
+    nonempty = counts > 0
+    stats = {"count": counts, "mean": np.divide(sums, counts, out=np.full(n_groups, np.nan), where=nonempty)}
+    
+    if not len(values):
+        stats.update({f"p{q}": np.full(n_groups, np.nan) for q in PERCENTILES})
+        return stats
+    
+    # Radix sort for small group codes
+    sort_keys = groups.astype(np.uint16) if n_groups <= np.iinfo(np.uint16).max else groups
+    grouped = values[np.argsort(sort_keys, kind="stable")]
+    starts = np.cumsum(counts) - counts
+    last = np.maximum(counts - 1, 0)
+    
+    for q in PERCENTILES:
+        position = starts + last * (q / 100)
+        lower = np.minimum(np.floor(position).astype(np.int64), len(grouped) - 1)
+        upper = np.minimum(np.minimum(lower + 1, starts + last), len(grouped) - 1)
+        value = grouped[lower] + (grouped[upper] - grouped[lower]) * (position - lower)
+        stats[f"p{q}"] = np.where(nonempty, value, np.nan)
+    return stats
+
+
+def _summaries(stats: Dict[str, np.ndarray], labels: Callable[[int], str]) -> Dict[str, dict]:
+    """Format group_stats() output as {label: summary} for non-empty groups."""
+    return {
+        labels(group): {
+            "count": int(stats["count"][group]),
+            "average_days": round(float(stats["mean"][group]), 1),
+            "median_days": round(float(stats["p50"][group]), 1),
+            **{f"p{q}_days": round(float(stats[f"p{q}"][group]), 1) for q in PERCENTILES if q != 50},
+        }
+        for group in np.flatnonzero(stats["count"])
+    }
+
+
+def _epoch(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+def _in_range(timestamps: np.ndarray, date_from: Optional[date], date_to: Optional[date]) -> np.ndarray:
+    mask = np.ones(len(timestamps), dtype=bool)
+    if date_from is not None:
+        mask &= timestamps >= _epoch(date_from)
+    if date_to is not None:
+        mask &= timestamps < _epoch(date_to + timedelta(days=1))
+    return mask
+
+
+class OrganizationEvents:
+    """An organization's stage events, partitioned by month."""
+    
+    def __init__(self, organization_id: str):
+        self.organization_id = organization_id
+        self.candidates = _Dictionary()
+        self.roles = _Dictionary()
+        self.sources = _Dictionary()
+        self.partitions: Dict[np.datetime64, _MonthPartition] = {}
+        self.history = build_history(self.columns())
+        self.last_id = 0
+        self.loaded_at = time.monotonic()
+        self.refreshed_at = -math.inf
+        self.lock = asyncio.Lock()
+    
+    def __len__(self) -> int:
+        return sum(len(partition) for partition in self.partitions.values())
+    
+    def append(self, records: Sequence[Any]) -> None:
+        """
+        Encode loaded event rows and add them to their month partitions.
+        
+        Args:
+            records: Rows of LOAD_SQL, in ID order
+        """
+        _, candidates, roles, sources, from_statuses, to_statuses, occurred_at = zip(*records)
+        columns = {
+            "candidate": self.candidates.encode(candidates),
+            "role": self.roles.encode(roles),
+            "source": self.sources.encode(sources),
+            "from_stage": _encode_statuses(from_statuses),
+            "to_stage": _encode_statuses(to_statuses),
+            "occurred_at": np.array(occurred_at, dtype=np.int64),
+        }
+        
+        months = columns["occurred_at"].astype("datetime64[s]").astype("datetime64[M]")
+        for month in np.unique(months):
+            in_month = months == month
+            partition = self.partitions.setdefault(month, _MonthPartition())
+            partition.append({name: values[in_month] for name, values in columns.items()})
+        
+        self.last_id = records[-1]["id"]
+    
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Event columns of all partitions, oldest month first."""
+        partitions = [self.partitions[month] for month in sorted(self.partitions)]
+        return {
+            name: np.concatenate([partition.columns[name] for partition in partitions] or [np.empty(0, dtype=dtype)])
+            for name, dtype in _MonthPartition.COLUMNS.items()
+        }
+    
+    def rebuild(self) -> None:
+        """Rebuild the derived tables after new events were appended."""
+        self.history = build_history(self.columns())
+    
+    def role_label(self, code: int) -> str:
+        return self.roles.values[code - 1] if code else UNKNOWN
+    
+    def source_label(self, code: int) -> str:
+        return self.sources.values[code - 1] if code else UNKNOWN
+    
+    def role_mask(self, roles: np.ndarray, role_id: Optional[str]) -> np.ndarray:
+        """Mask of rows for role_id (all rows when None)."""
+        if role_id is None:
+            return np.ones(len(roles), dtype=bool)
+        code = self.roles.lookup(role_id)
+        return roles == (MISSING - 1 if code is None else code)
+
+
+class AnalyticsEngine:
+    """
+    Answers pipeline history queries from in-memory columnar events.
+    
+    Usage:
+        report = await analytics_engine.time_to_hire(organization_id, date_from, date_to)
+    """
+    
+    def __init__(
+        self,
+        max_organizations: Optional[int] = None,
+        refresh_interval: Optional[float] = None,
+        max_age: Optional[float] = None,
+        load_batch_size: Optional[int] = None,
+    ):
+        self.max_organizations = max_organizations or settings.ANALYTICS_ENGINE_MAX_ORGANIZATIONS
+        self.refresh_interval = refresh_interval or settings.ANALYTICS_ENGINE_REFRESH_INTERVAL
+        self.max_age = max_age or settings.ANALYTICS_ENGINE_MAX_AGE
+        self.load_batch_size = load_batch_size or settings.ANALYTICS_ENGINE_LOAD_BATCH_SIZE
+        self._organizations: "OrderedDict[str, OrganizationEvents]" = OrderedDict()
+        self._reloads: Dict[str, asyncio.Task] = {}
+    
+    async def events(self, organization_id: str) -> OrganizationEvents:
+        """
+        Get an organization's events, loading new ones when due.
+        
+        Args:
+            organization_id: Organization ID
+            
+        Returns:
+            Loaded events
+        """
+        events = self._organizations.get(organization_id)
+        if events is None:
+            events = OrganizationEvents(organization_id)
+            self._organizations[organization_id] = events
+        elif time.monotonic() - events.loaded_at > self.max_age and organization_id not in self._reloads:
+            self._reloads[organization_id] = asyncio.create_task(self._reload(organization_id))
+        self._organizations.move_to_end(organization_id)
+        while len(self._organizations) > self.max_organizations:
+            self._organizations.popitem(last=False)
+        
+        async with events.lock:
+            if time.monotonic() - events.refreshed_at >= self.refresh_interval:
+                await self._load(events)
+                events.refreshed_at = time.monotonic()
+        return events
+    
+    async def _reload(self, organization_id: str) -> None:
+        """Load an organization from scratch and swap it in when done."""
+        try:
+            fresh = OrganizationEvents(organization_id)
+            async with fresh.lock:
+                await self._load(fresh)
+                fresh.refreshed_at = time.monotonic()
+            if organization_id in self._organizations:
+                self._organizations[organization_id] = fresh
+        except Exception as e:
+            # The previous load keeps serving; the next request retries
+            logger.warning(f"Reloading stage events for organization {organization_id} failed: {e}")
+        finally:
+            self._reloads.pop(organization_id, None)
+    
+    async def _load(self, events: OrganizationEvents) -> None:
+        """Load events after the last loaded ID and rebuild the derived tables."""
+        started = time.perf_counter()
+        loaded = 0
+        
+        db_engine = await get_engine("analytics")
+        async with db_engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            connection = raw_connection.driver_connection
+            while True:
+                records = await connection.fetch(LOAD_SQL, events.organization_id, events.last_id, self.load_batch_size)
+                if not records:
+                    break
+                await asyncio.to_thread(events.append, records)
+                loaded += len(records)
+                if len(records) < self.load_batch_size:
+                    break
+        
+        if loaded:
+            await asyncio.to_thread(events.rebuild)
+            logger.info(
+                f"Loaded {loaded} stage events for organization {events.organization_id} "
+                f"in {time.perf_counter() - started:.2f}s ({len(events)} in memory)"
+            )
+    
+    async def time_to_hire(
+        self,
+        organization_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        role_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Time to hire and time spent per stage.
+        
+        Hires count when the candidate moved to hired within the range,
+        stage spans when the stage was entered within it. Trends are
+        trailing windows ending at date_to (defaults to today).
+        
+        Args:
+            organization_id: Organization ID
+            date_from: Start of the range
+            date_to: End of the range (inclusive)
+            role_id: Restrict to one role
+            
+        Returns:
+            Time to hire analytics in days
+        """
+        events = await self.events(organization_id)
+        return await asyncio.to_thread(_time_to_hire, events, date_from, date_to, role_id)
+    
+    async def source_effectiveness(
+        self,
+        organization_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        role_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Conversion and time to hire per candidate source.
+        
+        Candidates count towards the source they applied through when
+        they applied within the range, and as hired if they were hired
+        at any time since.
+        
+        Args:
+            organization_id: Organization ID
+            date_from: Start of the range
+            date_to: End of the range (inclusive)
+            role_id: Restrict to one role
+            
+        Returns:
+            Source effectiveness analytics
+        """
+        events = await self.events(organization_id)
+        return await asyncio.to_thread(_source_effectiveness, events, date_from, date_to, role_id)
+
+
+def _time_to_hire(
+    events: OrganizationEvents,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    role_id: Optional[str],
+) -> dict:
+    history = events.history
+    
+    hires = history.hires
+    hire_role = events.role_mask(hires["role"], role_id)
+    in_range = hire_role & _in_range(hires["hired_at"], date_from, date_to)
+    days = hires["days"][in_range]
+    overall = group_stats(np.zeros(len(days), dtype=np.int64), days, 1)
+    
+    spans = history.spans
+    span_mask = events.role_mask(spans["role"], role_id) & _in_range(spans["entered_at"], date_from, date_to)
+    span_days = spans["days"][span_mask]
+    by_stage = group_stats(spans["stage"][span_mask].astype(np.int64), span_days, len(CANDIDATE_STATUSES))
+    
+    # Missing roles and sources (-1) shift to group 0
+    by_role = group_stats(hires["role"][in_range] + 1, days, len(events.roles.values) + 1)
+    by_source = group_stats(hires["source"][in_range] + 1, days, len(events.sources.values) + 1)
+    
+    trends = {}
+    end = date_to or date.today()
+    for label, window in (("last_30_days", 30), ("last_90_days", 90), ("last_6_months", 182)):
+        recent = hire_role & _in_range(hires["hired_at"], end - timedelta(days=window - 1), end)
+        trends[label] = round(float(hires["days"][recent].mean()), 1) if recent.any() else None
+    
+    return {
+        "hired_candidates": int(overall["count"][0]),
+        "average_time_to_hire": round(float(overall["mean"][0]), 1) if len(days) else None,
+        "median_time_to_hire": round(float(overall["p50"][0]), 1) if len(days) else None,
+        "p90_time_to_hire": round(float(overall["p90"][0]), 1) if len(days) else None,
+        "time_by_stage": _summaries(by_stage, lambda code: CANDIDATE_STATUSES[code]),
+        "time_by_role": _summaries(by_role, events.role_label),
+        "time_by_source": _summaries(by_source, events.source_label),
+        "trends": trends,
+    }
+
+
+def _source_effectiveness(
+    events: OrganizationEvents,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    role_id: Optional[str],
+) -> dict:
+    history = events.history
+    n_sources = len(events.sources.values) + 1
+    
+    applications = history.applications
+    cohort = events.role_mask(applications["role"], role_id) & _in_range(applications["applied_at"], date_from, date_to)
+    sources = applications["source"][cohort] + 1
+    totals = np.bincount(sources, minlength=n_sources)
+    hired_totals = np.bincount(sources[applications["hired_at"][cohort] >= 0], minlength=n_sources)
+    
+    # Days to hire of the cohort's hires, still sorted by days
+    hires = history.hires
+    hired_in_cohort = events.role_mask(hires["role"], role_id) & _in_range(hires["applied_at"], date_from, date_to)
+    by_source = group_stats(hires["source"][hired_in_cohort] + 1, hires["days"][hired_in_cohort], n_sources)
+    
+    report = {}
+    for code in np.flatnonzero(totals):
+        report[events.source_label(code)] = {
+            "total_candidates": int(totals[code]),
+            "hired_candidates": int(hired_totals[code]),
+            "conversion_rate": round(float(hired_totals[code] / totals[code]), 3),
+            "average_time_to_hire": round(float(by_source["mean"][code]), 1) if by_source["count"][code] else None,
+            "median_time_to_hire": round(float(by_source["p50"][code]), 1) if by_source["count"][code] else None,
+        }
+    
+    return {
+        "sources": report,
+        "time_to_hire_by_source": {
+            source: summary["median_time_to_hire"]
+            for source, summary in report.items()
+            if summary["median_time_to_hire"] is not None
+        },
+    }
+
+
+# Global instance
+analytics_engine = AnalyticsEngine()
@@ -0,0 +1,211 @@
+"""
+Bulk candidate import.
+
+This module ingests large candidate exports (ATS dumps of 100k+
+rows) without per-row inserts. Each batch is streamed with COPY into
+a transaction-scoped staging table and merged into the candidates
+table with a single INSERT ... ON CONFLICT, deduplicating on the
+normalized (trimmed, lower-cased) email within an organization. Each
+batch commits with its pipeline-stage counter updates, stage events
+and a "candidates.imported" outbox event, which invalidates cached
+candidate listings.
+
+The merge relies on a unique index over the normalized email:
+    
+    CREATE UNIQUE INDEX candidates_org_email_key
+        ON candidates (organization_id, lower(email));
+"""
+
+import json
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+from recruitment_flow_api.core.config import TABLES, settings
+from recruitment_flow_api.core.database import get_engine
+from recruitment_flow_api.core.logging import get_logger
+
+# Logger
+logger = get_logger("bulk_import")
+
+STAGING_TABLE = "candidate_import_staging"
+
+# Columns copied from each import row, in COPY order
+IMPORT_COLUMNS = (
+    "name",
+    "email",
+    "phone",
+    "role_id",
+    "source",
+    "resume_url",
+    "linkedin_url",
+    "experience_years",
+    "current_company",
+    "current_title",
+)
+
+# Staging columns: input order, tenant and initial status, then the import row
+COPY_COLUMNS = ("ordinal", "organization_id", "status", *IMPORT_COLUMNS)
+
+# Columns refreshed on an existing candidate; NULLs in the import keep current values
+UPDATE_COLUMNS = tuple(column for column in IMPORT_COLUMNS if column not in ("email", "role_id"))
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE {STAGING_TABLE} (ordinal integer, LIKE candidates INCLUDING DEFAULTS)
+ON COMMIT DROP
+"""
+
+# New candidates are also counted into the pipeline-stage counters and
+# logged as stage events
+MERGE_SQL = f"""
+WITH merged AS (
+    INSERT INTO {TABLES["candidates"]} (organization_id, status, {", ".join(IMPORT_COLUMNS)})
+    SELECT DISTINCT ON (lower(email)) organization_id, status, {", ".join(IMPORT_COLUMNS)}
+    FROM {STAGING_TABLE}
+    ORDER BY lower(email), ordinal DESC
+    ON CONFLICT (organization_id, lower(email)) DO UPDATE SET
+        {", ".join(f"{column} = COALESCE(EXCLUDED.{column}, candidates.{column})" for column in UPDATE_COLUMNS)},
+        updated_at = now()
+    RETURNING (xmax = 0) AS inserted, id, organization_id, role_id, source, status
+),
+counted AS (
+    INSERT INTO {TABLES["pipeline_stage_counts"]} (organization_id, role_id, status, day, net, entered)
+    SELECT organization_id, role_id, status, (now() AT TIME ZONE 'UTC')::date, COUNT(*), COUNT(*)
+    FROM merged
+    WHERE inserted
+    GROUP BY organization_id, role_id, status
+    ON CONFLICT (organization_id, role_id, status, day) DO UPDATE SET
+        net = {TABLES["pipeline_stage_counts"]}.net + EXCLUDED.net,
+        entered = {TABLES["pipeline_stage_counts"]}.entered + EXCLUDED.entered
+),
+logged AS (
+    INSERT INTO {TABLES["candidate_stage_events"]} (organization_id, candidate_id, role_id, source, from_status, to_status)
+    SELECT organization_id, id::text, role_id, source, NULL, status
+    FROM merged
+    WHERE inserted
+)
+SELECT inserted FROM merged
+"""
+
+OUTBOX_SQL = f"""
+INSERT INTO {TABLES["outbox"]} (id, organization_id, event_type, payload)
+VALUES ($1, $2, $3, $4)
+"""
+
+
+def _record(row: Dict[str, Any], ordinal: int, defaults: Dict[str, Any]) -> tuple:
+    values = {**defaults, **{key: row[key] for key in IMPORT_COLUMNS if row.get(key) is not None}}
+    values["email"] = values["email"].strip()
+    # Organization and status travel through COPY so they take the candidates column types
+    return (ordinal, *(values.get(column) for column in COPY_COLUMNS[1:]))
+
+
+async def bulk_import_candidates(
+    organization_id: str,
+    rows: Iterable[Dict[str, Any]],
+    role_id: Optional[str] = None,
+    source: Optional[str] = None,
+    status: str = "applied",
+    batch_size: Optional[int] = None,
+) -> dict:
+    """
+    Upsert candidates in batches using COPY and INSERT ... ON CONFLICT.
+    
+    Every batch commits in its own transaction on the jobs engine, so
+    a failure only rolls back the batch in flight and earlier batches
+    stay imported. Within a batch the last row for an email wins;
+    rows for an email that already exists update that candidate.
+    
+    Args:
+        organization_id: Organization that owns the candidates
+        rows: Candidate rows (CandidateCreate fields)
+        role_id: Role for rows without one
+        source: Source for rows without one
+        status: Status of newly created candidates
+        batch_size: Rows per batch (defaults to CANDIDATE_IMPORT_BATCH_SIZE)
+        
+    Returns:
+        Totals and per-batch statistics
+    """
+    batch_size = batch_size or settings.CANDIDATE_IMPORT_BATCH_SIZE
+    db_engine = await get_engine("jobs")
+    
+    defaults = {
+        "organization_id": organization_id,
+        "status": status,
+        "role_id": role_id,
+        "source": source,
+    }
+    batches: List[dict] = []
+    skipped = 0
+    started = time.perf_counter()
+    
+    async with db_engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        connection = raw_connection.driver_connection
+        
+        async def merge(records: List[tuple]) -> None:
+            batch_started = time.perf_counter()
+            async with connection.transaction():
+                await connection.execute(CREATE_STAGING_SQL)
+                await connection.copy_records_to_table(
+                    STAGING_TABLE,
+                    records=records,
+                    columns=COPY_COLUMNS,
+                )
+                merged = await connection.fetch(MERGE_SQL)
+                inserted = sum(1 for row in merged if row["inserted"])
+                await connection.execute(
+                    OUTBOX_SQL,
+                    str(uuid.uuid4()),
+                    organization_id,
+                    "candidates.imported",
+                    json.dumps({"inserted": inserted, "updated": len(merged) - inserted}),
+                )
+            duration = time.perf_counter() - batch_started
+            
+            batch = {
+                "batch": len(batches) + 1,
+                "rows": len(records),
+                "inserted": inserted,
+                "updated": len(merged) - inserted,
+                "duplicates": len(records) - len(merged),
+                "duration": round(duration, 3),
+                "rows_per_second": round(len(records) / duration) if duration else None,
+            }
+            batch["conflicts"] = batch["updated"] + batch["duplicates"]
+            batches.append(batch)
+            
+            logger.info(
+                f"Import batch {batch['batch']}: {batch['rows']} rows in {duration:.2f}s "
+                f"({batch['rows_per_second']} rows/s), {inserted} inserted, "
+                f"{batch['conflicts']} conflicts",
+                extra={"organization_id": organization_id, **batch},
+            )
+        
+        records: List[tuple] = []
+        for ordinal, row in enumerate(rows):
+            if not (row.get("email") or "").strip():
+                skipped += 1
+                continue
+            records.append(_record(row, ordinal, defaults))
+            if len(records) >= batch_size:
+                await merge(records)
+                records = []
+        if records:
+            await merge(records)
+    
+    duration = time.perf_counter() - started
+    total_rows = sum(batch["rows"] for batch in batches)
+    
+    return {
+        "rows": total_rows,
+        "inserted": sum(batch["inserted"] for batch in batches),
+        "updated": sum(batch["updated"] for batch in batches),
+        "duplicates": sum(batch["duplicates"] for batch in batches),
+        "conflicts": sum(batch["conflicts"] for batch in batches),
+        "skipped": skipped,
+        "duration": round(duration, 3),
+        "rows_per_second": round(total_rows / duration) if duration else None,
+        "batches": batches,
+    }
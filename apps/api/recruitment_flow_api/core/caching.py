@@ -0,0 +1,255 @@
+"""
+Endpoint response caching.
+
+This module provides decorators that cache FastAPI endpoint
+responses in the shared cache and invalidate them when the
+entities they are built from change.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.params import Depends
+
+from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import cache_manager
+
+# Logger
+logger = get_logger("caching")
+
+# Cached values are the hex ETag followed by the JSON response body
+ETAG_LENGTH = 32
+
+# Parameter injected into cached endpoints to receive the request
+_REQUEST_PARAM = "_cache_request"
+
+_KEY_VALUE_TYPES = (str, int, float, bool, type(None))
+
+
+def cached_endpoint(
+    tags: Iterable[str],
+    ttl: Optional[int] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Cache a GET endpoint's JSON response.
+    
+    The cache key is derived from the route, the endpoint's resolved
+    query and path parameters (so defaults and parameter order do not
+    matter), the caller's organization and permission set. Parameters
+    other than dependencies must be JSON-encodable to scalars or
+    lists of scalars (dates, enums and UUIDs are). Responses
+    are stored as pre-serialized bytes, so hits skip the endpoint and
+    Pydantic entirely, and carry an ETag for conditional requests.
+    The endpoint must depend on get_current_user as `current_user`.
+    
+    Args:
+        tags: Entities the response is built from, invalidated by
+            invalidates_cache() on the corresponding write endpoints
+        ttl: Time to live in seconds
+        
+    Returns:
+        Decorator caching the endpoint
+    """
+    tags = tuple(tags)
+    
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+        if "current_user" not in signature.parameters:
+            raise TypeError(f"{func.__name__} must depend on get_current_user to be cached")
+        dependencies = frozenset(
+            name for name, parameter in signature.parameters.items()
+            if isinstance(parameter.default, Depends)
+        )
+        
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            request: Request = kwargs.pop(_REQUEST_PARAM)
+            current_user = kwargs["current_user"]
+            organization_id = current_user["organization_id"]
+            key = _cache_key(request, kwargs, current_user, dependencies)
+            
+            try:
+                raw = await cache_manager.get(key, decode=False)
+            except Exception as e:
+                logger.warning(f"Endpoint cache read failed for {key}: {e}")
+                raw = None
+            
+            if raw is not None:
+                etag = raw[:ETAG_LENGTH].decode("ascii")
+                return _build_response(request, etag, raw[ETAG_LENGTH:], "HIT")
+            
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                # Endpoint built its own response; not cacheable here
+                return result
+            
+            body = json.dumps(
+                jsonable_encoder(result),
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+            etag = hashlib.blake2b(body, digest_size=ETAG_LENGTH // 2).hexdigest()
+            
+            try:
+                await cache_manager.set(
+                    key,
+                    etag.encode("ascii") + body,
+                    ttl=ttl or settings.ENDPOINT_CACHE_TTL,
+                    serialize=False,
+                    tags=[endpoint_tag(organization_id, tag) for tag in tags],
+                )
+            except Exception as e:
+                logger.warning(f"Endpoint cache write failed for {key}: {e}")
+            
+            return _build_response(request, etag, body, "MISS")
+        
+        # Ask FastAPI to inject the request alongside the endpoint's own parameters
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        return wrapper
+    
+    return decorator
+
+
+def invalidates_cache(*entities: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Invalidate cached endpoint responses after a write endpoint succeeds.
+    
+    The endpoint must depend on get_current_user as `current_user`;
+    only the caller's organization is invalidated.
+    
+    Args:
+        entities: Entity tags the endpoint modifies
+        
+    Returns:
+        Decorator adding invalidation to the endpoint
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if "current_user" not in inspect.signature(func).parameters:
+            raise TypeError(f"{func.__name__} must depend on get_current_user to invalidate the cache")
+        
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await func(*args, **kwargs)
+            await invalidate_endpoint_cache(kwargs["current_user"]["organization_id"], *entities)
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+
+async def invalidate_endpoint_cache(organization_id: str, *entities: str) -> int:
+    """
+    Invalidate cached endpoint responses built from the given entities.
+    
+    Args:
+        organization_id: Organization whose responses are invalidated
+        entities: Entity tags that changed
+        
+    Returns:
+        Number of cached responses deleted
+    """
+    try:
+        return await cache_manager.invalidate_tags(
+            [endpoint_tag(organization_id, entity) for entity in entities]
+        )
+    except Exception as e:
+        logger.warning(f"Endpoint cache invalidation failed for {entities}: {e}")
+        return 0
+
+
+def endpoint_tag(organization_id: str, entity: str) -> str:
+    """
+    Get the cache tag of an entity within an organization.
+    
+    Args:
+        organization_id: Organization ID
+        entity: Entity name, e.g. "candidates"
+        
+    Returns:
+        Cache tag invalidated when the entity changes
+    """
+    return f"endpoint:{organization_id}:{entity}"
+
+
+def _key_value(name: str, value: Any) -> Any:
+    try:
+        encoded = jsonable_encoder(value)
+    except ValueError:
+        encoded = value
+    if isinstance(encoded, _KEY_VALUE_TYPES) or (
+        isinstance(encoded, list) and all(isinstance(item, _KEY_VALUE_TYPES) for item in encoded)
+    ):
+        return encoded
+    raise TypeError(f"Cannot build a cache key from parameter {name!r} of type {type(value).__name__}")
+
+
+def _cache_key(request: Request, params: dict, current_user: dict, dependencies: frozenset = frozenset()) -> str:
+    """
+    Build the cache key for a request.
+    
+    Args:
+        request: Incoming request
+        params: Resolved endpoint parameters
+        current_user: Current authenticated user
+        dependencies: Names of dependency parameters, left out of the key
+        
+    Returns:
+        Cache key
+        
+    Raises:
+        TypeError: If a parameter value cannot be part of the key
+    """
+    route = request.scope.get("route")
+    values = {
+        name: _key_value(name, value)
+        for name, value in params.items()
+        if name != "current_user" and name not in dependencies
+    }
+    identity = json.dumps(
+        [
+            request.method,
+            getattr(route, "path", request.url.path),
+            sorted(values.items()),
+            sorted(set(current_user.get("permissions", []))),
+        ],
+        separators=(",", ":"),
+    )
+    digest = hashlib.blake2b(identity.encode("utf-8"), digest_size=16).hexdigest()
+    return f"endpoint:{current_user['organization_id']}:{digest}"
+
+
+def _build_response(request: Request, etag: str, body: bytes, cache_status: str) -> Response:
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "private, no-cache",
+        "X-Cache": cache_status,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
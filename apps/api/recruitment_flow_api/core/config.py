@@ -6,7 +6,7 @@ and application constants.
 """
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseSettings, validator
 
 
@@ -23,6 +23,7 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     WORKERS: int = 1
+    REQUEST_DEADLINE_SECONDS: float = 30.0  # time budget for retries within a request
     
     # Security
     SECRET_KEY: str = "your-secret-key-here"
@@ -30,6 +31,10 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Sessions
+    SESSION_LOCAL_CACHE_TTL: int = 5
+    SESSION_LOCAL_CACHE_MAX_ENTRIES: int = 10000
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:3001"]
     ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1"]
@@ -39,10 +44,71 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 30
     DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_STATEMENT_TIMEOUT: int = 5000  # milliseconds
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500  # 0 when behind PgBouncer in transaction mode
+    DATABASE_REPLICA_URLS: List[str] = []  # read replicas for read-only requests
+    DATABASE_REPLICA_MAX_LAG: float = 2.0  # seconds
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+    DATABASE_READ_YOUR_WRITES_SECONDS: int = 5
+    DATABASE_ANALYTICS_URL: Optional[str] = None  # read replica; defaults to DATABASE_URL
+    DATABASE_ANALYTICS_POOL_SIZE: int = 5
+    DATABASE_ANALYTICS_MAX_OVERFLOW: int = 5
+    DATABASE_ANALYTICS_POOL_TIMEOUT: int = 60
+    DATABASE_ANALYTICS_STATEMENT_TIMEOUT: int = 120000
+    DATABASE_JOBS_URL: Optional[str] = None  # defaults to DATABASE_URL
+    DATABASE_JOBS_POOL_SIZE: int = 5
+    DATABASE_JOBS_MAX_OVERFLOW: int = 5
+    DATABASE_JOBS_POOL_TIMEOUT: int = 60
+    DATABASE_JOBS_STATEMENT_TIMEOUT: int = 600000
+    DATABASE_SLOW_QUERY_MS: int = 200
+    DATABASE_LOG_QUERY_PARAMS: bool = False  # parameters may contain candidate PII
+    DATABASE_QUERY_STATS_MAX_FINGERPRINTS: int = 1000
+    DATABASE_QUERY_STATS_TOP_N: int = 10
+    DATABASE_N_PLUS_ONE_THRESHOLD: int = 10
+    DATABASE_RETRY_MAX_RETRIES: int = 3
+    DATABASE_RETRY_BASE_DELAY: float = 0.05  # seconds
+    DATABASE_RETRY_MAX_DELAY: float = 2.0
+    DATABASE_RETRY_BUDGET_RATIO: float = 0.1  # retries allowed per call, over the window
+    DATABASE_RETRY_BUDGET_MIN_PER_SECOND: float = 5.0  # retries always allowed at low traffic
+    DATABASE_RETRY_BUDGET_WINDOW: int = 10  # seconds
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
-    REDIS_POOL_SIZE: int = 10
+    REDIS_MODE: str = "standalone"  # standalone, sentinel, cluster
+    REDIS_SENTINELS: List[str] = []  # host:port entries
+    REDIS_SENTINEL_SERVICE: str = "mymaster"
+    REDIS_POOL_SIZE: int = 50
+    REDIS_POOL_TIMEOUT: int = 5
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    
+    # Distributed Locks
+    LOCK_REDIS_URLS: List[str] = []  # independent masters for Redlock; empty uses REDIS_URL
+    LOCK_INSTANCE_TIMEOUT: float = 0.1
+    LOCK_TTL: int = 30
+    LOCK_TIMEOUT: int = 10
+    LEADER_LEASE_TTL: int = 15
+    
+    # Key-space Analysis
+    KEYSPACE_SAMPLE_SIZE: int = 100000
+    KEYSPACE_OVERSIZED_BYTES: int = 512 * 1024  # 512KB
+    
+    # Cache
+    CACHE_LOCAL_ENABLED: bool = False
+    CACHE_LOCAL_MAX_ENTRIES: int = 10000
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB
+    CACHE_LOCAL_TTL: int = 30
+    CACHE_SCAN_COUNT: int = 1000
+    CACHE_DELETE_BATCH_SIZE: int = 500
+    CACHE_STALE_TTL: int = 300
+    CACHE_LOCK_TIMEOUT: int = 10
+    CACHE_SERIALIZER: str = "json"  # json, msgpack
+    CACHE_COMPRESSION: str = "none"  # none, zstd, lz4
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
+    CACHE_CLIENT_TRACKING: bool = False
+    CACHE_TRACKING_PREFIXES: List[str] = []  # empty tracks every key
+    CACHE_TRACKING_HEALTH_CHECK_INTERVAL: int = 30
+    ENDPOINT_CACHE_TTL: int = 60
     
     # AI Services
     OPENAI_API_KEY: Optional[str] = None
@@ -83,10 +149,52 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 100
     RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LEASE_SIZE: int = 10
+    RATE_LIMIT_LEASE_TTL: int = 2
+    RATE_LIMIT_MAX_TRACKED_CLIENTS: int = 10000
+    RATE_LIMIT_ROUTE_COSTS: Dict[str, int] = {
+        "/api/v1/candidates/import": 10,
+        "/api/v1/candidates/screen": 5,
+    }
+    
+    # Background Jobs
+    JOB_QUEUE_NAME: str = "default"
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_DELAY: int = 2  # seconds, doubled per attempt
+    JOB_RETRY_MAX_DELAY: int = 300
+    JOB_VISIBILITY_TIMEOUT: int = 300  # seconds before a pending job is reclaimed
+    JOB_MAINTENANCE_INTERVAL: int = 5
+    JOB_POLL_BLOCK_MS: int = 2000
+    JOB_STREAM_MAXLEN: int = 100000
+    JOB_RESULT_TTL: int = 86400  # 24 hours
+    JOB_PAYLOAD_INLINE_MAX_BYTES: int = 16384  # larger payloads are stored in Postgres
+    
+    # Transactional Outbox
+    OUTBOX_CHANNEL: str = "outbox"  # Postgres NOTIFY channel
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL: float = 5.0  # seconds; fallback when no NOTIFY arrives
+    OUTBOX_RETENTION_HOURS: int = 72  # published events kept for debugging
+    OUTBOX_DEDUP_TTL: int = 86400  # seconds a consumer remembers delivered events
+    
+    # Analytics
+    PIPELINE_COUNTER_RECONCILE_INTERVAL: int = 3600  # seconds
+    ANALYTICS_ENGINE_MAX_ORGANIZATIONS: int = 16  # organizations kept in memory per worker
+    ANALYTICS_ENGINE_REFRESH_INTERVAL: int = 60  # seconds between incremental event loads
+    ANALYTICS_ENGINE_MAX_AGE: int = 3600  # seconds before an organization is reloaded in full
+    ANALYTICS_ENGINE_LOAD_BATCH_SIZE: int = 100000  # events per load query
+    EEO_ROLLUP_REFRESH_INTERVAL: int = 300  # seconds between incremental rollup updates
+    EEO_ROLLUP_REBUILD_HOUR: int = 3  # UTC hour after which the daily rebuild runs
+    EEO_ROLLUP_BATCH_SIZE: int = 100000  # stage events folded in per transaction
+    
+    # Candidate Import
+    CANDIDATE_IMPORT_BATCH_SIZE: int = 5000  # rows per COPY and merge transaction
     
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
+    PAGINATION_COUNT_CACHE_TTL: int = 300  # seconds a list total is served from cache
     
     # File Upload
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
@@ -122,6 +230,12 @@ class Settings(BaseSettings):
             return [host.strip() for host in v.split(",")]
         return v
     
+    @validator("DATABASE_REPLICA_URLS", "REDIS_SENTINELS", "LOCK_REDIS_URLS", "CACHE_TRACKING_PREFIXES", pre=True)
+    def parse_list_settings(cls, v):
+        if isinstance(v, str):
+            return [item.strip() for item in v.split(",") if item.strip()]
+        return v
+    
     @validator("ALLOWED_FILE_TYPES", pre=True)
     def parse_allowed_file_types(cls, v):
         if isinstance(v, str):
@@ -186,6 +300,13 @@ TABLES = {
     "offers": "offers",
     "audits": "audits",
     "reports": "reports",
+    "outbox": "outbox",
+    "pipeline_stage_counts": "pipeline_stage_counts",
+    "candidate_stage_events": "candidate_stage_events",
+    "eeo_self_identifications": "eeo_self_identifications",
+    "eeo_daily_rollups": "eeo_daily_rollups",
+    "eeo_rollup_state": "eeo_rollup_state",
+    "job_payloads": "job_payloads",
 }
 
 # User roles and permissions
@@ -252,6 +373,16 @@ CANDIDATE_STATUSES = [
     "withdrawn",
 ]
 
+# EEO self-identification dimensions and their reported groups
+EEO_DIMENSIONS = {
+    "gender": ["male", "female", "non_binary", "prefer_not_to_say"],
+    "race": ["white", "black", "hispanic", "asian", "other"],
+    "age": ["18-24", "25-34", "35-44", "45-54", "55+"],
+}
+
+# Candidate statuses that count as a selection in adverse impact analysis
+EEO_SELECTED_STATUSES = ["offered", "hired"]
+
 # Interview types
 INTERVIEW_TYPES = [
     "phone_screen",
@@ -6,9 +6,20 @@ and provides utilities for database operations.
 """
 
 import asyncio
-from typing import AsyncGenerator, Optional
-from contextlib import asynccontextmanager
+import json
+import math
+import random
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from contextlib import asynccontextmanager, suppress
 
+from fastapi import Request
+from prometheus_client import Counter
+from sqlalchemy import and_, bindparam, column, insert, table, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -18,73 +29,284 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 
-from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.config import TABLES, settings
+from recruitment_flow_api.core.instrumentation import instrument_engine, query_stats
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.middleware import client_identifier, get_request_deadline
+from recruitment_flow_api.core.redis import get_redis
+
+# Logger
+logger = get_logger("database")
 
 # Create declarative base for models
 Base = declarative_base()
 
-# Global engine and session factory
+# Named engines, one pool per workload
+ENGINE_NAMES = ("oltp", "analytics", "jobs")
+
+engines: Dict[str, AsyncEngine] = {}
+session_factories: Dict[str, async_sessionmaker[AsyncSession]] = {}
+
+# Global engine and session factory for the OLTP workload
 engine: Optional[AsyncEngine] = None
 AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
 
+# Requests that may be served by a read replica
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# SQLSTATEs of errors that may succeed when the transaction is retried
+RETRYABLE_SQLSTATES = {
+    "40001": "serialization_failure",
+    "40P01": "deadlock_detected",
+    "55P03": "lock_not_available",
+    "57P01": "admin_shutdown",
+    "08000": "connection_exception",
+    "08001": "connection_exception",
+    "08003": "connection_exception",
+    "08004": "connection_exception",
+    "08006": "connection_exception",
+}
+
+DB_RETRIES_TOTAL = Counter(
+    "db_retries_total",
+    "Database operations retried, by error",
+    ["reason"],
+)
+DB_RETRIES_ABANDONED_TOTAL = Counter(
+    "db_retries_abandoned_total",
+    "Retryable database errors not retried, by cause",
+    ["cause"],
+)
+
+# Seconds since the last replayed transaction, 0 when fully caught up
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def _engine_options(name: str) -> dict:
+    """
+    Get the connection settings of a named engine.
+    
+    Args:
+        name: Engine name
+        
+    Returns:
+        URL, pool and statement timeout settings
+    """
+    if name == "oltp":
+        return {
+            "url": settings.DATABASE_URL,
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+            "statement_timeout": settings.DATABASE_STATEMENT_TIMEOUT,
+        }
+    if name == "analytics":
+        return {
+            "url": settings.DATABASE_ANALYTICS_URL or settings.DATABASE_URL,
+            "pool_size": settings.DATABASE_ANALYTICS_POOL_SIZE,
+            "max_overflow": settings.DATABASE_ANALYTICS_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_ANALYTICS_POOL_TIMEOUT,
+            "statement_timeout": settings.DATABASE_ANALYTICS_STATEMENT_TIMEOUT,
+        }
+    if name.startswith("replica:"):
+        # Replicas serve OLTP reads and share the OLTP pool settings
+        return {
+            "url": settings.DATABASE_REPLICA_URLS[int(name.split(":", 1)[1])],
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+            "statement_timeout": settings.DATABASE_STATEMENT_TIMEOUT,
+        }
+    if name == "jobs":
+        return {
+            "url": settings.DATABASE_JOBS_URL or settings.DATABASE_URL,
+            "pool_size": settings.DATABASE_JOBS_POOL_SIZE,
+            "max_overflow": settings.DATABASE_JOBS_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_JOBS_POOL_TIMEOUT,
+            "statement_timeout": settings.DATABASE_JOBS_STATEMENT_TIMEOUT,
+        }
+    raise ValueError(f"Unknown database engine: {name}")
+
+
+def _create_engine(name: str) -> AsyncEngine:
+    """
+    Create a named async engine with its own connection pool.
+    
+    Connections are not pinged on checkout; a disconnect error
+    instead invalidates the failed connection and every older one in
+    the pool, so the pool recovers after a database restart without
+    paying a round trip per checkout. LIFO checkout keeps surplus
+    connections idle so the server can close them.
+    
+    Args:
+        name: Engine name
+        
+    Returns:
+        AsyncEngine for the workload
+    """
+    options = _engine_options(name)
+    
+    db_engine = create_async_engine(
+        options["url"],
+        echo=settings.DEBUG,
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        pool_timeout=options["pool_timeout"],
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_use_lifo=True,
+        connect_args={
+            # asyncpg and SQLAlchemy prepared statement caches (0 behind PgBouncer)
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(options["statement_timeout"]),
+                "application_name": f"{settings.APP_NAME}:{name.split(':')[0]}",
+            },
+        },
+    )
+    instrument_engine(db_engine, name)
+    return db_engine
+
 
 async def init_db() -> None:
     """
     Initialize database connection and session factory.
     
-    Creates the async engine and session factory for database operations.
+    Creates an async engine and session factory per workload
+    (OLTP, analytics, background jobs) so slow queries in one
+    workload cannot exhaust the connections of another.
     """
     global engine, AsyncSessionLocal
     
     if engine is not None:
         return
     
-    # Create async engine
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=settings.DEBUG,
-        pool_size=settings.DATABASE_POOL_SIZE,
-        max_overflow=settings.DATABASE_MAX_OVERFLOW,
-        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-        pool_pre_ping=True,
-        pool_recycle=3600,
-    )
+    for name in ENGINE_NAMES:
+        engines[name] = _create_engine(name)
+        session_factories[name] = async_sessionmaker(
+            bind=engines[name],
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
     
-    # Create session factory
-    AsyncSessionLocal = async_sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
+    engine = engines["oltp"]
+    AsyncSessionLocal = session_factories["oltp"]
+    
+    replica_router.configure(settings.DATABASE_REPLICA_URLS)
 
 
 async def close_db() -> None:
     """
     Close database connections.
     
-    Properly closes the engine and cleans up resources.
+    Properly closes the engines and cleans up resources.
     """
     global engine, AsyncSessionLocal
     
-    if engine is not None:
-        await engine.dispose()
-        engine = None
-        AsyncSessionLocal = None
+    await replica_router.close()
+    
+    for name in list(engines):
+        await engines.pop(name).dispose()
+    session_factories.clear()
+    
+    engine = None
+    AsyncSessionLocal = None
+
+
+async def get_session_factory(name: str = "oltp") -> async_sessionmaker[AsyncSession]:
+    """
+    Get the session factory of a named engine.
+    
+    Args:
+        name: Engine name ("oltp", "analytics" or "jobs")
+        
+    Returns:
+        Session factory bound to the engine
+    """
+    if name not in ENGINE_NAMES:
+        raise ValueError(f"Unknown database engine: {name}")
+    
+    if AsyncSessionLocal is None:
+        await init_db()
+    
+    return session_factories[name]
+
+
+async def get_engine(name: str = "oltp") -> AsyncEngine:
+    """
+    Get a named engine.
+    
+    Args:
+        name: Engine name ("oltp", "analytics" or "jobs")
+        
+    Returns:
+        AsyncEngine for the workload
+    """
+    await get_session_factory(name)
+    return engines[name]
+
+
+def get_db_for(name: str) -> Callable[[], AsyncGenerator[AsyncSession, None]]:
+    """
+    Build a session dependency for a named engine.
+    
+    Usage:
+        session: AsyncSession = Depends(get_db_for("analytics"))
+    
+    Args:
+        name: Engine name ("oltp", "analytics" or "jobs")
+        
+    Returns:
+        Dependency yielding a session from that engine's pool
+    """
+    if name not in ENGINE_NAMES:
+        raise ValueError(f"Unknown database engine: {name}")
+    
+    async def dependency() -> AsyncGenerator[AsyncSession, None]:
+        async with get_db_session(name) as session:
+            yield session
+    
+    return dependency
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request = None) -> AsyncGenerator[AsyncSession, None]:
     """
     Get database session.
     
+    Read-only requests are served from a read replica whose
+    replication lag is within DATABASE_REPLICA_MAX_LAG, unless the
+    client wrote recently: write requests pin their client to the
+    primary for DATABASE_READ_YOUR_WRITES_SECONDS so it always reads
+    its own writes. Everything else uses the OLTP primary.
+    
+    Args:
+        request: Current request (injected by FastAPI)
+        
     Yields:
         AsyncSession: Database session for dependency injection
     """
-    if AsyncSessionLocal is None:
-        await init_db()
+    session_factory = None
     
-    async with AsyncSessionLocal() as session:
+    if request is not None and replica_router.replicas:
+        identifier = client_identifier(request.scope)
+        if request.method in READ_ONLY_METHODS:
+            if not await replica_router.is_pinned(identifier):
+                session_factory = replica_router.choose()
+        else:
+            # Pin before the write so the client's next read cannot race it
+            await replica_router.pin(identifier)
+    
+    if session_factory is None:
+        session_factory = await get_session_factory("oltp")
+    
+    async with session_factory() as session:
         try:
             yield session
         except Exception:
@@ -95,17 +317,19 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 @asynccontextmanager
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_db_session(name: str = "oltp") -> AsyncGenerator[AsyncSession, None]:
     """
     Get database session as context manager.
     
+    Args:
+        name: Engine name ("oltp", "analytics" or "jobs")
+        
     Yields:
         AsyncSession: Database session
     """
-    if AsyncSessionLocal is None:
-        await init_db()
+    session_factory = await get_session_factory(name)
     
-    async with AsyncSessionLocal() as session:
+    async with session_factory() as session:
         try:
             yield session
         except Exception:
@@ -115,6 +339,175 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+class Replica:
+    """Read replica engine with its last measured replication lag."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = _create_engine(name)
+        self.session_factory = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+        # Unknown until first measured, so new replicas start out of rotation
+        self.lag = math.inf
+
+
+class ReplicaRouter:
+    """
+    Routes read-only sessions to read replicas.
+    
+    A background task measures each replica's replication lag; only
+    replicas within the lag threshold receive reads. Clients are
+    pinned to the primary through a short-lived Redis key after they
+    write, so pins are shared by every API worker. The lag probe can
+    be replaced, e.g. with an in-process stand-in for testing.
+    """
+    
+    def __init__(
+        self,
+        max_lag: Optional[float] = None,
+        pin_seconds: Optional[int] = None,
+        check_interval: Optional[float] = None,
+        lag_probe: Optional[Callable[[Replica], Awaitable[float]]] = None,
+    ):
+        self.max_lag = max_lag if max_lag is not None else settings.DATABASE_REPLICA_MAX_LAG
+        self.pin_seconds = pin_seconds or settings.DATABASE_READ_YOUR_WRITES_SECONDS
+        self.check_interval = check_interval or settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL
+        self.lag_probe = lag_probe or self._query_lag
+        self.replicas: List[Replica] = []
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self._monitor_task: Optional[asyncio.Task] = None
+    
+    def configure(self, urls: List[str]) -> None:
+        """
+        Create an engine per replica URL.
+        
+        Args:
+            urls: Replica database URLs
+        """
+        self.replicas = [Replica(f"replica:{index}") for index in range(len(urls))]
+    
+    async def close(self) -> None:
+        """Stop lag monitoring and dispose of the replica engines."""
+        await self.stop()
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = []
+    
+    async def start(self) -> None:
+        """Measure replica lag now and keep measuring in the background."""
+        if not self.replicas or self._monitor_task is not None:
+            return
+        
+        await self.check_lag()
+        self._monitor_task = asyncio.create_task(self._monitor())
+    
+    async def stop(self) -> None:
+        """Stop lag monitoring."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._monitor_task
+            self._monitor_task = None
+    
+    async def check_lag(self) -> None:
+        """Measure the replication lag of every replica."""
+        await asyncio.gather(*[self._measure(replica) for replica in self.replicas])
+    
+    def choose(self) -> Optional[async_sessionmaker[AsyncSession]]:
+        """
+        Pick a replica for a read.
+        
+        Returns:
+            Session factory of a replica within the lag threshold,
+            or None if reads must go to the primary
+        """
+        healthy = [replica for replica in self.replicas if replica.lag <= self.max_lag]
+        if not healthy:
+            self.primary_reads += 1
+            return None
+        
+        self.replica_reads += 1
+        return random.choice(healthy).session_factory
+    
+    async def pin(self, identifier: str) -> None:
+        """
+        Pin a client to the primary after a write.
+        
+        Args:
+            identifier: Client identifier
+        """
+        try:
+            redis = await get_redis()
+            await redis.set(self._pin_key(identifier), 1, ex=self.pin_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to pin client to primary: {e}")
+    
+    async def is_pinned(self, identifier: str) -> bool:
+        """
+        Check whether a client must read from the primary.
+        
+        Args:
+            identifier: Client identifier
+            
+        Returns:
+            True if the client wrote recently or pins cannot be checked
+        """
+        try:
+            redis = await get_redis()
+            return bool(await redis.exists(self._pin_key(identifier)))
+        except Exception as e:
+            # Without the pin state, only the primary is guaranteed consistent
+            logger.warning(f"Failed to check primary pin: {e}")
+            return True
+    
+    def stats(self) -> dict:
+        """
+        Get replica routing statistics.
+        
+        Returns:
+            Replica lag and read routing counters
+        """
+        return {
+            "replicas": {
+                replica.name: {"lag_seconds": None if math.isinf(replica.lag) else replica.lag}
+                for replica in self.replicas
+            },
+            "max_lag_seconds": self.max_lag,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+    
+    async def _measure(self, replica: Replica) -> None:
+        try:
+            replica.lag = await self.lag_probe(replica)
+        except Exception as e:
+            logger.warning(f"Replica {replica.name} lag check failed: {e}")
+            replica.lag = math.inf
+    
+    async def _query_lag(self, replica: Replica) -> float:
+        async with replica.engine.connect() as conn:
+            lag = (await conn.execute(text(REPLICA_LAG_QUERY))).scalar()
+        return float(lag or 0)
+    
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_lag()
+    
+    def _pin_key(self, identifier: str) -> str:
+        return f"db:primary_pin:{identifier}"
+
+
+# Global instance
+replica_router = ReplicaRouter()
+
+
 async def create_tables() -> None:
     """
     Create all database tables.
@@ -146,14 +539,15 @@ async def check_db_connection() -> bool:
     Check database connection health.
     
     Returns:
-        bool: True if connection is healthy, False otherwise
+        bool: True if every engine can reach its database, False otherwise
     """
     try:
         if engine is None:
             await init_db()
         
-        async with engine.begin() as conn:
-            await conn.execute("SELECT 1")
+        for db_engine in engines.values():
+            async with db_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
         return True
     except Exception:
         return False
@@ -164,20 +558,27 @@ async def get_db_stats() -> dict:
     Get database statistics.
     
     Returns:
-        dict: Database statistics including connection pool info
+        dict: Database statistics including connection pool info per engine
     """
     if engine is None:
         return {"status": "not_initialized"}
     
     try:
-        pool = engine.pool
+        pools = {}
+        for name, db_engine in engines.items():
+            pool = db_engine.pool
+            pools[name] = {
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
         return {
             "status": "healthy",
-            "pool_size": pool.size(),
-            "checked_in": pool.checkedin(),
-            "checked_out": pool.checkedout(),
-            "overflow": pool.overflow(),
-            "invalid": pool.invalid(),
+            "engines": pools,
+            "replicas": replica_router.stats(),
+            "slow_queries": query_stats.top(settings.DATABASE_QUERY_STATS_TOP_N),
+            "retries": retry_budget.stats(),
         }
     except Exception as e:
         return {
@@ -187,79 +588,440 @@ async def get_db_stats() -> dict:
 
 
 # Database utilities
+def _table(name: str, columns: Tuple[str, ...]) -> Any:
+    return table(name, *(column(column_name) for column_name in columns))
+
+
+class AuditContext(NamedTuple):
+    """Who a unit of work acts for, recorded on its audit and outbox rows."""
+    
+    organization_id: Optional[str] = None
+    user_id: Optional[str] = None
+
+
+class UnitOfWork:
+    """
+    Collects the writes of one business operation for a single commit.
+    
+    Rows are queued with stage(), update(), increment(), audit() and
+    outbox() and flushed at commit: rows for the same table and
+    columns go out as one executemany (multi-row VALUES for inserts),
+    so an operation touching candidates, offers, audits and the outbox
+    costs a handful of round trips and one commit instead of one per
+    row. Attributes not defined here (add, add_all, execute, scalar,
+    get, ...) are delegated to the underlying session, so ORM objects
+    added session-style are flushed and committed alongside.
+    """
+    
+    def __init__(self, session: AsyncSession, organization_id: Optional[str] = None, user_id: Optional[str] = None):
+        self.session = session
+        self.organization_id = organization_id
+        self.user_id = user_id
+        # Queued writes grouped by (table, columns), in first-queued order
+        self._inserts: Dict[Tuple[str, Tuple[str, ...]], List[dict]] = {}
+        self._updates: Dict[Tuple[str, Tuple[str, ...], Tuple[str, ...]], List[dict]] = {}
+        # Counter deltas summed per row key
+        self._increments: Dict[Tuple[str, Tuple[str, ...], Tuple[str, ...]], Dict[tuple, Dict[str, int]]] = {}
+        # Audit and outbox rows, written after the changes they describe
+        self._deferred: Dict[Tuple[str, Tuple[str, ...]], List[dict]] = {}
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+    
+    def stage(self, table_name: str, row: Dict[str, Any]) -> None:
+        """
+        Queue a row insert.
+        
+        Args:
+            table_name: Table name
+            row: Column values
+        """
+        self._inserts.setdefault((table_name, tuple(sorted(row))), []).append(row)
+    
+    def stage_many(self, table_name: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Queue several row inserts.
+        
+        Args:
+            table_name: Table name
+            rows: Column values per row
+        """
+        for row in rows:
+            self.stage(table_name, row)
+    
+    def update(self, table_name: str, values: Dict[str, Any], **where: Any) -> None:
+        """
+        Queue an update of the rows matching where.
+        
+        Args:
+            table_name: Table name
+            values: Column values to set
+            **where: Column equality conditions, e.g. id="candidate_123"
+        """
+        key = (table_name, tuple(sorted(values)), tuple(sorted(where)))
+        params = {f"set_{name}": value for name, value in values.items()}
+        params.update({f"where_{name}": value for name, value in where.items()})
+        self._updates.setdefault(key, []).append(params)
+    
+    def increment(self, table_name: str, key: Dict[str, Any], deltas: Dict[str, int]) -> None:
+        """
+        Queue counter increments, upserted on the key columns.
+        
+        Increments to the same row are summed before flushing, so
+        repeated changes cost one row write.
+        
+        Args:
+            table_name: Counter table with a unique index on the key columns
+            key: Key column values
+            deltas: Amount to add per counter column
+        """
+        queue_key = (table_name, tuple(sorted(key)), tuple(sorted(deltas)))
+        row_key = tuple(key[name] for name in queue_key[1])
+        totals = self._increments.setdefault(queue_key, {}).setdefault(row_key, dict.fromkeys(deltas, 0))
+        for name, delta in deltas.items():
+            totals[name] += delta
+    
+    def audit(self, action: str, resource: str, details: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Queue an audit row, written in the same commit as the change.
+        
+        Args:
+            action: Action performed
+            resource: Resource affected
+            details: Additional audit details
+        """
+        self._defer(TABLES["audits"], {
+            "organization_id": self.organization_id,
+            "user_id": self.user_id,
+            "action": action,
+            "resource": resource,
+            "details": json.dumps(details or {}, default=str),
+        })
+    
+    def outbox(self, event_type: str, payload: Dict[str, Any]) -> str:
+        """
+        Queue an outbox event, published only if the commit succeeds.
+        
+        Args:
+            event_type: Event type, e.g. "offer.accepted"
+            payload: Event payload
+            
+        Returns:
+            Event ID
+        """
+        event_id = str(uuid.uuid4())
+        self._defer(TABLES["outbox"], {
+            "id": event_id,
+            "organization_id": self.organization_id,
+            "event_type": event_type,
+            "payload": json.dumps(payload, default=str),
+        })
+        return event_id
+    
+    def _defer(self, table_name: str, row: Dict[str, Any]) -> None:
+        self._deferred.setdefault((table_name, tuple(sorted(row))), []).append(row)
+    
+    @property
+    def pending(self) -> int:
+        """Number of queued row writes."""
+        return sum(
+            len(rows)
+            for queue in (self._inserts, self._updates, self._increments, self._deferred)
+            for rows in queue.values()
+        )
+    
+    async def flush(self) -> None:
+        """
+        Write queued rows, one statement per table and column set.
+        
+        Inserts go first, in the order their tables were first queued,
+        then updates and counter increments, then audit and outbox rows,
+        then objects added to the session.
+        """
+        inserts, self._inserts = self._inserts, {}
+        updates, self._updates = self._updates, {}
+        increments, self._increments = self._increments, {}
+        deferred, self._deferred = self._deferred, {}
+        
+        for (table_name, columns), rows in inserts.items():
+            await self.session.execute(insert(_table(table_name, columns)), rows)
+        
+        for (table_name, columns, where), rows in updates.items():
+            target = _table(table_name, tuple(sorted({*columns, *where})))
+            statement = (
+                update(target)
+                .where(and_(*(target.c[name] == bindparam(f"where_{name}") for name in where)))
+                .values({name: bindparam(f"set_{name}") for name in columns})
+            )
+            await self.session.execute(statement, rows)
+        
+        for (table_name, key_columns, counter_columns), totals in increments.items():
+            target = _table(table_name, (*key_columns, *counter_columns))
+            statement = pg_insert(target)
+            statement = statement.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={name: target.c[name] + statement.excluded[name] for name in counter_columns},
+            )
+            rows = [
+                {**dict(zip(key_columns, row_key)), **deltas}
+                for row_key, deltas in totals.items()
+            ]
+            await self.session.execute(statement, rows)
+        
+        for (table_name, columns), rows in deferred.items():
+            await self.session.execute(insert(_table(table_name, columns)), rows)
+        
+        await self.session.flush()
+    
+    async def commit(self) -> None:
+        """Flush queued rows and commit."""
+        await self.flush()
+        await self.session.commit()
+    
+    async def rollback(self) -> None:
+        """Discard queued rows and roll back."""
+        self._inserts.clear()
+        self._updates.clear()
+        self._increments.clear()
+        self._deferred.clear()
+        await self.session.rollback()
+
+
 class DatabaseManager:
     """
     Database manager for common operations.
     
-    Provides utilities for common database operations
-    and transaction management.
+    Provides a unit of work over a session: writes queued on it are
+    flushed and committed together on exit, or discarded on error.
+    
+    Usage:
+        async with DatabaseManager(organization_id=org, user_id=user) as uow:
+            uow.update("offers", {"status": "accepted"}, id=offer_id)
+            uow.update("candidates", {"status": "hired"}, id=candidate_id)
+            uow.audit("offer.accepted", f"offers/{offer_id}")
+            uow.outbox("offer.accepted", {"offer_id": offer_id})
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        engine_name: str = "oltp",
+        organization_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ):
+        self.engine_name = engine_name
+        self.organization_id = organization_id
+        self.user_id = user_id
         self.session: Optional[AsyncSession] = None
+        self.uow: Optional[UnitOfWork] = None
     
-    async def __aenter__(self):
+    async def __aenter__(self) -> UnitOfWork:
         """Enter async context manager."""
-        if AsyncSessionLocal is None:
-            await init_db()
-        
-        self.session = AsyncSessionLocal()
-        return self.session
+        session_factory = await get_session_factory(self.engine_name)
+        self.session = session_factory()
+        self.uow = UnitOfWork(self.session, self.organization_id, self.user_id)
+        return self.uow
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit async context manager."""
         if self.session:
-            if exc_type is not None:
-                await self.session.rollback()
-            else:
-                await self.session.commit()
-            await self.session.close()
+            try:
+                if exc_type is not None:
+                    await self.uow.rollback()
+                else:
+                    await self.uow.commit()
+            finally:
+                await self.session.close()
 
 
-async def execute_in_transaction(func, *args, **kwargs):
+async def execute_in_transaction(
+    func,
+    *args,
+    audit: Optional[AuditContext] = None,
+    **kwargs,
+):
     """
     Execute function within a database transaction.
     
+    func receives a UnitOfWork; the rows it queues are flushed and
+    committed together once it returns. The audit context is taken as
+    a single argument so keyword arguments such as organization_id
+    still reach func.
+    
     Args:
         func: Function to execute
         *args: Function arguments
+        audit: Organization and user recorded on audit and outbox rows
         **kwargs: Function keyword arguments
         
     Returns:
         Result of the function execution
     """
-    async with get_db_session() as session:
-        try:
-            result = await func(session, *args, **kwargs)
-            await session.commit()
-            return result
-        except Exception:
-            await session.rollback()
-            raise
+    audit = audit or AuditContext()
+    async with DatabaseManager(organization_id=audit.organization_id, user_id=audit.user_id) as uow:
+        return await func(uow, *args, **kwargs)
+
+
+def classify_retryable_error(exc: BaseException) -> Optional[str]:
+    """
+    Decide whether a failed database operation is worth retrying.
+    
+    Serialization failures, deadlocks, lock timeouts and dropped
+    connections are transient; everything else (constraint violations,
+    syntax errors, statement timeouts) fails the same way again.
+    
+    Args:
+        exc: Exception raised by the operation
+        
+    Returns:
+        Reason the error is retryable, or None if it is not
+    """
+    error: Optional[BaseException] = exc
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, DBAPIError) and error.connection_invalidated:
+            return "connection_invalidated"
+        sqlstate = getattr(error, "sqlstate", None) or getattr(error, "pgcode", None)
+        if sqlstate in RETRYABLE_SQLSTATES:
+            return RETRYABLE_SQLSTATES[sqlstate]
+        if isinstance(error, ConnectionError):
+            return "connection_error"
+        # Walk from SQLAlchemy's wrapper to the driver exception
+        error = getattr(error, "orig", None) or error.__cause__
+    return None
 
 
-async def execute_with_retry(func, max_retries: int = 3, *args, **kwargs):
+class RetryBudget:
+    """
+    Caps retries as a share of recent calls.
+    
+    During an outage every call fails and naive retries multiply the
+    load on an already struggling database. The budget allows
+    retries up to ratio x calls over a sliding window, plus a small
+    per-second allowance so low-traffic processes can still retry.
+    """
+    
+    def __init__(
+        self,
+        ratio: Optional[float] = None,
+        min_per_second: Optional[float] = None,
+        window: Optional[int] = None,
+    ):
+        self.ratio = settings.DATABASE_RETRY_BUDGET_RATIO if ratio is None else ratio
+        self.min_per_second = (
+            settings.DATABASE_RETRY_BUDGET_MIN_PER_SECOND if min_per_second is None else min_per_second
+        )
+        self.window = window or settings.DATABASE_RETRY_BUDGET_WINDOW
+        # [second, calls, retries] per second of the window
+        self._buckets: deque = deque()
+        self.exhausted = 0
+    
+    def _current_bucket(self) -> list:
+        now = int(time.monotonic())
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+    
+    def record_call(self) -> None:
+        """Record a call that may need retries."""
+        self._current_bucket()[1] += 1
+    
+    def try_spend(self) -> bool:
+        """
+        Take one retry from the budget.
+        
+        Returns:
+            True if the retry is allowed
+        """
+        bucket = self._current_bucket()
+        calls = sum(entry[1] for entry in self._buckets)
+        retries = sum(entry[2] for entry in self._buckets)
+        if retries >= self.min_per_second * self.window + self.ratio * calls:
+            self.exhausted += 1
+            return False
+        bucket[2] += 1
+        return True
+    
+    def stats(self) -> dict:
+        """
+        Get retry statistics for the current window.
+        
+        Returns:
+            Calls, retries and retry ratio
+        """
+        self._current_bucket()
+        calls = sum(entry[1] for entry in self._buckets)
+        retries = sum(entry[2] for entry in self._buckets)
+        return {
+            "window_seconds": self.window,
+            "calls": calls,
+            "retries": retries,
+            "retry_ratio": round(retries / calls, 4) if calls else 0.0,
+            "budget_exhausted": self.exhausted,
+        }
+
+
+# Global instance
+retry_budget = RetryBudget()
+
+
+async def execute_with_retry(
+    func,
+    *args,
+    max_retries: Optional[int] = None,
+    deadline: Optional[float] = None,
+    **kwargs,
+):
     """
     Execute function with retry logic for database operations.
     
+    Only transient errors (see classify_retryable_error()) are
+    retried, after a decorrelated-jitter backoff. Retries stop when
+    the next attempt would start past the deadline or when the
+    process-wide retry budget is spent. func must run its own
+    transaction (for example through execute_in_transaction) so each
+    attempt starts clean.
+    
     Args:
         func: Function to execute
-        max_retries: Maximum number of retry attempts
         *args: Function arguments
+        max_retries: Retries after the first attempt (defaults to DATABASE_RETRY_MAX_RETRIES)
+        deadline: time.monotonic() by which to give up (defaults to the request deadline)
         **kwargs: Function keyword arguments
         
     Returns:
         Result of the function execution
     """
-    last_exception = None
+    max_retries = settings.DATABASE_RETRY_MAX_RETRIES if max_retries is None else max_retries
+    deadline = get_request_deadline() if deadline is None else deadline
+    base_delay = settings.DATABASE_RETRY_BASE_DELAY
+    delay = base_delay
+    
+    retry_budget.record_call()
     
-    for attempt in range(max_retries):
+    for attempt in range(max_retries + 1):
         try:
             return await func(*args, **kwargs)
         except Exception as e:
-            last_exception = e
-            if attempt < max_retries - 1:
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
-            continue
-    
-    raise last_exception
+            reason = classify_retryable_error(e)
+            if reason is None:
+                raise
+            
+            if attempt == max_retries:
+                DB_RETRIES_ABANDONED_TOTAL.labels("attempts").inc()
+                raise
+            
+            # Decorrelated jitter: spreads retries of colliding transactions apart
+            delay = min(settings.DATABASE_RETRY_MAX_DELAY, random.uniform(base_delay, delay * 3))
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                DB_RETRIES_ABANDONED_TOTAL.labels("deadline").inc()
+                raise
+            if not retry_budget.try_spend():
+                DB_RETRIES_ABANDONED_TOTAL.labels("budget").inc()
+                raise
+            
+            DB_RETRIES_TOTAL.labels(reason).inc()
+            logger.warning(f"Retrying database operation after {reason} (attempt {attempt + 1}): {e}")
+            await asyncio.sleep(delay)
@@ -0,0 +1,265 @@
+"""
+EEO reporting.
+
+Candidates' voluntary self-identification is kept apart from the
+candidate record, so it never shows up in hiring workflows and is
+only read here, in aggregate:
+    
+    CREATE TABLE eeo_self_identifications (
+        candidate_id text PRIMARY KEY,
+        organization_id text NOT NULL,
+        gender text,
+        race text,
+        age text,
+        created_at timestamptz NOT NULL DEFAULT now()
+    );
+
+Counts come from the daily rollups in core/eeo_rollups.py: over a
+date range, applicants are the candidates who applied in the range
+and selections those of them who reached one of
+EEO_SELECTED_STATUSES, whenever they did. Undisclosed or unrecognized values are
+left out of the dimension they belong to. Counts are broken down by
+role, so the statistics in core/adverse_impact.py can be stratified
+by role.
+"""
+
+import asyncio
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from recruitment_flow_api.core.adverse_impact import (
+    FOUR_FIFTHS_THRESHOLD,
+    SIGNIFICANCE_LEVEL,
+    analyze,
+    pair_index,
+    selection_counts,
+)
+from recruitment_flow_api.core.config import EEO_DIMENSIONS
+from recruitment_flow_api.core.eeo_rollups import RANGE_COUNTS_SQL
+from recruitment_flow_api.core.logging import get_logger
+
+# Logger
+logger = get_logger("eeo")
+
+class SelectionCounts:
+    """
+    Applicants and selections per role and group of each EEO dimension.
+    
+    counts maps each dimension of EEO_DIMENSIONS to a pair of
+    (applicants, selections) arrays of shape (roles, groups).
+    """
+    
+    def __init__(self, roles: List[Optional[str]], total: int, counts: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        self.roles = roles
+        self.total = total
+        self.counts = counts
+
+
+async def load_selection_counts(
+    session: AsyncSession,
+    organization_id: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    role_id: Optional[str] = None,
+) -> SelectionCounts:
+    """
+    Count applicants and selections from the daily rollups.
+    
+    The total is the applicant count of the most disclosed dimension,
+    as candidates may decline to answer any of them.
+    
+    Args:
+        session: Database session
+        organization_id: Organization ID
+        date_from: First day of the range
+        date_to: Last day of the range
+        role_id: Restrict to one role
+        
+    Returns:
+        Selection counts per role and group
+    """
+    result = await session.execute(text(RANGE_COUNTS_SQL), {
+        "organization_id": organization_id,
+        "role_id": role_id,
+        "date_from": date_from,
+        "date_to": date_to,
+    })
+    rows = [row for row in result.mappings().all() if row["applicants"] or row["selected"]]
+    
+    roles = sorted({row["role_id"] or None for row in rows}, key=lambda role: (role is None, role))
+    role_codes = {role: code for code, role in enumerate(roles)}
+    strata = np.array([role_codes[row["role_id"] or None] for row in rows], dtype=np.int64)
+    applicants = np.array([row["applicants"] for row in rows], dtype=np.int64)
+    selected = np.array([row["selected"] for row in rows], dtype=np.int64)
+    dimensions = [row["dimension"] for row in rows]
+    
+    counts = {}
+    for dimension, groups in EEO_DIMENSIONS.items():
+        group_codes = {group: code for code, group in enumerate(groups)}
+        codes = np.array([
+            group_codes[row["group_value"]] if row_dimension == dimension else -1
+            for row, row_dimension in zip(rows, dimensions)
+        ], dtype=np.int64)
+        counts[dimension] = selection_counts(selected, codes, len(groups), strata, len(roles), weights=applicants)
+    
+    total = max((int(dimension_applicants.sum()) for dimension_applicants, _ in counts.values()), default=0)
+    return SelectionCounts(roles, total, counts)
+
+
+def _rounded(value: float, digits: int = 3) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def analyze_dimension(
+    groups: List[str],
+    roles: List[Optional[str]],
+    applicants: np.ndarray,
+    selections: np.ndarray,
+) -> dict:
+    """
+    Adverse impact analysis of one dimension.
+    
+    The group with the lowest impact ratio is tested against the
+    group with the highest selection rate, pooled over roles and
+    stratified by role (Cochran-Mantel-Haenszel).
+    
+    Args:
+        groups: Group labels of the dimension
+        roles: Role of each stratum
+        applicants: Applicants per role and group
+        selections: Selections per role and group
+        
+    Returns:
+        Counts, rates, four-fifths rule and significance results
+    """
+    pooled = analyze(applicants.sum(axis=0), selections.sum(axis=0))
+    by_role = analyze(applicants, selections)
+    rates = pooled["selection_rates"][0]
+    ratios = pooled["impact_ratios"][0]
+    
+    analysis = {
+        "applicants": dict(zip(groups, applicants.sum(axis=0).tolist())),
+        "selected": dict(zip(groups, selections.sum(axis=0).tolist())),
+        "selection_rates": {group: _rounded(rate) for group, rate in zip(groups, rates) if not np.isnan(rate)},
+        "impact_ratios": {group: _rounded(ratio) for group, ratio in zip(groups, ratios) if not np.isnan(ratio)},
+        "reference_group": None,
+        "lowest_group": None,
+        "impact_ratio": None,
+        "four_fifths_rule_violation": False,
+        "roles_in_violation": [roles[role] for role in np.flatnonzero(by_role["four_fifths_violations"].any(axis=1))],
+        "tests": {},
+        "p_value": None,
+        "statistically_significant": False,
+    }
+    if np.isnan(ratios).all():
+        return analysis
+    
+    reference = int(np.nanargmax(rates))
+    lowest = int(np.nanargmin(ratios))
+    analysis.update({
+        "reference_group": groups[reference],
+        "lowest_group": groups[lowest],
+        "impact_ratio": _rounded(ratios[lowest]),
+        "four_fifths_rule_violation": bool(pooled["four_fifths_violations"][0, lowest]),
+    })
+    if reference == lowest:
+        return analysis
+    
+    pair = int(pair_index(len(groups), reference, lowest))
+    tests = {
+        "fisher_exact": _rounded(pooled["fisher_p_values"][0, pair], 4),
+        "chi_square": _rounded(pooled["chi_square_p_values"][0, pair], 4),
+        "z_test": _rounded(pooled["z_p_values"][0, pair], 4),
+        "cochran_mantel_haenszel": _rounded(by_role["cmh_p_values"][pair], 4),
+    }
+    analysis.update({
+        "tests": tests,
+        "p_value": tests["fisher_exact"],
+        "statistically_significant": tests["fisher_exact"] is not None and tests["fisher_exact"] < SIGNIFICANCE_LEVEL,
+    })
+    return analysis
+
+
+async def analyze_counts(counts: SelectionCounts) -> Dict[str, dict]:
+    """
+    Analyze every EEO dimension, off the event loop.
+    
+    Args:
+        counts: Selection counts
+        
+    Returns:
+        analyze_dimension() result per dimension
+    """
+    def run() -> Dict[str, dict]:
+        return {
+            dimension: analyze_dimension(EEO_DIMENSIONS[dimension], counts.roles, applicants, selections)
+            for dimension, (applicants, selections) in counts.counts.items()
+        }
+    
+    return await asyncio.to_thread(run)
+
+
+def eeo_report(counts: SelectionCounts, analyses: Dict[str, dict]) -> dict:
+    """
+    Build the EEO report fields.
+    
+    Args:
+        counts: Selection counts
+        analyses: analyze_counts() result
+        
+    Returns:
+        EEOReport fields
+    """
+    return {
+        "total_applications": counts.total,
+        "applications_by_demographic": {dimension: analysis["applicants"] for dimension, analysis in analyses.items()},
+        "selection_rates": {dimension: analysis["selection_rates"] for dimension, analysis in analyses.items()},
+        "adverse_impact_analysis": {
+            dimension: {
+                "impact_ratio": analysis["impact_ratio"],
+                "statistically_significant": analysis["statistically_significant"],
+                "four_fifths_rule_violation": analysis["four_fifths_rule_violation"],
+            }
+            for dimension, analysis in analyses.items()
+        },
+    }
+
+
+def adverse_impact_report(analyses: Dict[str, dict]) -> dict:
+    """
+    Build the adverse impact analysis fields.
+    
+    Args:
+        analyses: analyze_counts() result
+        
+    Returns:
+        AdverseImpactAnalysis fields
+    """
+    return {
+        "protected_groups": {dimension: list(groups) for dimension, groups in EEO_DIMENSIONS.items()},
+        "selection_rates": {dimension: analysis["selection_rates"] for dimension, analysis in analyses.items()},
+        "four_fifths_rule": {
+            dimension: {
+                "impact_ratio": analysis["impact_ratio"],
+                "violation": analysis["four_fifths_rule_violation"],
+                "threshold": FOUR_FIFTHS_THRESHOLD,
+                "reference_group": analysis["reference_group"],
+                "lowest_group": analysis["lowest_group"],
+                "roles_in_violation": analysis["roles_in_violation"],
+            }
+            for dimension, analysis in analyses.items()
+        },
+        "statistical_significance": {
+            dimension: {
+                "p_value": analysis["p_value"],
+                "significant": analysis["statistically_significant"],
+                "confidence_level": 1 - SIGNIFICANCE_LEVEL,
+                "tests": analysis["tests"],
+            }
+            for dimension, analysis in analyses.items()
+        },
+    }
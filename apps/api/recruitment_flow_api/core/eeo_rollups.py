@@ -0,0 +1,366 @@
+"""
+Daily EEO rollups.
+
+EEO reports read applicant and selection counts from a rollup by
+organization, role, demographic group and day instead of scanning
+applications. Every row also carries the running totals of its cell
+up to that day, so the counts over any date range are two index
+lookups per cell, whatever the range:
+    
+    CREATE TABLE eeo_daily_rollups (
+        organization_id text NOT NULL,
+        role_id text NOT NULL,  -- '' for candidates without a role
+        dimension text NOT NULL,
+        group_value text NOT NULL,
+        day date NOT NULL,
+        applicants integer NOT NULL DEFAULT 0,
+        selected integer NOT NULL DEFAULT 0,
+        cumulative_applicants bigint NOT NULL DEFAULT 0,
+        cumulative_selected bigint NOT NULL DEFAULT 0,
+        PRIMARY KEY (organization_id, role_id, dimension, group_value, day)
+    );
+    
+    CREATE TABLE eeo_rollup_state (
+        id boolean PRIMARY KEY DEFAULT true CHECK (id),
+        last_event_id bigint NOT NULL DEFAULT 0,
+        rebuilt_at timestamptz
+    );
+    INSERT INTO eeo_rollup_state DEFAULT VALUES;
+    CREATE INDEX candidate_stage_events_candidate
+        ON candidate_stage_events (organization_id, candidate_id, id);
+
+Rollups are fed from the stage event log (see core/stage_events.py)
+by application cohort: a candidate counts as an applicant on the day
+they entered the pipeline and, once they first reach one of
+EEO_SELECTED_STATUSES, as selected on that same day, in each
+dimension they self-identified in. A cell never has more selections
+than applicants, and a date range reports the applicants of the range
+and how many of them were selected so far. Candidates whose
+application predates the event log are left out.
+The scheduler leader folds new events in every
+EEO_ROLLUP_REFRESH_INTERVAL seconds and rebuilds the rollups from
+scratch once a day after EEO_ROLLUP_REBUILD_HOUR (UTC), which also
+picks up self-identifications submitted after the events and events
+committed out of ID order. Nothing is rolled up while
+EEO_REPORTING_ENABLED is off.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from recruitment_flow_api.core.config import EEO_DIMENSIONS, EEO_SELECTED_STATUSES, TABLES, settings
+from recruitment_flow_api.core.database import execute_with_retry, get_engine
+from recruitment_flow_api.core.jobs import job_queue
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import leader_election
+
+# Logger
+logger = get_logger("eeo_rollups")
+
+ROLLUPS = TABLES["eeo_daily_rollups"]
+STATE = TABLES["eeo_rollup_state"]
+
+CELL_COLUMNS = "organization_id, role_id, dimension, group_value"
+
+# Applicants and selections per cell and application day for a range
+# of stage events. A selection is the candidate's first move into a
+# selected status and lands in the cell and day of their application.
+DELTAS_SQL = f"""
+SELECT
+    a.organization_id,
+    COALESCE(a.role_id, '') AS role_id,
+    dims.dimension,
+    dims.group_value,
+    (a.occurred_at AT TIME ZONE 'UTC')::date AS day,
+    COUNT(*) FILTER (WHERE e.id = a.id) AS applicants,
+    COUNT(*) FILTER (WHERE e.to_status = ANY(:selected_statuses) AND NOT EXISTS (
+        SELECT 1 FROM {TABLES["candidate_stage_events"]} p
+        WHERE p.organization_id = e.organization_id AND p.candidate_id = e.candidate_id
+        AND p.id < e.id AND p.to_status = ANY(:selected_statuses)
+    )) AS selected
+FROM {TABLES["candidate_stage_events"]} e
+CROSS JOIN LATERAL (
+    SELECT id, organization_id, role_id, occurred_at
+    FROM {TABLES["candidate_stage_events"]} a
+    WHERE a.organization_id = e.organization_id AND a.candidate_id = e.candidate_id
+    AND a.from_status IS NULL
+    ORDER BY a.id LIMIT 1
+) a
+JOIN {TABLES["eeo_self_identifications"]} s
+    ON s.candidate_id = e.candidate_id AND s.organization_id = e.organization_id
+CROSS JOIN LATERAL (VALUES {", ".join(f"('{dimension}', s.{dimension})" for dimension in EEO_DIMENSIONS)})
+    AS dims(dimension, group_value)
+WHERE e.id > :after_id AND e.id <= :until_id
+AND (CAST(:organization_id AS text) IS NULL OR e.organization_id = CAST(:organization_id AS text))
+AND dims.group_value IS NOT NULL
+AND (e.id = a.id OR e.to_status = ANY(:selected_statuses))
+GROUP BY 1, 2, 3, 4, 5
+"""
+
+NEXT_BATCH_SQL = f"""
+SELECT max(id) AS until_id, count(*) AS events
+FROM (
+    SELECT id FROM {TABLES["candidate_stage_events"]}
+    WHERE id > :after_id
+    ORDER BY id
+    LIMIT :limit
+) batch
+"""
+
+# Adds daily counts; running totals are recomputed by CUMULATIVE_SQL
+UPSERT_SQL = f"""
+INSERT INTO {ROLLUPS} ({CELL_COLUMNS}, day, applicants, selected)
+SELECT {CELL_COLUMNS}, day, applicants, selected
+FROM ({DELTAS_SQL}) deltas
+WHERE applicants > 0 OR selected > 0
+ON CONFLICT ({CELL_COLUMNS}, day) DO UPDATE SET
+    applicants = {ROLLUPS}.applicants + EXCLUDED.applicants,
+    selected = {ROLLUPS}.selected + EXCLUDED.selected
+RETURNING {CELL_COLUMNS}
+"""
+
+CUMULATIVE_SQL = f"""
+UPDATE {ROLLUPS} r
+SET cumulative_applicants = totals.cumulative_applicants,
+    cumulative_selected = totals.cumulative_selected
+FROM (
+    SELECT {CELL_COLUMNS}, day,
+        SUM(applicants) OVER cell AS cumulative_applicants,
+        SUM(selected) OVER cell AS cumulative_selected
+    FROM {ROLLUPS}
+    WHERE ({CELL_COLUMNS}) IN (
+        SELECT * FROM unnest(
+            CAST(:organization_ids AS text[]),
+            CAST(:role_ids AS text[]),
+            CAST(:dimensions AS text[]),
+            CAST(:group_values AS text[])
+        )
+    )
+    WINDOW cell AS (PARTITION BY {CELL_COLUMNS} ORDER BY day)
+) totals
+WHERE (r.organization_id, r.role_id, r.dimension, r.group_value, r.day) = (
+    totals.organization_id, totals.role_id, totals.dimension, totals.group_value, totals.day
+)
+AND (r.cumulative_applicants, r.cumulative_selected)
+    IS DISTINCT FROM (totals.cumulative_applicants, totals.cumulative_selected)
+"""
+
+REBUILD_DELETE_SQL = f"""
+DELETE FROM {ROLLUPS}
+WHERE CAST(:organization_id AS text) IS NULL OR organization_id = CAST(:organization_id AS text)
+"""
+
+REBUILD_INSERT_SQL = f"""
+INSERT INTO {ROLLUPS} ({CELL_COLUMNS}, day, applicants, selected, cumulative_applicants, cumulative_selected)
+SELECT {CELL_COLUMNS}, day, applicants, selected,
+    SUM(applicants) OVER cell,
+    SUM(selected) OVER cell
+FROM ({DELTAS_SQL}) deltas
+WHERE applicants > 0 OR selected > 0
+WINDOW cell AS (PARTITION BY {CELL_COLUMNS} ORDER BY day)
+"""
+
+# Counts per (role, dimension, group) cell over a date range: the
+# running totals at the end of the range minus those before its start.
+# Roles are enumerated with a skip scan over the primary key.
+RANGE_COUNTS_SQL = f"""
+WITH RECURSIVE rollup_roles AS (
+    (
+        SELECT role_id FROM {ROLLUPS}
+        WHERE organization_id = :organization_id AND CAST(:role_id AS text) IS NULL
+        ORDER BY role_id LIMIT 1
+    )
+    UNION ALL
+    SELECT (
+        SELECT r.role_id FROM {ROLLUPS} r
+        WHERE r.organization_id = :organization_id AND r.role_id > rollup_roles.role_id
+        ORDER BY r.role_id LIMIT 1
+    )
+    FROM rollup_roles
+    WHERE rollup_roles.role_id IS NOT NULL
+),
+cells AS (
+    SELECT role_id, dimension, group_value
+    FROM (
+        SELECT role_id FROM rollup_roles WHERE role_id IS NOT NULL
+        UNION ALL
+        SELECT CAST(:role_id AS text) WHERE CAST(:role_id AS text) IS NOT NULL
+    ) role_ids
+    CROSS JOIN (VALUES {", ".join(
+        f"('{dimension}', '{group}')" for dimension, groups in EEO_DIMENSIONS.items() for group in groups
+    )}) AS eeo_groups(dimension, group_value)
+)
+SELECT
+    cells.role_id,
+    cells.dimension,
+    cells.group_value,
+    upper.cumulative_applicants - COALESCE(lower.cumulative_applicants, 0) AS applicants,
+    upper.cumulative_selected - COALESCE(lower.cumulative_selected, 0) AS selected
+FROM cells
+CROSS JOIN LATERAL (
+    SELECT cumulative_applicants, cumulative_selected FROM {ROLLUPS} r
+    WHERE r.organization_id = :organization_id AND r.role_id = cells.role_id
+    AND r.dimension = cells.dimension AND r.group_value = cells.group_value
+    AND (CAST(:date_to AS date) IS NULL OR r.day <= CAST(:date_to AS date))
+    ORDER BY r.day DESC LIMIT 1
+) upper
+LEFT JOIN LATERAL (
+    SELECT cumulative_applicants, cumulative_selected FROM {ROLLUPS} r
+    WHERE r.organization_id = :organization_id AND r.role_id = cells.role_id
+    AND r.dimension = cells.dimension AND r.group_value = cells.group_value
+    AND CAST(:date_from AS date) IS NOT NULL AND r.day < CAST(:date_from AS date)
+    ORDER BY r.day DESC LIMIT 1
+) lower ON true
+"""
+
+
+async def _lock_state(conn: AsyncConnection) -> dict:
+    """Lock the rollup state row, serializing refreshes and rebuilds."""
+    result = await conn.execute(text(f"SELECT last_event_id, rebuilt_at FROM {STATE} FOR UPDATE"))
+    return dict(result.mappings().one())
+
+
+async def refresh_rollups(batch_size: Optional[int] = None) -> int:
+    """
+    Fold stage events after the watermark into the rollups.
+    
+    Each batch adds its daily counts, recomputes the running totals of
+    the cells it touched and advances the watermark in one
+    transaction, so a failed batch is retried as a whole.
+    
+    Args:
+        batch_size: Events per batch (defaults to EEO_ROLLUP_BATCH_SIZE)
+        
+    Returns:
+        Number of events folded in
+    """
+    batch_size = batch_size or settings.EEO_ROLLUP_BATCH_SIZE
+    db_engine = await get_engine("jobs")
+    folded = 0
+    
+    while True:
+        async with db_engine.begin() as conn:
+            state = await _lock_state(conn)
+            batch = (await conn.execute(
+                text(NEXT_BATCH_SQL),
+                {"after_id": state["last_event_id"], "limit": batch_size},
+            )).mappings().one()
+            if not batch["events"]:
+                break
+            
+            cells = set((await conn.execute(text(UPSERT_SQL), {
+                "after_id": state["last_event_id"],
+                "until_id": batch["until_id"],
+                "organization_id": None,
+                "selected_statuses": EEO_SELECTED_STATUSES,
+            })).all())
+            if cells:
+                organization_ids, role_ids, dimensions, group_values = (list(column) for column in zip(*cells))
+                await conn.execute(text(CUMULATIVE_SQL), {
+                    "organization_ids": organization_ids,
+                    "role_ids": role_ids,
+                    "dimensions": dimensions,
+                    "group_values": group_values,
+                })
+            await conn.execute(
+                text(f"UPDATE {STATE} SET last_event_id = :until_id"),
+                {"until_id": batch["until_id"]},
+            )
+        
+        folded += batch["events"]
+        if batch["events"] < batch_size:
+            break
+    
+    if folded:
+        logger.info(f"Folded {folded} stage events into EEO rollups")
+    return folded
+
+
+async def rebuild_rollups(organization_id: Optional[str] = None) -> int:
+    """
+    Rebuild the rollups from the full stage event log.
+    
+    A rebuild of all organizations also advances the watermark to the
+    latest event; rebuilding one organization keeps the watermark, so
+    incremental refreshes carry on where they were.
+    
+    Args:
+        organization_id: Rebuild one organization (defaults to all)
+        
+    Returns:
+        Number of rollup rows written
+    """
+    db_engine = await get_engine("jobs")
+    
+    async with db_engine.begin() as conn:
+        state = await _lock_state(conn)
+        until_id = state["last_event_id"]
+        if organization_id is None:
+            until_id = (await conn.execute(
+                text(f"SELECT COALESCE(max(id), 0) FROM {TABLES['candidate_stage_events']}")
+            )).scalar()
+        
+        await conn.execute(text(REBUILD_DELETE_SQL), {"organization_id": organization_id})
+        result = await conn.execute(text(REBUILD_INSERT_SQL), {
+            "after_id": 0,
+            "until_id": until_id,
+            "organization_id": organization_id,
+            "selected_statuses": EEO_SELECTED_STATUSES,
+        })
+        if organization_id is None:
+            await conn.execute(
+                text(f"UPDATE {STATE} SET last_event_id = :until_id, rebuilt_at = now()"),
+                {"until_id": until_id},
+            )
+    
+    logger.info(
+        f"Rebuilt EEO rollups for {organization_id or 'all organizations'}: "
+        f"{result.rowcount} rows up to event {until_id}"
+    )
+    return result.rowcount
+
+
+def _rebuild_due(rebuilt_at: Optional[datetime], now: datetime) -> bool:
+    if now.hour < settings.EEO_ROLLUP_REBUILD_HOUR:
+        return rebuilt_at is None
+    return rebuilt_at is None or rebuilt_at.astimezone(timezone.utc).date() < now.date()
+
+
+@leader_election.schedule(
+    "eeo_rollups.refresh",
+    interval=settings.EEO_ROLLUP_REFRESH_INTERVAL,
+)
+async def scheduled_refresh(fencing_token: int) -> None:
+    """Refresh the rollups on the scheduler leader, rebuilding them nightly."""
+    if not settings.EEO_REPORTING_ENABLED:
+        return
+    
+    db_engine = await get_engine("jobs")
+    async with db_engine.connect() as conn:
+        rebuilt_at = (await conn.execute(text(f"SELECT rebuilt_at FROM {STATE}"))).scalar()
+    
+    if _rebuild_due(rebuilt_at, datetime.now(timezone.utc)):
+        await execute_with_retry(rebuild_rollups)
+    else:
+        await execute_with_retry(refresh_rollups)
+
+
+@job_queue.handler("eeo_rollups.rebuild")
+async def run_rebuild(payload: dict) -> dict:
+    """
+    Rebuild the rollups on request.
+    
+    Args:
+        payload: Optional organization_id to rebuild
+        
+    Returns:
+        Rebuild results
+    """
+    if not settings.EEO_REPORTING_ENABLED:
+        return {"message": "EEO reporting is disabled", "rows": 0}
+    
+    rows = await rebuild_rollups(payload.get("organization_id"))
+    return {"message": f"Rebuilt {rows} EEO rollup rows", "rows": rows}
@@ -0,0 +1,207 @@
+"""
+Database query instrumentation.
+
+This module hooks SQLAlchemy cursor events to measure every
+statement, aggregate latency by normalized statement fingerprint,
+log slow queries and detect N+1 query patterns within a request.
+"""
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.logging import get_logger, log_database_query
+
+# Logger
+logger = get_logger("instrumentation")
+
+QUERY_DURATION_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    ["engine"],
+)
+
+# Statement counts per fingerprint for the request being served
+_request_queries: ContextVar[Optional[Counter]] = ContextVar("request_queries", default=None)
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so executions differing only in
+    literal values, bind parameters or list lengths group together.
+    
+    Args:
+        statement: SQL statement
+        
+    Returns:
+        Statement fingerprint
+    """
+    normalized = _COMMENT.sub(" ", statement)
+    normalized = _STRING.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?...)", normalized)
+    normalized = _VALUES_LIST.sub(r"\1", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """
+    In-memory latency aggregates per statement fingerprint.
+    
+    The number of tracked fingerprints is bounded; when full, the
+    fingerprint with the least total time is dropped to make room.
+    """
+    
+    def __init__(self, max_fingerprints: Optional[int] = None):
+        self.max_fingerprints = max_fingerprints or settings.DATABASE_QUERY_STATS_MAX_FINGERPRINTS
+        self._stats: Dict[str, Dict[str, Any]] = {}
+    
+    def record(self, statement_fingerprint: str, duration: float, rows: int) -> None:
+        """
+        Record one statement execution.
+        
+        Args:
+            statement_fingerprint: Statement fingerprint
+            duration: Execution time in seconds
+            rows: Rows returned or affected (-1 if unknown)
+        """
+        stats = self._stats.get(statement_fingerprint)
+        if stats is None:
+            if len(self._stats) >= self.max_fingerprints:
+                least = min(self._stats, key=lambda key: self._stats[key]["total_time"])
+                del self._stats[least]
+            stats = self._stats[statement_fingerprint] = {
+                "calls": 0,
+                "total_time": 0.0,
+                "max_time": 0.0,
+                "rows": 0,
+            }
+        
+        stats["calls"] += 1
+        stats["total_time"] += duration
+        stats["max_time"] = max(stats["max_time"], duration)
+        if rows > 0:
+            stats["rows"] += rows
+    
+    def top(self, limit: int = 10, order_by: str = "total_time") -> List[dict]:
+        """
+        Get the most expensive fingerprints.
+        
+        Args:
+            limit: Number of fingerprints to return
+            order_by: "total_time", "max_time", "calls" or "mean_time"
+            
+        Returns:
+            Fingerprint statistics, most expensive first
+        """
+        entries = [
+            {
+                "fingerprint": key,
+                "calls": stats["calls"],
+                "total_time": stats["total_time"],
+                "mean_time": stats["total_time"] / stats["calls"],
+                "max_time": stats["max_time"],
+                "rows": stats["rows"],
+            }
+            for key, stats in self._stats.items()
+        ]
+        entries.sort(key=lambda entry: entry[order_by], reverse=True)
+        return entries[:limit]
+    
+    def reset(self) -> None:
+        """Clear all aggregates."""
+        self._stats.clear()
+
+
+def begin_request_tracking() -> Any:
+    """
+    Start counting statements for the current request.
+    
+    Returns:
+        Token to pass to end_request_tracking()
+    """
+    return _request_queries.set(Counter())
+
+
+def end_request_tracking(token: Any) -> None:
+    """
+    Stop counting statements for the current request.
+    
+    Args:
+        token: Token returned by begin_request_tracking()
+    """
+    _request_queries.reset(token)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    Attach query instrumentation to an engine.
+    
+    Args:
+        engine: Engine to instrument
+        name: Engine name used in metrics
+    """
+    sync_engine = engine.sync_engine
+    duration_metric = QUERY_DURATION_SECONDS.labels(name)
+    slow_threshold = settings.DATABASE_SLOW_QUERY_MS / 1000
+    n_plus_one_threshold = settings.DATABASE_N_PLUS_ONE_THRESHOLD
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        rows = getattr(cursor, "rowcount", -1)
+        statement_fingerprint = fingerprint(statement)
+        
+        duration_metric.observe(duration)
+        query_stats.record(statement_fingerprint, duration, rows)
+        
+        if duration >= slow_threshold:
+            log_database_query(
+                statement_fingerprint,
+                parameters if settings.DATABASE_LOG_QUERY_PARAMS else None,
+                duration,
+                rows=rows,
+            )
+        
+        request_queries = _request_queries.get()
+        if request_queries is not None:
+            request_queries[statement_fingerprint] += 1
+            # Warn once per request, when the threshold is first crossed
+            if request_queries[statement_fingerprint] == n_plus_one_threshold + 1:
+                logger.warning(
+                    f"Possible N+1 query: statement ran more than {n_plus_one_threshold} "
+                    f"times in one request: {statement_fingerprint}"
+                )
+    
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        # Keep the timing stack balanced when a statement fails
+        start_times = context.connection.info.get("query_start_time") if context.connection else None
+        if start_times:
+            start_times.pop()
+
+
+# Global instance
+query_stats = QueryStats()
@@ -0,0 +1,514 @@
+"""
+Background job queue.
+
+This module implements a job queue on Redis Streams consumer groups,
+used to move slow work such as AI screening and bulk imports out of
+request handlers. Jobs are enqueued into priority lanes, claimed by
+worker processes, retried with exponential backoff, and reclaimed
+from workers that crashed mid-job.
+
+Payloads larger than JOB_PAYLOAD_INLINE_MAX_BYTES (such as bulk
+imports) are kept in Postgres rather than in Redis memory; the job
+hash only references them:
+    
+    CREATE TABLE job_payloads (
+        job_id text PRIMARY KEY,
+        payload text NOT NULL,
+        created_at timestamptz NOT NULL DEFAULT now()
+    );
+    CREATE INDEX job_payloads_created_at ON job_payloads (created_at);
+
+A payload is deleted when its job succeeds; payloads of failed or
+expired jobs are purged once they are older than JOB_RESULT_TTL.
+"""
+
+import asyncio
+import json
+import random
+import socket
+import time
+import uuid
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from redis.exceptions import ResponseError
+from sqlalchemy import text
+
+from recruitment_flow_api.core.config import TABLES, settings
+from recruitment_flow_api.core.database import get_engine
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import LuaScript, get_redis
+
+# Logger
+logger = get_logger("jobs")
+
+# Job statuses
+JOB_STATUSES = [
+    "queued",
+    "running",
+    "retrying",
+    "succeeded",
+    "failed",
+]
+
+# Priority lanes, highest first
+JOB_PRIORITIES = ["high", "default", "low"]
+
+JobHandler = Callable[[dict], Awaitable[Any]]
+
+# Moves a due job from the delayed set onto its lane in one step; ZREM
+# decides which worker wins the job when several race
+PROMOTE_JOB_SCRIPT = """
+if redis.call("ZREM", KEYS[1], ARGV[1]) == 1 then
+    redis.call("XADD", KEYS[2], "MAXLEN", "~", ARGV[2], "*", "job_id", ARGV[1])
+    return 1
+end
+return 0
+"""
+
+_promote_job_script = LuaScript(PROMOTE_JOB_SCRIPT)
+
+
+class JobQueue:
+    """
+    Redis Streams job queue.
+    
+    Each priority lane is a stream read by one consumer group. Job
+    state (payload, status, attempts, result) lives in a hash per job
+    so it can be queried while the job is pending. All keys share a
+    hash tag, so the queue also works on Redis Cluster.
+    """
+    
+    def __init__(self, name: str = "default", group: str = "workers"):
+        self.name = name
+        self.group = group
+        self._handlers: Dict[str, JobHandler] = {}
+        self._streams = {lane: f"jobs:{{{name}}}:{lane}" for lane in JOB_PRIORITIES}
+        self._lanes_by_stream = {stream: lane for lane, stream in self._streams.items()}
+        self._delayed_key = f"jobs:{{{name}}}:delayed"
+        self._dead_key = f"jobs:{{{name}}}:dead"
+        self._last_maintenance = 0.0
+        self._last_payload_purge = 0.0
+    
+    def handler(self, job_type: str) -> Callable[[JobHandler], JobHandler]:
+        """
+        Register a coroutine function as the handler for a job type.
+        
+        Args:
+            job_type: Job type name (e.g. "candidates.screen")
+            
+        Returns:
+            Decorator registering the handler
+        """
+        def decorator(func: JobHandler) -> JobHandler:
+            self._handlers[job_type] = func
+            return func
+        
+        return decorator
+    
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: dict,
+        priority: str = "default",
+        max_attempts: Optional[int] = None,
+        organization_id: Optional[str] = None,
+    ) -> str:
+        """
+        Enqueue a job.
+        
+        Args:
+            job_type: Job type name
+            payload: JSON-serializable job arguments
+            priority: Priority lane ("high", "default" or "low")
+            max_attempts: Attempts before the job is marked failed
+            organization_id: Owning organization, used for access checks
+            
+        Returns:
+            Job identifier
+        """
+        if priority not in self._streams:
+            raise ValueError(f"Unknown job priority: {priority}")
+        
+        redis = await get_redis()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        
+        encoded = json.dumps(payload)
+        if len(encoded) > settings.JOB_PAYLOAD_INLINE_MAX_BYTES:
+            await self._store_payload(job_id, encoded)
+            payload_fields = {"payload_ref": job_id}
+        else:
+            payload_fields = {"payload": encoded}
+        
+        pipe = redis.pipeline(transaction=False)
+        pipe.hset(self._job_key(job_id), mapping={
+            "id": job_id,
+            "type": job_type,
+            "priority": priority,
+            **payload_fields,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+            "organization_id": organization_id or "",
+            "created_at": now,
+            "updated_at": now,
+        })
+        pipe.expire(self._job_key(job_id), settings.JOB_RESULT_TTL)
+        pipe.xadd(
+            self._streams[priority],
+            {"job_id": job_id},
+            maxlen=settings.JOB_STREAM_MAXLEN,
+            approximate=True,
+        )
+        await pipe.execute()
+        
+        return job_id
+    
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        """
+        Get job status.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            Job data or None if unknown or expired
+        """
+        redis = await get_redis()
+        job = await redis.hgetall(self._job_key(job_id))
+        if not job:
+            return None
+        
+        return {
+            "id": job["id"],
+            "type": job["type"],
+            "priority": job["priority"],
+            "status": job["status"],
+            "attempts": int(job["attempts"]),
+            "max_attempts": int(job["max_attempts"]),
+            "organization_id": job.get("organization_id") or None,
+            "result": json.loads(job["result"]) if "result" in job else None,
+            "error": job.get("error"),
+            "created_at": float(job["created_at"]),
+            "updated_at": float(job["updated_at"]),
+            "next_attempt_at": float(job["next_attempt_at"]) if "next_attempt_at" in job else None,
+        }
+    
+    async def ensure_groups(self) -> None:
+        """Create the consumer group on every lane stream if missing."""
+        redis = await get_redis()
+        for stream in self._streams.values():
+            try:
+                await redis.xgroup_create(stream, self.group, id="0", mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+    
+    async def run_worker(
+        self,
+        concurrency: Optional[int] = None,
+        stop_event: Optional[asyncio.Event] = None,
+    ) -> None:
+        """
+        Process jobs until stopped.
+        
+        Args:
+            concurrency: Number of jobs processed concurrently
+            stop_event: Event that stops the worker when set
+        """
+        await self.ensure_groups()
+        
+        concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        stop_event = stop_event or asyncio.Event()
+        base_name = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        
+        logger.info(f"Job worker {base_name} started with concurrency {concurrency}")
+        await asyncio.gather(*[
+            self._consume(f"{base_name}-{index}", stop_event)
+            for index in range(concurrency)
+        ])
+        logger.info(f"Job worker {base_name} stopped")
+    
+    async def _consume(self, consumer: str, stop_event: asyncio.Event) -> None:
+        while not stop_event.is_set():
+            try:
+                redis = await get_redis()
+                
+                if time.monotonic() - self._last_maintenance >= settings.JOB_MAINTENANCE_INTERVAL:
+                    self._last_maintenance = time.monotonic()
+                    await self._promote_due_retries(redis)
+                    await self._reclaim_stale(redis, consumer)
+                    await self._purge_expired_payloads()
+                
+                for lane, message_id, job_id in await self._read(redis, consumer):
+                    await self._process(redis, consumer, lane, message_id, job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Job consumer {consumer} error: {e}")
+                await asyncio.sleep(1)
+    
+    async def _read(self, redis: Any, consumer: str) -> List[Tuple[str, str, str]]:
+        """
+        Read the next job, honouring lane priority.
+        
+        Lanes are polled without blocking in priority order; only when
+        all are empty does the consumer block on every lane at once.
+        
+        Args:
+            redis: Redis client
+            consumer: Consumer name
+            
+        Returns:
+            List of (lane, message_id, job_id) in priority order
+        """
+        for stream in self._streams.values():
+            response = await redis.xreadgroup(self.group, consumer, {stream: ">"}, count=1)
+            if response:
+                return self._parse_messages(response)
+        
+        response = await redis.xreadgroup(
+            self.group,
+            consumer,
+            {stream: ">" for stream in self._streams.values()},
+            count=1,
+            block=settings.JOB_POLL_BLOCK_MS,
+        )
+        return self._parse_messages(response or [])
+    
+    def _parse_messages(self, response: list) -> List[Tuple[str, str, str]]:
+        messages = []
+        for stream, entries in response:
+            lane = self._lanes_by_stream[stream]
+            for message_id, fields in entries:
+                messages.append((lane, message_id, fields.get("job_id", "")))
+        
+        messages.sort(key=lambda message: JOB_PRIORITIES.index(message[0]))
+        return messages
+    
+    async def _process(
+        self,
+        redis: Any,
+        consumer: str,
+        lane: str,
+        message_id: str,
+        job_id: str,
+    ) -> None:
+        stream = self._streams[lane]
+        job_key = self._job_key(job_id)
+        job = await redis.hgetall(job_key)
+        
+        if not job or job["status"] in ("succeeded", "failed"):
+            # Expired job or duplicate delivery of a finished one
+            await redis.xack(stream, self.group, message_id)
+            return
+        
+        attempts = int(job["attempts"]) + 1
+        now = time.time()
+        await redis.hset(job_key, mapping={
+            "status": "running",
+            "attempts": attempts,
+            "updated_at": now,
+        })
+        
+        handler = self._handlers.get(job["type"])
+        heartbeat = asyncio.create_task(self._heartbeat(redis, stream, consumer, message_id))
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job type {job['type']}")
+            result = await handler(await self._load_payload(job))
+        except Exception as e:
+            retryable = handler is not None and attempts < int(job["max_attempts"])
+            await self._fail(redis, stream, message_id, job_id, attempts, e, retryable)
+            return
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+        
+        pipe = redis.pipeline(transaction=False)
+        pipe.hset(job_key, mapping={
+            "status": "succeeded",
+            "result": json.dumps(result),
+            "updated_at": time.time(),
+        })
+        pipe.hdel(job_key, "error", "next_attempt_at")
+        pipe.expire(job_key, settings.JOB_RESULT_TTL)
+        pipe.xack(stream, self.group, message_id)
+        await pipe.execute()
+        
+        if "payload_ref" in job:
+            await self._delete_payload(job["payload_ref"])
+    
+    async def _fail(
+        self,
+        redis: Any,
+        stream: str,
+        message_id: str,
+        job_id: str,
+        attempts: int,
+        error: Exception,
+        retryable: bool,
+    ) -> None:
+        job_key = self._job_key(job_id)
+        now = time.time()
+        pipe = redis.pipeline(transaction=False)
+        
+        if retryable:
+            # Exponential backoff with full jitter
+            delay = min(
+                settings.JOB_RETRY_MAX_DELAY,
+                settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+            )
+            next_attempt_at = now + random.uniform(0, delay)
+            pipe.hset(job_key, mapping={
+                "status": "retrying",
+                "error": str(error),
+                "next_attempt_at": next_attempt_at,
+                "updated_at": now,
+            })
+            pipe.zadd(self._delayed_key, {job_id: next_attempt_at})
+            logger.warning(f"Job {job_id} attempt {attempts} failed, retrying: {error}")
+        else:
+            pipe.hset(job_key, mapping={
+                "status": "failed",
+                "error": str(error),
+                "updated_at": now,
+            })
+            pipe.xadd(
+                self._dead_key,
+                {"job_id": job_id},
+                maxlen=settings.JOB_STREAM_MAXLEN,
+                approximate=True,
+            )
+            logger.error(f"Job {job_id} failed after {attempts} attempts: {error}")
+        
+        pipe.expire(job_key, settings.JOB_RESULT_TTL)
+        pipe.xack(stream, self.group, message_id)
+        await pipe.execute()
+    
+    async def _heartbeat(self, redis: Any, stream: str, consumer: str, message_id: str) -> None:
+        # Reset the pending entry's idle time so long jobs are not reclaimed
+        interval = max(1, settings.JOB_VISIBILITY_TIMEOUT // 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await redis.xclaim(stream, self.group, consumer, 0, [message_id], justid=True)
+            except Exception as e:
+                # A missed beat only risks a duplicate delivery; never fail the job for it
+                logger.warning(f"Heartbeat for job message {message_id} failed: {e}")
+    
+    async def _promote_due_retries(self, redis: Any) -> int:
+        """
+        Move jobs whose retry delay has elapsed back onto their lane.
+        
+        Args:
+            redis: Redis client
+            
+        Returns:
+            Number of jobs re-enqueued
+        """
+        due = await redis.zrangebyscore(self._delayed_key, 0, time.time(), start=0, num=100)
+        promoted = 0
+        for job_id in due:
+            priority = await redis.hget(self._job_key(job_id), "priority")
+            if priority is None:
+                # Job expired while waiting
+                await redis.zrem(self._delayed_key, job_id)
+                continue
+            
+            promoted += await _promote_job_script(
+                redis,
+                [self._delayed_key, self._streams[priority]],
+                [job_id, settings.JOB_STREAM_MAXLEN],
+            )
+        return promoted
+    
+    async def _reclaim_stale(self, redis: Any, consumer: str) -> None:
+        """
+        Take over jobs left pending by crashed workers.
+        
+        Claimed messages are processed immediately; their attempt
+        count still increases, so a job that keeps crashing its worker
+        eventually fails.
+        
+        Args:
+            redis: Redis client
+            consumer: Consumer name claiming the jobs
+        """
+        for lane, stream in self._streams.items():
+            response = await redis.xautoclaim(
+                stream,
+                self.group,
+                consumer,
+                min_idle_time=settings.JOB_VISIBILITY_TIMEOUT * 1000,
+                start_id="0-0",
+                count=10,
+            )
+            for message_id, fields in response[1]:
+                if fields is None:
+                    # Entry was trimmed from the stream
+                    await redis.xack(stream, self.group, message_id)
+                    continue
+                logger.warning(f"Reclaimed stale job message {message_id} from {stream}")
+                await self._process(redis, consumer, lane, message_id, fields.get("job_id", ""))
+    
+    async def _store_payload(self, job_id: str, encoded: str) -> None:
+        db_engine = await get_engine("jobs")
+        async with db_engine.begin() as conn:
+            await conn.execute(
+                text(f"INSERT INTO {TABLES['job_payloads']} (job_id, payload) VALUES (:job_id, :payload)"),
+                {"job_id": job_id, "payload": encoded},
+            )
+    
+    async def _load_payload(self, job: Dict[str, str]) -> dict:
+        if "payload" in job:
+            return json.loads(job["payload"])
+        
+        db_engine = await get_engine("jobs")
+        async with db_engine.connect() as conn:
+            encoded = (await conn.execute(
+                text(f"SELECT payload FROM {TABLES['job_payloads']} WHERE job_id = :job_id"),
+                {"job_id": job["payload_ref"]},
+            )).scalar()
+        if encoded is None:
+            raise LookupError(f"Payload of job {job['id']} is missing")
+        return json.loads(encoded)
+    
+    async def _delete_payload(self, job_id: str) -> None:
+        try:
+            db_engine = await get_engine("jobs")
+            async with db_engine.begin() as conn:
+                await conn.execute(
+                    text(f"DELETE FROM {TABLES['job_payloads']} WHERE job_id = :job_id"),
+                    {"job_id": job_id},
+                )
+        except Exception as e:
+            # Left for _purge_expired_payloads()
+            logger.warning(f"Could not delete payload of job {job_id}: {e}")
+    
+    async def _purge_expired_payloads(self) -> None:
+        """Delete stored payloads older than JOB_RESULT_TTL, at most hourly per worker."""
+        if time.monotonic() - self._last_payload_purge < 3600:
+            return
+        self._last_payload_purge = time.monotonic()
+        
+        db_engine = await get_engine("jobs")
+        async with db_engine.begin() as conn:
+            result = await conn.execute(
+                text(
+                    f"DELETE FROM {TABLES['job_payloads']} "
+                    "WHERE created_at < now() - make_interval(secs => :ttl)"
+                ),
+                {"ttl": settings.JOB_RESULT_TTL},
+            )
+        if result.rowcount:
+            logger.info(f"Purged {result.rowcount} expired job payloads")
+    
+    def _job_key(self, job_id: str) -> str:
+        return f"jobs:{{{self.name}}}:job:{job_id}"
+
+
+# Global instance
+job_queue = JobQueue(name=settings.JOB_QUEUE_NAME)
@@ -0,0 +1,260 @@
+"""
+Redis key-space analysis.
+
+This module samples the Redis key space to report memory usage,
+key counts and TTL distribution per key prefix, and flags keys
+without a TTL or with oversized values. Run it from the admin API
+or from the command line:
+    
+    python -m recruitment_flow_api.core.keyspace --sample-size 50000
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import close_redis, get_redis, init_redis
+
+# Logger
+logger = get_logger("keyspace")
+
+# TTL buckets as (label, upper bound in seconds)
+TTL_BUCKETS = [
+    ("<1m", 60),
+    ("1m-1h", 3600),
+    ("1h-1d", 86400),
+    (">1d", None),
+]
+
+_HASH_TAG = re.compile(r"\{[^}]*\}")
+
+
+def key_prefix(key: str, depth: int = 1) -> str:
+    """
+    Get the prefix a key is grouped under.
+    
+    Cluster hash tags are collapsed so keys such as
+    "rate_limit:{user:abc}:60" group together, and the last segment
+    (usually an identifier) is never part of the prefix.
+    
+    Args:
+        key: Redis key
+        depth: Number of ":"-separated segments to keep
+        
+    Returns:
+        Key prefix
+    """
+    segments = _HASH_TAG.sub("{}", key).split(":")
+    return ":".join(segments[:min(depth, max(1, len(segments) - 1))])
+
+
+def _ttl_bucket(ttl_ms: int) -> str:
+    if ttl_ms < 0:
+        return "none"
+    for label, bound in TTL_BUCKETS:
+        if bound is None or ttl_ms < bound * 1000:
+            return label
+    return TTL_BUCKETS[-1][0]
+
+
+async def analyze_keyspace(
+    sample_size: Optional[int] = None,
+    match: str = "*",
+    prefix_depth: int = 1,
+    oversized_bytes: Optional[int] = None,
+    top_n: int = 20,
+) -> dict:
+    """
+    Sample the key space and aggregate memory usage by key prefix.
+    
+    Keys are visited with SCAN and measured with MEMORY USAGE in
+    pipelined batches, so the scan never blocks Redis. When the scan
+    stops at sample_size, per-prefix totals are extrapolated to the
+    full key space using DBSIZE.
+    
+    Args:
+        sample_size: Maximum keys to inspect (defaults to KEYSPACE_SAMPLE_SIZE)
+        match: SCAN MATCH pattern
+        prefix_depth: Number of key segments that form a prefix
+        oversized_bytes: Size at which a key is flagged (defaults to KEYSPACE_OVERSIZED_BYTES)
+        top_n: Number of keys listed per flag and per largest-keys list
+        
+    Returns:
+        Key-space report
+    """
+    redis = await get_redis()
+    sample_size = sample_size or settings.KEYSPACE_SAMPLE_SIZE
+    oversized_bytes = oversized_bytes or settings.KEYSPACE_OVERSIZED_BYTES
+    batch_size = settings.CACHE_SCAN_COUNT
+    
+    prefixes: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+        "keys": 0,
+        "bytes": 0,
+        "max_bytes": 0,
+        "types": Counter(),
+        "ttl": Counter(),
+        "no_ttl": 0,
+        "oversized": 0,
+    })
+    largest: List[Tuple[int, str]] = []
+    no_ttl: List[Tuple[int, str]] = []
+    oversized: List[Tuple[int, str]] = []
+    sampled = 0
+    
+    async def measure(keys: List[str]) -> None:
+        pipe = redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.memory_usage(key)
+            pipe.pttl(key)
+            pipe.type(key)
+        results = await pipe.execute(raise_on_error=False)
+        
+        for index, key in enumerate(keys):
+            size, ttl_ms, key_type = results[index * 3:index * 3 + 3]
+            if size is None or isinstance(size, Exception) or ttl_ms == -2:
+                # Key expired or was deleted between SCAN and MEMORY USAGE
+                continue
+            
+            stats = prefixes[key_prefix(key, prefix_depth)]
+            stats["keys"] += 1
+            stats["bytes"] += size
+            stats["max_bytes"] = max(stats["max_bytes"], size)
+            stats["types"][key_type] += 1
+            stats["ttl"][_ttl_bucket(ttl_ms)] += 1
+            
+            largest.append((size, key))
+            if ttl_ms == -1:
+                stats["no_ttl"] += 1
+                no_ttl.append((size, key))
+            if size >= oversized_bytes:
+                stats["oversized"] += 1
+                oversized.append((size, key))
+        
+        # Keep only the top entries so memory stays bounded on large key spaces
+        for entries in (largest, no_ttl, oversized):
+            entries.sort(reverse=True)
+            del entries[top_n:]
+    
+    batch: List[str] = []
+    async for key in redis.scan_iter(match=match, count=batch_size):
+        batch.append(key)
+        sampled += 1
+        if len(batch) >= batch_size:
+            await measure(batch)
+            batch = []
+        if sampled >= sample_size:
+            break
+    if batch:
+        await measure(batch)
+    
+    total_keys = await redis.dbsize()
+    complete = sampled < sample_size
+    # Extrapolation is only meaningful when sampling the whole key space
+    scale = total_keys / sampled if not complete and match == "*" else 1.0
+    
+    report_prefixes = []
+    for prefix, stats in prefixes.items():
+        report_prefixes.append({
+            "prefix": prefix,
+            "sampled_keys": stats["keys"],
+            "sampled_bytes": stats["bytes"],
+            "estimated_keys": round(stats["keys"] * scale),
+            "estimated_bytes": round(stats["bytes"] * scale),
+            "avg_bytes": round(stats["bytes"] / stats["keys"]),
+            "max_bytes": stats["max_bytes"],
+            "types": dict(stats["types"]),
+            "ttl_distribution": dict(stats["ttl"]),
+            "keys_without_ttl": stats["no_ttl"],
+            "oversized_keys": stats["oversized"],
+        })
+    report_prefixes.sort(key=lambda entry: entry["sampled_bytes"], reverse=True)
+    
+    sampled_bytes = sum(entry["sampled_bytes"] for entry in report_prefixes)
+    for entry in report_prefixes:
+        entry["share"] = round(entry["sampled_bytes"] / sampled_bytes, 4) if sampled_bytes else 0.0
+    
+    return {
+        "total_keys": total_keys,
+        "sampled_keys": sampled,
+        "complete": complete,
+        "sampled_bytes": sampled_bytes,
+        "estimated_bytes": round(sampled_bytes * scale),
+        "oversized_threshold_bytes": oversized_bytes,
+        "prefixes": report_prefixes,
+        "largest_keys": [{"key": key, "bytes": size} for size, key in largest],
+        "keys_without_ttl": [{"key": key, "bytes": size} for size, key in no_ttl],
+        "oversized_keys": [{"key": key, "bytes": size} for size, key in oversized],
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    Render a key-space report as a text table.
+    
+    Args:
+        report: Report returned by analyze_keyspace()
+        
+    Returns:
+        Human-readable report
+    """
+    lines = [
+        f"Sampled {report['sampled_keys']} of {report['total_keys']} keys"
+        f" ({'complete' if report['complete'] else 'extrapolated'}),"
+        f" ~{report['estimated_bytes'] / 1024 / 1024:.1f} MiB",
+        "",
+        f"{'PREFIX':<32} {'KEYS':>10} {'MIB':>10} {'SHARE':>7} {'AVG B':>10} {'NO TTL':>8} {'BIG':>6}",
+    ]
+    for entry in report["prefixes"]:
+        lines.append(
+            f"{entry['prefix'][:32]:<32} {entry['estimated_keys']:>10}"
+            f" {entry['estimated_bytes'] / 1024 / 1024:>10.2f} {entry['share']:>7.1%}"
+            f" {entry['avg_bytes']:>10} {entry['keys_without_ttl']:>8} {entry['oversized_keys']:>6}"
+        )
+    
+    for title, keys in (
+        ("Largest keys", report["largest_keys"]),
+        ("Keys without TTL", report["keys_without_ttl"]),
+        (f"Keys over {report['oversized_threshold_bytes']} bytes", report["oversized_keys"]),
+    ):
+        if keys:
+            lines.extend(["", f"{title}:"])
+            lines.extend(f"  {entry['bytes']:>12}  {entry['key']}" for entry in keys)
+    
+    return "\n".join(lines)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    await init_redis()
+    try:
+        report = await analyze_keyspace(
+            sample_size=args.sample_size,
+            match=args.match,
+            prefix_depth=args.depth,
+            oversized_bytes=args.oversized_bytes,
+            top_n=args.top,
+        )
+    finally:
+        await close_redis()
+    
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Report Redis memory usage by key prefix")
+    parser.add_argument("--sample-size", type=int, default=None, help="Maximum keys to inspect")
+    parser.add_argument("--match", default="*", help="SCAN MATCH pattern")
+    parser.add_argument("--depth", type=int, default=1, help="Key segments that form a prefix")
+    parser.add_argument("--oversized-bytes", type=int, default=None, help="Flag keys at least this large")
+    parser.add_argument("--top", type=int, default=20, help="Keys listed per flag")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
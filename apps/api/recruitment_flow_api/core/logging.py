@@ -7,7 +7,7 @@ and handlers for development and production environments.
 
 import logging
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
 
 from recruitment_flow_api.core.config import settings
@@ -164,21 +164,30 @@ def log_response(request_id: str, status_code: int, response_time: float) -> Non
     )
 
 
-def log_database_query(query: str, params: Dict[str, Any], duration: float) -> None:
+def log_database_query(
+    query: str,
+    params: Optional[Any],
+    duration: float,
+    rows: int = -1,
+) -> None:
     """
-    Log database query details.
+    Log a slow database query.
     
     Args:
-        query: SQL query
-        params: Query parameters
+        query: SQL query or its fingerprint
+        params: Query parameters, or None to omit them
         duration: Query duration in seconds
+        rows: Rows returned or affected (-1 if unknown)
     """
     logger = get_logger("database")
-    logger.debug(
-        "Database Query",
-        query=query,
-        params=params,
-        duration=duration,
+    logger.warning(
+        f"Slow database query ({duration * 1000:.1f} ms, {rows} rows): {query}",
+        extra={
+            "query": query,
+            "params": params,
+            "duration": duration,
+            "rows": rows,
+        },
     )
 
 
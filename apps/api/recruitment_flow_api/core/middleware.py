@@ -0,0 +1,284 @@
+"""
+ASGI middleware for the Recruitment Flow AI API.
+
+This module contains middleware applied to every request,
+such as per-client rate limiting and request deadlines.
+"""
+
+import math
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.instrumentation import begin_request_tracking, end_request_tracking
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import (
+    LocalCache,
+    RateLimiter,
+    RateLimitResult,
+    rate_limiter,
+)
+
+# Logger
+logger = get_logger("middleware")
+
+# Monotonic time by which the request being served should finish
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def client_identifier(scope: Scope) -> str:
+    """
+    Derive a stable identifier for the client making a request.
+    
+    Requests with a bearer token that verifies against SECRET_KEY are
+    identified by the token's subject; everything else, including
+    unverifiable tokens, by client IP, so minting random tokens does
+    not yield fresh identities.
+    
+    Args:
+        scope: ASGI connection scope
+        
+    Returns:
+        Identifier string
+    """
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def get_request_deadline() -> Optional[float]:
+    """
+    Get the deadline of the request being served.
+    
+    Returns:
+        Deadline on the time.monotonic() clock, or None outside a request
+    """
+    return _request_deadline.get()
+
+
+class RequestDeadlineMiddleware:
+    """
+    Sets a deadline for each request.
+    
+    The deadline is not enforced here; code that waits or retries
+    (such as database retries) reads it to avoid working past the
+    point where the client has given up.
+    """
+    
+    def __init__(self, app: ASGIApp, timeout: Optional[float] = None):
+        self.app = app
+        self.timeout = timeout or settings.REQUEST_DEADLINE_SECONDS
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = _request_deadline.set(time.monotonic() + self.timeout)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_deadline.reset(token)
+
+
+class QueryTrackingMiddleware:
+    """
+    Counts database statements per request.
+    
+    Enables N+1 detection in the query instrumentation, which warns
+    when the same statement fingerprint runs too often in a request.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = begin_request_tracking()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_request_tracking(token)
+
+
+class TokenLease:
+    """Rate limit budget claimed from Redis and spent locally."""
+    
+    def __init__(self, tokens: int, result: RateLimitResult, used: int):
+        self.tokens = tokens
+        self.used = used
+        self.limit = result.limit
+        self.remaining = result.remaining
+        self.reset_at = time.time() + result.reset
+        self.claimed_at = time.monotonic()
+    
+    def take(self, cost: int) -> bool:
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        self.used += cost
+        return True
+    
+    def projected_use(self, window: float) -> int:
+        """Tokens the client would spend in a window at its rate since the claim."""
+        elapsed = time.monotonic() - self.claimed_at
+        if elapsed <= 0:
+            return self.used
+        return math.ceil(self.used * window / elapsed)
+    
+    def result(self) -> RateLimitResult:
+        return RateLimitResult(
+            allowed=True,
+            limit=self.limit,
+            remaining=self.remaining + self.tokens,
+            reset=max(0, int(self.reset_at - time.time())),
+        )
+
+
+class RateLimitMiddleware:
+    """
+    Per-client rate limiting middleware.
+    
+    Each worker leases a batch of tokens from the shared Redis
+    limiter and spends them locally, so most requests are admitted
+    without a network call. Unspent tokens are not returned when a
+    lease expires, so leases are sized from the client's recent rate:
+    a client without a live lease claims only its request, and a
+    client that used up its lease claims what it would spend in one
+    lease TTL at the rate it spent the last one, up to lease_size.
+    Sparse clients therefore never pay for tokens they do not use.
+    Routes can be weighted so expensive endpoints consume more of
+    the budget.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[RateLimiter] = None,
+        lease_size: Optional[int] = None,
+        lease_ttl: Optional[float] = None,
+        route_costs: Optional[Dict[str, int]] = None,
+        exempt_paths: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+        self.lease_size = lease_size or settings.RATE_LIMIT_LEASE_SIZE
+        self.lease_ttl = lease_ttl or settings.RATE_LIMIT_LEASE_TTL
+        self.route_costs = route_costs if route_costs is not None else settings.RATE_LIMIT_ROUTE_COSTS
+        self.exempt_paths = exempt_paths or ["/health", "/docs", "/redoc", "/openapi.json"]
+        self._leases = LocalCache(
+            max_entries=settings.RATE_LIMIT_MAX_TRACKED_CLIENTS,
+            default_ttl=self.lease_ttl,
+        )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        identifier = client_identifier(scope)
+        cost = self._route_cost(scope["path"])
+        
+        try:
+            result = await self._acquire(identifier, cost)
+        except Exception as e:
+            # Fail open: an unavailable limiter must not take the API down
+            logger.warning(f"Rate limiter unavailable, allowing request: {e}")
+            await self.app(scope, receive, send)
+            return
+        
+        rate_limit_headers = {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(result.reset),
+        }
+        
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "error": {
+                        "type": "rate_limit_exceeded",
+                        "message": "Rate limit exceeded",
+                        "status_code": 429,
+                    }
+                },
+                headers={**rate_limit_headers, "Retry-After": str(result.reset)},
+            )
+            await response(scope, receive, send)
+            return
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_limit_headers.items():
+                    headers[name] = value
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
+    
+    async def _acquire(self, identifier: str, cost: int) -> RateLimitResult:
+        """
+        Spend tokens from the local lease, claiming a new one if needed.
+        
+        Args:
+            identifier: Client identifier
+            cost: Tokens required by this request
+            
+        Returns:
+            RateLimitResult for the request
+        """
+        found, lease = self._leases.get(identifier)
+        if found and lease.take(cost):
+            return lease.result()
+        
+        # Never claim more than the client is spending per lease TTL
+        claim = cost
+        if found:
+            claim = max(cost, min(self.lease_size, lease.projected_use(self.lease_ttl)))
+        result = await self.limiter.check(identifier, cost=claim)
+        if not result.allowed and claim > cost:
+            # Near the limit: fall back to claiming just this request
+            claim = cost
+            result = await self.limiter.check(identifier, cost=claim)
+        
+        if not result.allowed:
+            self._leases.delete(identifier)
+            return result
+        
+        lease = TokenLease(claim - cost, result, used=cost)
+        self._leases.set(identifier, lease, size=1)
+        return lease.result()
+    
+    def _route_cost(self, path: str) -> int:
+        """
+        Get the budget cost of a route.
+        
+        Args:
+            path: Request path
+            
+        Returns:
+            Cost for the longest matching route prefix, default 1
+        """
+        matches = [prefix for prefix in self.route_costs if path.startswith(prefix)]
+        if not matches:
+            return 1
+        return self.route_costs[max(matches, key=len)]
@@ -0,0 +1,337 @@
+"""
+Transactional outbox relay.
+
+Entity changes queue an event in the outbox table in the same
+transaction as the change (see UnitOfWork.outbox()), so an event
+exists if and only if the change committed. The relay tails the
+table and performs the side effects asynchronously, in batches:
+cached endpoint responses built from the changed entity are
+invalidated, and the event is published on the organization's Redis
+pub/sub channel for WebSocket fan-out.
+
+Expected schema:
+    
+    CREATE TABLE outbox (
+        id uuid PRIMARY KEY,
+        organization_id text,
+        event_type text NOT NULL,
+        payload jsonb NOT NULL,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        published_at timestamptz
+    );
+    CREATE INDEX outbox_unpublished ON outbox (created_at) WHERE published_at IS NULL;
+    
+    CREATE FUNCTION notify_outbox() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('outbox', '');
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql;
+    CREATE TRIGGER outbox_notify AFTER INSERT ON outbox
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_outbox();
+
+Delivery is at least once: a relay that dies after fanning out but
+before marking the batch published will deliver it again. Cache
+invalidation is idempotent, and pub/sub consumers use
+first_delivery() on the event ID to process each event exactly once.
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Set
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import text
+
+from recruitment_flow_api.core.caching import endpoint_tag
+from recruitment_flow_api.core.config import TABLES, settings
+from recruitment_flow_api.core.database import get_engine
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import cache_manager, get_redis
+
+# Logger
+logger = get_logger("outbox")
+
+OUTBOX_EVENTS_PUBLISHED_TOTAL = Counter(
+    "outbox_events_published_total",
+    "Outbox events relayed, by event type",
+    ["event_type"],
+)
+OUTBOX_LAG_SECONDS = Histogram(
+    "outbox_lag_seconds",
+    "Time from outbox commit to relay",
+)
+
+# Seconds between deletions of published events
+CLEANUP_INTERVAL = 3600
+
+CLAIM_SQL = f"""
+SELECT id, organization_id, event_type, payload, EXTRACT(EPOCH FROM now() - created_at) AS lag
+FROM {TABLES["outbox"]}
+WHERE published_at IS NULL
+ORDER BY created_at
+LIMIT :limit
+FOR UPDATE SKIP LOCKED
+"""
+
+MARK_PUBLISHED_SQL = f"""
+UPDATE {TABLES["outbox"]} SET published_at = now() WHERE id = ANY(:ids)
+"""
+
+CLEANUP_SQL = f"""
+DELETE FROM {TABLES["outbox"]}
+WHERE id IN (
+    SELECT id FROM {TABLES["outbox"]}
+    WHERE published_at < now() - make_interval(hours => :hours)
+    LIMIT :limit
+)
+"""
+
+
+def event_channel(organization_id: str) -> str:
+    """
+    Get the pub/sub channel an organization's events are published on.
+    
+    Args:
+        organization_id: Organization ID
+        
+    Returns:
+        Redis channel name
+    """
+    return f"events:{organization_id}"
+
+
+def invalidated_entities(event_type: str, payload: Dict[str, Any]) -> List[str]:
+    """
+    Get the cached entities an event invalidates.
+    
+    Event types are "<entity>.<action>", e.g. "candidates.updated";
+    a payload may list extra entities under "invalidate".
+    
+    Args:
+        event_type: Event type
+        payload: Event payload
+        
+    Returns:
+        Entity names
+    """
+    return [event_type.split(".", 1)[0], *payload.get("invalidate", [])]
+
+
+async def first_delivery(consumer: str, event_id: str) -> bool:
+    """
+    Record that a consumer received an event.
+    
+    Consumers call this before handling a relayed event and skip it
+    when it returns False, turning at-least-once delivery into
+    exactly-once processing per consumer.
+    
+    Args:
+        consumer: Consumer name
+        event_id: Event ID from the published message
+        
+    Returns:
+        True the first time the consumer sees the event
+    """
+    redis = await get_redis()
+    return bool(await redis.set(
+        f"outbox:delivered:{consumer}:{event_id}",
+        1,
+        nx=True,
+        ex=settings.OUTBOX_DEDUP_TTL,
+    ))
+
+
+class OutboxRelay:
+    """
+    Relays committed outbox events to caches and pub/sub.
+    
+    The relay wakes on NOTIFY from the outbox trigger and also polls
+    every OUTBOX_POLL_INTERVAL seconds, so events are still relayed
+    when notifications are lost or LISTEN is unavailable (e.g.
+    behind PgBouncer in transaction mode). Batches are claimed with
+    FOR UPDATE SKIP LOCKED, so several relays can run side by side.
+    """
+    
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        channel: Optional[str] = None,
+    ):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.OUTBOX_POLL_INTERVAL
+        self.channel = channel or settings.OUTBOX_CHANNEL
+        self._wake = asyncio.Event()
+        self._listen_conn = None
+        self._listen_driver = None
+        self._last_cleanup = 0.0
+        self._listen_warned = False
+    
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """
+        Relay events until stopped.
+        
+        Args:
+            stop_event: Event that stops the relay when set
+        """
+        stop_event = stop_event or asyncio.Event()
+        logger.info(f"Outbox relay started on channel '{self.channel}'")
+        
+        try:
+            while not stop_event.is_set():
+                await self._ensure_listening()
+                # Cleared before reading so a NOTIFY during the batch is not lost
+                self._wake.clear()
+                
+                try:
+                    relayed = await self.relay_batch()
+                    await self._cleanup()
+                except Exception as e:
+                    logger.error(f"Outbox relay failed, retrying: {e}")
+                    relayed = 0
+                
+                if relayed >= self.batch_size:
+                    # More events are waiting; keep draining
+                    continue
+                
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        _first_set(self._wake, stop_event),
+                        timeout=self.poll_interval,
+                    )
+        finally:
+            await self._stop_listening()
+            logger.info("Outbox relay stopped")
+    
+    async def relay_batch(self) -> int:
+        """
+        Relay one batch of unpublished events.
+        
+        The batch is marked published in the transaction that claimed
+        it, after the side effects succeeded; if they fail, the
+        transaction rolls back and the batch is retried.
+        
+        Returns:
+            Number of events relayed
+        """
+        db_engine = await get_engine("jobs")
+        
+        async with db_engine.begin() as conn:
+            rows = (await conn.execute(text(CLAIM_SQL), {"limit": self.batch_size})).mappings().all()
+            if not rows:
+                return 0
+            
+            events = [
+                {
+                    "id": str(row["id"]),
+                    "organization_id": row["organization_id"],
+                    "type": row["event_type"],
+                    "payload": json.loads(row["payload"]) if isinstance(row["payload"], str) else row["payload"],
+                }
+                for row in rows
+            ]
+            await self._fan_out(events)
+            await conn.execute(text(MARK_PUBLISHED_SQL), {"ids": [row["id"] for row in rows]})
+        
+        for row, event in zip(rows, events):
+            OUTBOX_EVENTS_PUBLISHED_TOTAL.labels(event["type"]).inc()
+            OUTBOX_LAG_SECONDS.observe(float(row["lag"]))
+        
+        logger.debug(f"Relayed {len(events)} outbox events")
+        return len(events)
+    
+    async def _fan_out(self, events: List[dict]) -> None:
+        """
+        Invalidate caches and publish a batch of events.
+        
+        Tags are deduplicated across the batch so a burst of changes
+        to one entity costs a single invalidation, and messages are
+        published in one pipeline.
+        
+        Args:
+            events: Decoded outbox events
+        """
+        tags: Set[str] = set()
+        for event in events:
+            if event["organization_id"]:
+                for entity in invalidated_entities(event["type"], event["payload"]):
+                    tags.add(endpoint_tag(event["organization_id"], entity))
+        
+        # Invalidate first so subscribers reacting to an event refetch fresh data
+        if tags:
+            await cache_manager.invalidate_tags(sorted(tags))
+        
+        messages: Dict[str, List[str]] = defaultdict(list)
+        for event in events:
+            if event["organization_id"]:
+                messages[event_channel(event["organization_id"])].append(json.dumps(event, default=str))
+        
+        if messages:
+            redis = await get_redis()
+            pipe = redis.pipeline(transaction=False)
+            for channel, channel_messages in messages.items():
+                for message in channel_messages:
+                    pipe.publish(channel, message)
+            await pipe.execute()
+    
+    async def _cleanup(self) -> None:
+        """Delete published events older than the retention period."""
+        if time.monotonic() - self._last_cleanup < CLEANUP_INTERVAL:
+            return
+        self._last_cleanup = time.monotonic()
+        
+        db_engine = await get_engine("jobs")
+        async with db_engine.begin() as conn:
+            result = await conn.execute(
+                text(CLEANUP_SQL),
+                {"hours": settings.OUTBOX_RETENTION_HOURS, "limit": 10000},
+            )
+        if result.rowcount:
+            logger.info(f"Deleted {result.rowcount} published outbox events")
+    
+    async def _ensure_listening(self) -> None:
+        """(Re)start LISTEN on a dedicated connection; fall back to polling on failure."""
+        if self._listen_driver is not None and not self._listen_driver.is_closed():
+            return
+        
+        await self._stop_listening()
+        try:
+            db_engine = await get_engine("jobs")
+            self._listen_conn = await db_engine.connect()
+            raw_connection = await self._listen_conn.get_raw_connection()
+            self._listen_driver = raw_connection.driver_connection
+            await self._listen_driver.add_listener(self.channel, self._on_notify)
+        except Exception as e:
+            if not self._listen_warned:
+                logger.warning(f"Outbox LISTEN unavailable, polling every {self.poll_interval}s: {e}")
+                self._listen_warned = True
+            await self._stop_listening()
+    
+    async def _stop_listening(self) -> None:
+        if self._listen_driver is not None and not self._listen_driver.is_closed():
+            with suppress(Exception):
+                await self._listen_driver.remove_listener(self.channel, self._on_notify)
+        if self._listen_conn is not None:
+            with suppress(Exception):
+                await self._listen_conn.close()
+        self._listen_conn = None
+        self._listen_driver = None
+    
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self._wake.set()
+
+
+async def _first_set(*events: asyncio.Event) -> None:
+    waiters = [asyncio.create_task(event.wait()) for event in events]
+    try:
+        await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+# Global instance
+outbox_relay = OutboxRelay()
@@ -0,0 +1,273 @@
+"""
+Keyset (cursor) pagination.
+
+This module pages list endpoints by seeking past the last row seen
+instead of using OFFSET, so every page costs the same no matter how
+deep the client has scrolled. Rows are ordered by the requested sort
+key with the row ID as a tie-breaker, and the position of the last
+row is handed back to the client as an opaque, signed cursor.
+
+Total counts are optional: cached_count() serves per-organization
+counts from the cache until the entity changes, and estimate_count()
+reads the planner's row estimate for whole-table counts.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, asc, desc, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from recruitment_flow_api.core.caching import endpoint_tag
+from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import cache_manager
+
+# Logger
+logger = get_logger("pagination")
+
+DEFAULT_SORT = "-created_at"
+
+# Bytes of the HMAC kept in each cursor
+_SIGNATURE_LENGTH = 12
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed, tampered with or for another sort."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursorError("Invalid cursor value")
+    return value
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), payload, hashlib.sha256).digest()[:_SIGNATURE_LENGTH]
+
+
+def encode_cursor(sort: str, key: Sequence[Any]) -> str:
+    """
+    Encode the position of a row as an opaque cursor.
+    
+    Args:
+        sort: Sort the cursor belongs to, e.g. "-created_at"
+        key: Sort key value followed by the row ID
+        
+    Returns:
+        URL-safe cursor
+    """
+    payload = json.dumps(
+        [sort, [_encode_value(value) for value in key]],
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return base64.urlsafe_b64encode(payload + _sign(payload)).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor().
+    
+    Args:
+        cursor: Cursor from a previous page
+        sort: Sort of the current request
+        
+    Returns:
+        Sort key value followed by the row ID
+        
+    Raises:
+        InvalidCursorError: If the cursor is invalid or was issued for another sort
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload, signature = raw[:-_SIGNATURE_LENGTH], raw[-_SIGNATURE_LENGTH:]
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise InvalidCursorError("Invalid cursor")
+        cursor_sort, key = json.loads(payload)
+    except InvalidCursorError:
+        raise
+    except Exception:
+        raise InvalidCursorError("Invalid cursor")
+    
+    if cursor_sort != sort:
+        raise InvalidCursorError("Cursor was issued for a different sort order")
+    return tuple(_decode_value(value) for value in key)
+
+
+class KeysetPage:
+    """
+    Keyset pagination state for one list request.
+    
+    Usage:
+        page = KeysetPage(cursor, limit, sort)
+        rows = (await session.execute(page.apply(stmt, sort_column, Candidate.id))).scalars().all()
+        candidates, pagination = page.build(rows)
+    
+    The sort column must be NOT NULL, and (sort column, id) should be
+    covered by an index for the seek to be efficient.
+    """
+    
+    def __init__(self, cursor: Optional[str], limit: int, sort: str = DEFAULT_SORT):
+        self.sort = sort
+        self.sort_field = sort.lstrip("-")
+        self.descending = sort.startswith("-")
+        self.limit = limit
+        self.after = decode_cursor(cursor, sort) if cursor else None
+    
+    def condition(self, sort_column: ColumnElement, id_column: ColumnElement) -> Optional[ColumnElement]:
+        """
+        Get the filter that seeks past the cursor.
+        
+        Args:
+            sort_column: Column of the sort key
+            id_column: Row ID column
+            
+        Returns:
+            Row-value comparison, or None on the first page
+        """
+        if self.after is None:
+            return None
+        
+        key = tuple_(sort_column, id_column)
+        return key < self.after if self.descending else key > self.after
+    
+    def apply(self, stmt: Select, sort_column: ColumnElement, id_column: ColumnElement) -> Select:
+        """
+        Restrict a query to the requested page.
+        
+        One extra row is fetched to tell whether another page follows.
+        
+        Args:
+            stmt: List query with its filters applied
+            sort_column: Column of the sort key
+            id_column: Row ID column
+            
+        Returns:
+            Ordered and limited query
+        """
+        condition = self.condition(sort_column, id_column)
+        if condition is not None:
+            stmt = stmt.where(condition)
+        
+        direction = desc if self.descending else asc
+        return stmt.order_by(direction(sort_column), direction(id_column)).limit(self.limit + 1)
+    
+    def build(self, rows: Sequence[Any], total: Optional[int] = None) -> Tuple[List[Any], dict]:
+        """
+        Build the page from the rows returned by the query.
+        
+        Args:
+            rows: Rows fetched with apply() (at most limit + 1)
+            total: Total count to include, if requested
+            
+        Returns:
+            Items of the page and the pagination metadata
+        """
+        items = list(rows[:self.limit])
+        has_more = len(rows) > self.limit
+        
+        next_cursor = None
+        if has_more:
+            last = items[-1]
+            next_cursor = encode_cursor(self.sort, (_field(last, self.sort_field), _field(last, "id")))
+        
+        pagination = {
+            "limit": self.limit,
+            "sort": self.sort,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+        if total is not None:
+            pagination["total"] = total
+        return items, pagination
+
+
+def _field(row: Any, name: str) -> Any:
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+async def cached_count(
+    organization_id: str,
+    entity: str,
+    filters: dict,
+    count: Callable[[], Awaitable[int]],
+) -> int:
+    """
+    Get a per-organization count, computing it at most once per TTL.
+    
+    Counts are tagged like cached endpoint responses, so writes that
+    invalidate the entity also drop its counts.
+    
+    Args:
+        organization_id: Organization being listed
+        entity: Entity name, e.g. "candidates"
+        filters: Filters the count applies to
+        count: Callable returning a coroutine that runs the COUNT query
+        
+    Returns:
+        Row count
+    """
+    digest = hashlib.blake2b(
+        json.dumps(sorted(filters.items()), separators=(",", ":"), default=str).encode("utf-8"),
+        digest_size=8,
+    ).hexdigest()
+    key = f"count:{organization_id}:{entity}:{digest}"
+    
+    try:
+        cached = await cache_manager.get(key)
+    except Exception as e:
+        logger.warning(f"Count cache read failed for {key}: {e}")
+        cached = None
+    if cached is not None:
+        return cached
+    
+    total = await count()
+    try:
+        await cache_manager.set(
+            key,
+            total,
+            ttl=settings.PAGINATION_COUNT_CACHE_TTL,
+            tags=[endpoint_tag(organization_id, entity)],
+        )
+    except Exception as e:
+        logger.warning(f"Count cache write failed for {key}: {e}")
+    return total
+
+
+async def estimate_count(session: AsyncSession, table: str) -> Optional[int]:
+    """
+    Estimate the number of rows in a table from planner statistics.
+    
+    This is a catalog lookup, so it costs the same on any table size;
+    the estimate is as fresh as the last ANALYZE or autovacuum.
+    
+    Args:
+        session: Database session
+        table: Table name
+        
+    Returns:
+        Estimated row count, or None if the table was never analyzed
+    """
+    result = await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    estimate = result.scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
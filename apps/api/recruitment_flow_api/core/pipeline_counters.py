@@ -0,0 +1,223 @@
+"""
+Materialized pipeline-stage counters.
+
+Instead of grouping the candidates table on every dashboard load,
+status transitions update a small counter table keyed by
+organization, role, status and day:
+    
+    CREATE TABLE pipeline_stage_counts (
+        organization_id text NOT NULL,
+        role_id text NOT NULL,
+        status text NOT NULL,
+        day date NOT NULL,
+        net integer NOT NULL DEFAULT 0,
+        entered integer NOT NULL DEFAULT 0,
+        PRIMARY KEY (organization_id, role_id, status, day)
+    );
+
+"net" is the change in the number of candidates in a status on
+that day (a UTC date, whatever the server or database timezone) and
+"entered" the number of transitions into it, so the
+stage counts at any date are the sum of "net" up to that date and
+stage throughput over a range is the sum of "entered" within it.
+Reads scan one row per (role, status, day) instead of one per
+candidate. A periodic reconciliation job on the scheduler leader
+compares the counters with the candidates table and books any drift
+as a correction.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Dict, Optional
+
+from prometheus_client import Counter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from recruitment_flow_api.core.config import CANDIDATE_STATUSES, TABLES, settings
+from recruitment_flow_api.core.database import UnitOfWork, execute_with_retry, get_engine
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.redis import leader_election
+from recruitment_flow_api.core.stage_events import append_stage_event
+
+# Logger
+logger = get_logger("pipeline_counters")
+
+PIPELINE_COUNTER_DRIFT_TOTAL = Counter(
+    "pipeline_counter_drift_total",
+    "Candidates by which pipeline counters drifted from the source rows",
+)
+
+STAGE_COUNTS_SQL = f"""
+SELECT
+    status,
+    COALESCE(SUM(net) FILTER (WHERE CAST(:date_to AS date) IS NULL OR day <= CAST(:date_to AS date)), 0) AS current,
+    COALESCE(SUM(entered) FILTER (
+        WHERE (CAST(:date_from AS date) IS NULL OR day >= CAST(:date_from AS date))
+        AND (CAST(:date_to AS date) IS NULL OR day <= CAST(:date_to AS date))
+    ), 0) AS entered
+FROM {TABLES["pipeline_stage_counts"]}
+WHERE organization_id = :organization_id
+AND (CAST(:role_id AS text) IS NULL OR role_id = CAST(:role_id AS text))
+GROUP BY status
+"""
+
+# Counter totals and source counts side by side, only where they differ
+DRIFT_SQL = f"""
+WITH counters AS (
+    SELECT organization_id, role_id, status, SUM(net) AS counted
+    FROM {TABLES["pipeline_stage_counts"]}
+    WHERE CAST(:organization_id AS text) IS NULL OR organization_id = CAST(:organization_id AS text)
+    GROUP BY organization_id, role_id, status
+),
+source AS (
+    SELECT organization_id, role_id, status, COUNT(*) AS actual
+    FROM {TABLES["candidates"]}
+    WHERE CAST(:organization_id AS text) IS NULL OR organization_id = CAST(:organization_id AS text)
+    GROUP BY organization_id, role_id, status
+)
+SELECT
+    COALESCE(counters.organization_id, source.organization_id) AS organization_id,
+    COALESCE(counters.role_id, source.role_id) AS role_id,
+    COALESCE(counters.status, source.status) AS status,
+    COALESCE(source.actual, 0) - COALESCE(counters.counted, 0) AS drift
+FROM counters
+FULL OUTER JOIN source USING (organization_id, role_id, status)
+WHERE COALESCE(source.actual, 0) <> COALESCE(counters.counted, 0)
+"""
+
+CORRECTION_SQL = f"""
+INSERT INTO {TABLES["pipeline_stage_counts"]} (organization_id, role_id, status, day, net, entered)
+VALUES (:organization_id, :role_id, :status, (now() AT TIME ZONE 'UTC')::date, :drift, 0)
+ON CONFLICT (organization_id, role_id, status, day)
+DO UPDATE SET net = {TABLES["pipeline_stage_counts"]}.net + EXCLUDED.net
+"""
+
+
+def record_status_change(
+    uow: UnitOfWork,
+    organization_id: str,
+    candidate_id: str,
+    role_id: str,
+    source: Optional[str],
+    old_status: Optional[str],
+    new_status: Optional[str],
+    occurred_at: Optional[datetime] = None,
+) -> None:
+    """
+    Queue the counter updates and stage event for a status transition.
+    
+    Call this in the unit of work that changes the candidate so the
+    counters and the event log commit with it. Use old_status=None
+    for a new candidate and new_status=None for a deleted one.
+    
+    Args:
+        uow: Unit of work changing the candidate
+        organization_id: Candidate's organization
+        candidate_id: Candidate ID
+        role_id: Candidate's role
+        source: Candidate's source
+        old_status: Status before the change
+        new_status: Status after the change
+        occurred_at: Time of the transition (defaults to now)
+    """
+    if old_status == new_status:
+        return
+    
+    append_stage_event(uow, organization_id, candidate_id, role_id, source, old_status, new_status, occurred_at)
+    
+    day = (occurred_at or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+    key = {"organization_id": organization_id, "role_id": role_id, "day": day}
+    if old_status is not None:
+        uow.increment(TABLES["pipeline_stage_counts"], {**key, "status": old_status}, {"net": -1, "entered": 0})
+    if new_status is not None:
+        uow.increment(TABLES["pipeline_stage_counts"], {**key, "status": new_status}, {"net": 1, "entered": 1})
+
+
+async def get_stage_counts(
+    session: AsyncSession,
+    organization_id: str,
+    role_id: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Get pipeline stage counts from the counters.
+    
+    Args:
+        session: Database session
+        organization_id: Organization ID
+        role_id: Restrict to one role
+        date_from: Start of the range for stage entries
+        date_to: Date the stage counts are taken at (defaults to now)
+        
+    Returns:
+        "current" candidates per status at date_to and "entered"
+        transitions per status within the range
+    """
+    result = await session.execute(text(STAGE_COUNTS_SQL), {
+        "organization_id": organization_id,
+        "role_id": role_id,
+        "date_from": date_from,
+        "date_to": date_to,
+    })
+    
+    counts = {
+        "current": dict.fromkeys(CANDIDATE_STATUSES, 0),
+        "entered": dict.fromkeys(CANDIDATE_STATUSES, 0),
+    }
+    for row in result.mappings():
+        counts["current"][row["status"]] = int(row["current"])
+        counts["entered"][row["status"]] = int(row["entered"])
+    return counts
+
+
+async def reconcile_stage_counts(organization_id: Optional[str] = None) -> int:
+    """
+    Verify the counters against the candidates table and correct drift.
+    
+    Counters and source rows are read from one REPEATABLE READ
+    snapshot and corrections are booked on today's (UTC) row, so
+    transitions committed during reconciliation are neither lost nor
+    double counted. A concurrent counter update surfaces as a
+    serialization failure and the reconciliation is retried.
+    
+    Args:
+        organization_id: Reconcile one organization (defaults to all)
+        
+    Returns:
+        Number of (organization, role, status) counters corrected
+    """
+    async def reconcile() -> int:
+        db_engine = await get_engine("jobs")
+        async with db_engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+            async with conn.begin():
+                drifts = (await conn.execute(
+                    text(DRIFT_SQL),
+                    {"organization_id": organization_id},
+                )).mappings().all()
+                if drifts:
+                    await conn.execute(text(CORRECTION_SQL), [dict(row) for row in drifts])
+        
+        for row in drifts:
+            PIPELINE_COUNTER_DRIFT_TOTAL.inc(abs(row["drift"]))
+            logger.warning(
+                f"Pipeline counter drift corrected: organization={row['organization_id']} "
+                f"role={row['role_id']} status={row['status']} drift={row['drift']}"
+            )
+        return len(drifts)
+    
+    return await execute_with_retry(reconcile)
+
+
+@leader_election.schedule(
+    "pipeline_counters.reconcile",
+    interval=settings.PIPELINE_COUNTER_RECONCILE_INTERVAL,
+)
+async def scheduled_reconciliation(fencing_token: int) -> None:
+    """Reconcile pipeline counters on the scheduler leader."""
+    corrected = await reconcile_stage_counts()
+    logger.info(
+        f"Pipeline counter reconciliation finished, {corrected} counters corrected "
+        f"(fencing token {fencing_token})"
+    )
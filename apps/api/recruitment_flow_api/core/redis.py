@@ -5,56 +5,266 @@ This module handles Redis connections, caching utilities,
 and provides Redis-based services for the application.
 """
 
+import asyncio
+import fnmatch
 import json
-import pickle
-from typing import Any, Optional, Union
-from contextlib import asynccontextmanager
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from contextlib import asynccontextmanager, suppress
 
-import aioredis
-from aioredis import Redis, ConnectionPool
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.connection import parse_url
+from redis.asyncio.sentinel import Sentinel
+from prometheus_client import Counter, Histogram
+from redis.exceptions import ConnectionError as RedisConnectionError, NoScriptError
 
 from recruitment_flow_api.core.config import settings
+from recruitment_flow_api.core.logging import get_logger
+from recruitment_flow_api.core.serializers import CacheSerializer
 
-# Global Redis client
-redis_client: Optional[Redis] = None
+# Logger
+logger = get_logger("redis")
+
+# Returned by a background refresh that left the work to another worker
+_NOT_COMPUTED = object()
+
+# Deletes a lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Channel Redis publishes client-side caching invalidations on (RESP2 redirect mode)
+TRACKING_INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+# Global Redis clients
+redis_client: Optional[Union[Redis, RedisCluster]] = None
+binary_redis_client: Optional[Union[Redis, RedisCluster]] = None
+redis_sentinel: Optional[Sentinel] = None
+
+# Independent Redis masters used for Redlock quorum (empty uses redis_client)
+lock_clients: List[Redis] = []
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Blocking connection pool that records saturation metrics.
+    
+    Callers wait up to the pool timeout for a free connection instead
+    of failing immediately, and the pool tracks how often and how
+    long they had to wait.
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.timeouts = 0
+        self.peak_in_use = 0
+    
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.monotonic()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError:
+            self.timeouts += 1
+            raise
+        
+        waited = time.monotonic() - started
+        self.acquisitions += 1
+        self.wait_seconds_total += waited
+        if waited > 0.001:
+            self.waits += 1
+        self.peak_in_use = max(self.peak_in_use, len(self._in_use_connections))
+        return connection
+    
+    def stats(self) -> dict:
+        """
+        Get pool usage and saturation counters.
+        
+        Returns:
+            dict: Pool statistics
+        """
+        in_use = len(self._in_use_connections)
+        return {
+            "max_connections": self.max_connections,
+            "in_use": in_use,
+            "idle": len(self._available_connections),
+            "saturation": in_use / self.max_connections if self.max_connections else 0.0,
+            "peak_in_use": self.peak_in_use,
+            "acquisitions": self.acquisitions,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                self.wait_seconds_total / self.acquisitions * 1000
+                if self.acquisitions else 0.0
+            ),
+        }
+
+
+def _parse_sentinels(sentinels: List[str]) -> List[Tuple[str, int]]:
+    addresses = []
+    for sentinel in sentinels:
+        host, _, port = sentinel.rpartition(":")
+        addresses.append((host, int(port)))
+    return addresses
+
+
+def _create_client(decode_responses: bool) -> Union[Redis, RedisCluster]:
+    """
+    Create a Redis client for the configured topology.
+    
+    Args:
+        decode_responses: Whether responses are decoded to str
+        
+    Returns:
+        Redis client for standalone/sentinel mode, or a cluster client
+    """
+    if settings.REDIS_MODE == "cluster":
+        return RedisCluster.from_url(
+            settings.REDIS_URL,
+            decode_responses=decode_responses,
+            max_connections=settings.REDIS_POOL_SIZE,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    
+    if settings.REDIS_MODE == "sentinel":
+        # Credentials and database still come from REDIS_URL
+        url_options = parse_url(settings.REDIS_URL)
+        url_options.pop("host", None)
+        url_options.pop("port", None)
+        return redis_sentinel.master_for(
+            settings.REDIS_SENTINEL_SERVICE,
+            decode_responses=decode_responses,
+            max_connections=settings.REDIS_POOL_SIZE,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            **url_options,
+        )
+    
+    pool = InstrumentedConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_POOL_SIZE,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        decode_responses=decode_responses,
+    )
+    return Redis(connection_pool=pool)
+
+
+async def create_dedicated_client(decode_responses: bool = True) -> Redis:
+    """
+    Create a single-connection client to the current primary.
+    
+    Used for long-lived connections (pub/sub, client tracking) that
+    should neither hold a pooled connection nor be subject to the
+    request socket timeout. In cluster mode this connects to the node
+    in REDIS_URL, which is enough for pub/sub since messages are
+    propagated across the cluster.
+    
+    Args:
+        decode_responses: Whether responses are decoded to str
+        
+    Returns:
+        Redis: Client bound to one dedicated connection
+    """
+    if settings.REDIS_MODE == "sentinel":
+        host, port = await redis_sentinel.discover_master(settings.REDIS_SENTINEL_SERVICE)
+        url_options = parse_url(settings.REDIS_URL)
+        url_options.update(host=host, port=port)
+        return Redis(
+            single_connection_client=True,
+            decode_responses=decode_responses,
+            **url_options,
+        )
+    
+    return Redis.from_url(
+        settings.REDIS_URL,
+        single_connection_client=True,
+        decode_responses=decode_responses,
+    )
 
 
 async def init_redis() -> None:
     """
     Initialize Redis connection.
     
-    Creates the Redis client and connection pool.
+    Creates the text and binary Redis clients for the configured
+    topology (standalone, sentinel or cluster). The binary client
+    returns raw bytes and is used for serialized cache values.
     """
-    global redis_client
+    global redis_client, binary_redis_client, redis_sentinel, lock_clients
     
     if redis_client is not None:
         return
     
-    # Create connection pool
-    pool = ConnectionPool.from_url(
-        settings.REDIS_URL,
-        max_connections=settings.REDIS_POOL_SIZE,
-        decode_responses=True,
-    )
+    if settings.REDIS_MODE not in ("standalone", "sentinel", "cluster"):
+        raise ValueError(f"Unknown REDIS_MODE: {settings.REDIS_MODE}")
     
-    # Create Redis client
-    redis_client = Redis(connection_pool=pool)
+    if settings.REDIS_MODE == "sentinel":
+        redis_sentinel = Sentinel(
+            _parse_sentinels(settings.REDIS_SENTINELS),
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    
+    # Create Redis clients
+    redis_client = _create_client(decode_responses=True)
+    binary_redis_client = _create_client(decode_responses=False)
+    lock_clients = [
+        Redis.from_url(
+            url,
+            decode_responses=True,
+            socket_timeout=settings.LOCK_INSTANCE_TIMEOUT,
+            socket_connect_timeout=settings.LOCK_INSTANCE_TIMEOUT,
+        )
+        for url in settings.LOCK_REDIS_URLS
+    ]
 
 
 async def close_redis() -> None:
     """
     Close Redis connections.
     
-    Properly closes the Redis client and connection pool.
+    Properly closes the Redis clients and connection pools.
     """
-    global redis_client
+    global redis_client, binary_redis_client, redis_sentinel, lock_clients
+    
+    for client in lock_clients:
+        await client.aclose()
+    lock_clients = []
+    
+    if binary_redis_client is not None:
+        await binary_redis_client.aclose()
+        binary_redis_client = None
     
     if redis_client is not None:
-        await redis_client.close()
+        await redis_client.aclose()
         redis_client = None
+    
+    redis_sentinel = None
 
 
-async def get_redis() -> Redis:
+async def get_redis() -> Union[Redis, RedisCluster]:
     """
     Get Redis client instance.
     
@@ -67,6 +277,60 @@ async def get_redis() -> Redis:
     return redis_client
 
 
+async def get_binary_redis() -> Union[Redis, RedisCluster]:
+    """
+    Get Redis client instance that does not decode responses.
+    
+    Returns:
+        Redis: Redis client instance returning bytes
+    """
+    if binary_redis_client is None:
+        await init_redis()
+    
+    return binary_redis_client
+
+
+async def get_lock_clients() -> List[Union[Redis, RedisCluster]]:
+    """
+    Get the Redis clients used for distributed locks.
+    
+    Returns:
+        Independent lock masters if configured, else the main client
+    """
+    if redis_client is None:
+        await init_redis()
+    
+    return lock_clients or [redis_client]
+
+
+def is_cluster() -> bool:
+    """
+    Check whether Redis runs in cluster mode.
+    
+    Returns:
+        bool: True if the cluster client is in use
+    """
+    return settings.REDIS_MODE == "cluster"
+
+
+def get_pool_stats() -> dict:
+    """
+    Get connection pool saturation metrics.
+    
+    Detailed metrics are only available for the standalone blocking
+    pool; other topologies report their mode only.
+    
+    Returns:
+        dict: Pool statistics per client
+    """
+    stats: Dict[str, Any] = {"mode": settings.REDIS_MODE}
+    for name, client in (("text", redis_client), ("binary", binary_redis_client)):
+        pool = getattr(client, "connection_pool", None)
+        if isinstance(pool, InstrumentedConnectionPool):
+            stats[name] = pool.stats()
+    return stats
+
+
 async def check_redis_connection() -> bool:
     """
     Check Redis connection health.
@@ -96,50 +360,381 @@ async def get_redis_stats() -> dict:
             "status": "healthy",
             "connected_clients": info.get("connected_clients", 0),
             "used_memory_human": info.get("used_memory_human", "0B"),
+            "used_memory_peak_human": info.get("used_memory_peak_human", "0B"),
+            "maxmemory_human": info.get("maxmemory_human", "0B"),
+            "maxmemory_policy": info.get("maxmemory_policy"),
+            "mem_fragmentation_ratio": info.get("mem_fragmentation_ratio"),
+            "expired_keys": info.get("expired_keys", 0),
+            "evicted_keys": info.get("evicted_keys", 0),
             "total_commands_processed": info.get("total_commands_processed", 0),
             "keyspace_hits": info.get("keyspace_hits", 0),
             "keyspace_misses": info.get("keyspace_misses", 0),
+            "pool": get_pool_stats(),
+            "cache": cache_manager.get_stats(),
         }
     except Exception as e:
         return {
             "status": "error",
             "error": str(e),
+            "pool": get_pool_stats(),
+            "cache": cache_manager.get_stats(),
+        }
+
+
+class LuaScript:
+    """
+    Lua script executed with EVALSHA.
+    
+    Loads the script into the Redis script cache on first use (or
+    explicitly on startup) and reloads it if the cache was flushed.
+    """
+    
+    def __init__(self, source: str):
+        self.source = source
+        self.sha: Optional[str] = None
+    
+    async def load(self, redis: Redis) -> None:
+        """
+        Load the script into the Redis script cache.
+        
+        Args:
+            redis: Redis client
+        """
+        self.sha = await redis.script_load(self.source)
+    
+    async def __call__(self, redis: Redis, keys: List[str], args: List[Any]) -> Any:
+        """
+        Run the script.
+        
+        Args:
+            redis: Redis client
+            keys: Script KEYS
+            args: Script ARGV
+            
+        Returns:
+            Script result
+        """
+        if self.sha is None:
+            await self.load(redis)
+        
+        try:
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            # Script cache was flushed (e.g. Redis restart)
+            await self.load(redis)
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache.
+    
+    Holds decoded values in front of Redis with a per-entry TTL and
+    evicts least recently used entries once either the entry count
+    or the approximate byte budget is exceeded. Values are shared
+    between callers and must be treated as read-only.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: int = 30,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Tuple of (found, value)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+    
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting old entries if over budget.
+        
+        Args:
+            key: Cache key
+            value: Decoded value
+            size: Approximate size of the value in bytes
+            ttl: Time to live in seconds
+        """
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+        
+        ttl = ttl or self.default_ttl
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+    
+    def delete(self, key: str) -> bool:
+        """
+        Drop a key.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            True if the key was present
+        """
+        return self._remove(key)
+    
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Drop keys matching a Redis-style glob pattern.
+        
+        Args:
+            pattern: Glob pattern to match
+            
+        Returns:
+            Number of keys dropped
+        """
+        matches = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in matches:
+            self._remove(key)
+        return len(matches)
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._bytes = 0
+    
+    def stats(self) -> dict:
+        """
+        Get local cache counters.
+        
+        Returns:
+            dict: Hit/miss/eviction counters and current usage
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
         }
+    
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
 
 
 # Cache utilities
+class _LocalEntry:
+    """Encoded value held in the local cache, decoded on first use."""
+    
+    __slots__ = ("raw", "decoded", "is_decoded")
+    
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.decoded: Any = None
+        self.is_decoded = False
+
+
 class CacheManager:
     """
     Cache manager for Redis-based caching operations.
     
     Provides utilities for caching data with different
-    serialization formats and expiration policies.
+    serialization formats and expiration policies. When a local
+    cache is configured, reads are served from it first and writes
+    are broadcast over pub/sub so every worker drops stale entries.
     """
     
-    def __init__(self, default_ttl: int = 3600):
+    def __init__(
+        self,
+        default_ttl: int = 3600,
+        local_cache: Optional[LocalCache] = None,
+        invalidation_channel: str = "cache:invalidate",
+        serializer: Optional[CacheSerializer] = None,
+        tracking_prefixes: Optional[List[str]] = None,
+    ):
         self.default_ttl = default_ttl
+        self.local_cache = local_cache
+        self.serializer = serializer or CacheSerializer()
+        self.tracking_prefixes = tracking_prefixes
+        self.tracking_invalidations = 0
+        self.invalidation_channel = invalidation_channel
+        self.instance_id = uuid.uuid4().hex
+        self.hits = 0
+        self.misses = 0
+        self.computes = 0
+        self.coalesced = 0
+        self.stale_hits = 0
+        self.early_refreshes = 0
+        self._listener_task: Optional[asyncio.Task] = None
+        self._tracking_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        # Other worker-local caches whose invalidations share the channel
+        self._shared_caches: Dict[str, LocalCache] = {}
+    
+    def share_invalidations(self, name: str, local_cache: LocalCache) -> None:
+        """
+        Carry another worker-local cache's invalidations on this channel.
+        
+        Args:
+            name: Name the cache is invalidated under
+            local_cache: Worker-local cache to keep in sync
+        """
+        self._shared_caches[name] = local_cache
+    
+    async def invalidate_shared(self, name: str, keys: List[str]) -> None:
+        """
+        Drop keys from a shared local cache on every worker.
+        
+        Args:
+            name: Name the cache was shared under
+            keys: Keys to drop
+        """
+        message = {"origin": self.instance_id, "cache": name, "keys": keys, "pattern": None}
+        self._apply_invalidation(message)
+        await self._publish_invalidation(message)
     
-    async def get(self, key: str, default: Any = None) -> Any:
+    async def get(self, key: str, default: Any = None, decode: bool = True) -> Any:
         """
         Get value from cache.
         
         Args:
             key: Cache key
             default: Default value if key not found
-            
+            decode: Whether to deserialize the value (False returns the
+                raw bytes stored with serialize=False)
+                
         Returns:
             Cached value or default
         """
-        redis = await get_redis()
-        value = await redis.get(key)
+        if self.local_cache is not None:
+            found, entry = self.local_cache.get(key)
+            if found:
+                return self._local_value(entry, decode)
+        
+        redis = await get_binary_redis()
+        if self.local_cache is None:
+            value = await redis.get(key)
+        else:
+            # The key's remaining lifetime bounds how long the local copy may live
+            pipe = redis.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            value, pttl = await pipe.execute()
         
         if value is None:
+            self.misses += 1
             return default
         
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return value
+        self.hits += 1
+        entry = _LocalEntry(value)
+        if self.local_cache is not None:
+            self._store_local(key, entry, len(value), pttl)
+        return self._local_value(entry, decode)
+    
+    async def get_many(self, keys: List[str], default: Any = None) -> Dict[str, Any]:
+        """
+        Get several values in a single round trip.
+        
+        Keys served by the local cache are skipped; the rest are
+        fetched with one MGET.
+        
+        Args:
+            keys: Cache keys
+            default: Default value for keys not found
+            
+        Returns:
+            Mapping of every requested key to its cached value or default
+        """
+        results: Dict[str, Any] = {}
+        missing: List[str] = []
+        
+        for key in keys:
+            if self.local_cache is not None:
+                found, entry = self.local_cache.get(key)
+                if found:
+                    results[key] = self._local_value(entry, True)
+                    continue
+            missing.append(key)
+        
+        # Preserve the caller's order while fetching each key only once
+        missing = list(dict.fromkeys(missing))
+        if missing:
+            redis = await get_binary_redis()
+            pttls: List[Optional[int]] = [None] * len(missing)
+            if self.local_cache is not None:
+                # Values and remaining lifetimes in one round trip; the
+                # cluster pipeline routes each command to its key's slot
+                pipe = redis.pipeline(transaction=False)
+                if is_cluster():
+                    for key in missing:
+                        pipe.get(key)
+                else:
+                    pipe.mget(missing)
+                for key in missing:
+                    pipe.pttl(key)
+                replies = await pipe.execute()
+                pttls = replies[-len(missing):]
+                values = replies[:len(missing)] if is_cluster() else replies[0]
+            elif is_cluster():
+                # Keys may live in different slots
+                values = await redis.mget_nonatomic(missing)
+            else:
+                values = await redis.mget(missing)
+            
+            for key, value, pttl in zip(missing, values, pttls):
+                if value is None:
+                    self.misses += 1
+                    results[key] = default
+                    continue
+                
+                self.hits += 1
+                entry = _LocalEntry(value)
+                if self.local_cache is not None:
+                    self._store_local(key, entry, len(value), pttl)
+                results[key] = self._local_value(entry, True)
+        
+        return {key: results[key] for key in keys}
     
     async def set(
         self,
@@ -147,6 +742,7 @@ class CacheManager:
         value: Any,
         ttl: Optional[int] = None,
         serialize: bool = True,
+        tags: Optional[Iterable[str]] = None,
     ) -> bool:
         """
         Set value in cache.
@@ -156,17 +752,67 @@ class CacheManager:
             value: Value to cache
             ttl: Time to live in seconds
             serialize: Whether to serialize the value
+            tags: Tags to register the key under for invalidate_tags()
             
         Returns:
             True if successful
         """
-        redis = await get_redis()
+        redis = await get_binary_redis()
         
         if serialize:
-            value = json.dumps(value)
+            value = self.serializer.dumps(value)
         
         ttl = ttl or self.default_ttl
-        return await redis.setex(key, ttl, value)
+        if tags:
+            pipe = redis.pipeline(transaction=False)
+            pipe.setex(key, ttl, value)
+            self._add_to_tags(pipe, [key], tags, ttl)
+            result = (await pipe.execute())[0]
+        else:
+            result = await redis.setex(key, ttl, value)
+        await self._invalidate_local(keys=[key])
+        return result
+    
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None,
+        serialize: bool = True,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """
+        Set several values in a single pipelined round trip.
+        
+        Args:
+            mapping: Cache keys and values to store
+            ttl: Time to live in seconds for keys without their own TTL
+            ttls: Per-key time to live overrides
+            serialize: Whether to serialize the values
+            tags: Tags to register every key under for invalidate_tags()
+            
+        Returns:
+            True if every key was set
+        """
+        if not mapping:
+            return True
+        
+        redis = await get_binary_redis()
+        ttls = ttls or {}
+        default_ttl = ttl or self.default_ttl
+        
+        pipe = redis.pipeline(transaction=False)
+        for key, value in mapping.items():
+            if serialize:
+                value = self.serializer.dumps(value)
+            pipe.setex(key, ttls.get(key) or default_ttl, value)
+        if tags:
+            longest_ttl = max([default_ttl, *ttls.values()])
+            self._add_to_tags(pipe, list(mapping), tags, longest_ttl)
+        results = await pipe.execute()
+        
+        await self._invalidate_local(keys=list(mapping))
+        return all(results[:len(mapping)])
     
     async def delete(self, key: str) -> bool:
         """
@@ -179,7 +825,27 @@ class CacheManager:
             True if key was deleted
         """
         redis = await get_redis()
-        return bool(await redis.delete(key))
+        deleted = bool(await redis.delete(key))
+        await self._invalidate_local(keys=[key])
+        return deleted
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several keys in a single round trip.
+        
+        Args:
+            keys: Cache keys to delete
+            
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        
+        redis = await get_redis()
+        deleted = await redis.delete(*keys)
+        await self._invalidate_local(keys=list(keys))
+        return deleted
     
     async def exists(self, key: str) -> bool:
         """
@@ -228,28 +894,639 @@ class CacheManager:
         Args:
             pattern: Redis pattern to match
             
+        Returns:
+            Number of keys deleted
+        """
+        deleted = 0
+        async for deleted in self.iter_clear_pattern(pattern):
+            pass
+        return deleted
+    
+    async def iter_clear_pattern(
+        self,
+        pattern: str,
+        scan_count: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[int]:
+        """
+        Incrementally clear keys matching pattern.
+        
+        Walks the key space with SCAN and removes matches with UNLINK
+        in batches, so Redis is never blocked by a single large command.
+        
+        Args:
+            pattern: Redis pattern to match
+            scan_count: COUNT hint passed to each SCAN call
+            batch_size: Number of keys per UNLINK call
+            
+        Yields:
+            Running total of keys deleted after each batch
+        """
+        redis = await get_redis()
+        scan_count = scan_count or settings.CACHE_SCAN_COUNT
+        batch_size = batch_size or settings.CACHE_DELETE_BATCH_SIZE
+        
+        await self._invalidate_local(pattern=pattern)
+        
+        deleted = 0
+        batch: List[str] = []
+        # scan_iter walks every primary when running against a cluster
+        async for key in redis.scan_iter(match=pattern, count=scan_count):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += await redis.unlink(*batch)
+                batch = []
+                yield deleted
+        
+        if batch:
+            deleted += await redis.unlink(*batch)
+            yield deleted
+    
+    async def invalidate_tags(
+        self,
+        tags: Iterable[str],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Delete every key registered under the given tags.
+        
+        Args:
+            tags: Tags to invalidate (e.g. "role:role_123")
+            batch_size: Number of keys per UNLINK call
+            
         Returns:
             Number of keys deleted
         """
         redis = await get_redis()
-        keys = await redis.keys(pattern)
+        batch_size = batch_size or settings.CACHE_DELETE_BATCH_SIZE
         
-        if keys:
-            return await redis.delete(*keys)
-        return 0
+        deleted = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            batch: List[str] = []
+            async for member in redis.sscan_iter(tag_key, count=batch_size):
+                batch.append(member)
+                if len(batch) >= batch_size:
+                    deleted += await redis.unlink(*batch)
+                    await self._invalidate_local(keys=batch)
+                    batch = []
+            
+            if batch:
+                deleted += await redis.unlink(*batch)
+                await self._invalidate_local(keys=batch)
+            await redis.unlink(tag_key)
+        
+        return deleted
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"cache:tag:{tag}"
+    
+    def _add_to_tags(self, pipe: Any, keys: List[str], tags: Iterable[str], ttl: int) -> None:
+        # Tag sets may outlive their members; unlinking an expired key is a no-op
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, *keys)
+            pipe.expire(tag_key, max(ttl, self.default_ttl))
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        beta: float = 1.0,
+    ) -> Any:
+        """
+        Get a cached value, computing it at most once when missing.
+        
+        Concurrent callers in this worker share a single computation,
+        and a Redis lock keeps other workers from recomputing the same
+        key. Values are refreshed in the background shortly before they
+        expire (probabilistic early expiration) and served stale for up
+        to stale_ttl seconds while a refresh is running.
+        
+        Keys written here hold an envelope with refresh metadata and
+        should only be read back through get_or_compute().
+        
+        Args:
+            key: Cache key
+            coro_factory: Callable returning a coroutine that computes the value
+            ttl: Seconds the value is considered fresh
+            stale_ttl: Seconds a stale value may still be served after ttl
+            beta: Early refresh aggressiveness; higher refreshes earlier
+            
+        Returns:
+            Cached or freshly computed value
+        """
+        ttl = ttl or self.default_ttl
+        stale_ttl = settings.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        
+        envelope = await self.get(key)
+        if self._is_envelope(envelope):
+            now = time.time()
+            expires_at = envelope["e"]
+            
+            if now < expires_at:
+                # XFetch: refresh probability rises as expiry approaches,
+                # scaled by how long the value took to compute
+                if now - envelope["d"] * beta * math.log(1.0 - random.random()) >= expires_at:
+                    self.early_refreshes += 1
+                    self._schedule_refresh(key, coro_factory, ttl, stale_ttl)
+                return envelope["v"]
+            
+            self.stale_hits += 1
+            self._schedule_refresh(key, coro_factory, ttl, stale_ttl)
+            return envelope["v"]
+        
+        return await self._single_flight(key, coro_factory, ttl, stale_ttl, wait=True)
+    
+    async def _single_flight(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        wait: bool,
+    ) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            value = await asyncio.shield(future)
+            if value is _NOT_COMPUTED and wait:
+                return await self._compute_locked(key, coro_factory, ttl, stale_ttl, wait)
+            return value
+        
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" warnings when nobody else waited
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await self._compute_locked(key, coro_factory, ttl, stale_ttl, wait)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+    
+    def _schedule_refresh(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+    ) -> None:
+        if key in self._inflight:
+            return
+        
+        task = asyncio.create_task(
+            self._single_flight(key, coro_factory, ttl, stale_ttl, wait=False)
+        )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._on_refresh_done)
+    
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {task.exception()}")
+    
+    async def _compute_locked(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        wait: bool,
+    ) -> Any:
+        redis = await get_redis()
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        lock_timeout = settings.CACHE_LOCK_TIMEOUT
+        
+        acquired = await redis.set(lock_key, token, nx=True, px=lock_timeout * 1000)
+        if not acquired:
+            if not wait:
+                # Another worker is already refreshing this key
+                return _NOT_COMPUTED
+            
+            binary_redis = await get_binary_redis()
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                raw = await binary_redis.get(key)
+                envelope = self._decode(raw) if raw is not None else None
+                if self._is_envelope(envelope):
+                    return envelope["v"]
+            
+            # The lock holder is slow or gone; compute without the lock
+            return await self._compute_and_store(key, coro_factory, ttl, stale_ttl)
+        
+        try:
+            return await self._compute_and_store(key, coro_factory, ttl, stale_ttl)
+        finally:
+            with suppress(Exception):
+                await redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+    
+    async def _compute_and_store(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+    ) -> Any:
+        started = time.monotonic()
+        value = await coro_factory()
+        self.computes += 1
+        
+        envelope = {
+            "v": value,
+            "d": time.monotonic() - started,
+            "e": time.time() + ttl,
+        }
+        await self.set(key, envelope, ttl=ttl + stale_ttl)
+        return value
+    
+    def _is_envelope(self, value: Any) -> bool:
+        return isinstance(value, dict) and value.keys() == {"v", "d", "e"}
+    
+    def _decode(self, value: Any) -> Any:
+        return self.serializer.loads(value)
+    
+    def _store_local(self, key: str, entry: _LocalEntry, size: int, pttl: Optional[int]) -> None:
+        """Keep a fetched value locally for no longer than the key lives in Redis."""
+        if pttl == -2:
+            # Expired between GET and PTTL
+            return
+        ttl = self.local_cache.default_ttl
+        if pttl is not None and pttl >= 0:
+            # -1 means the key never expires
+            ttl = min(ttl, pttl / 1000)
+        if ttl > 0:
+            self.local_cache.set(key, entry, size, ttl=ttl)
+    
+    def _local_value(self, entry: _LocalEntry, decode: bool) -> Any:
+        # The local cache keeps the encoded form, so raw and decoding
+        # readers of the same key each get what they asked for
+        if not decode:
+            return entry.raw
+        if not entry.is_decoded:
+            entry.decoded = self._decode(entry.raw)
+            entry.is_decoded = True
+        return entry.decoded
+    
+    def get_stats(self) -> dict:
+        """
+        Get hit/miss counters for both cache tiers.
+        
+        Returns:
+            dict: Local (L1) and Redis (L2) tier statistics
+        """
+        lookups = self.hits + self.misses
+        return {
+            "l1": self.local_cache.stats() if self.local_cache is not None else {"enabled": False},
+            "tracking": {
+                "enabled": self._tracking_task is not None,
+                "invalidations": self.tracking_invalidations,
+            },
+            "l2": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            },
+            "compute": {
+                "computes": self.computes,
+                "coalesced": self.coalesced,
+                "stale_hits": self.stale_hits,
+                "early_refreshes": self.early_refreshes,
+                "inflight": len(self._inflight),
+            },
+        }
+    
+    async def start_invalidation_listener(self) -> None:
+        """
+        Start listening for invalidations from other workers.
+        
+        When tracking prefixes are configured, Redis client-side caching
+        (CLIENT TRACKING in broadcast mode) is enabled as well, so keys
+        written by any client - not just this application - are dropped
+        from the local cache. Tracking is not available in cluster mode.
+        
+        Does nothing when no local cache is configured or shared.
+        """
+        if (self.local_cache is None and not self._shared_caches) or self._listener_task is not None:
+            return
+        
+        self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+        
+        if self.tracking_prefixes is not None and self.local_cache is not None:
+            if is_cluster():
+                logger.warning("Client-side caching is not supported in cluster mode")
+            else:
+                self._tracking_task = asyncio.create_task(
+                    self._listen_for_tracking_invalidations()
+                )
+    
+    async def stop_invalidation_listener(self) -> None:
+        """Stop the invalidation listener tasks."""
+        for task in (self._listener_task, self._tracking_task):
+            if task is None:
+                continue
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        
+        self._listener_task = None
+        self._tracking_task = None
+    
+    async def _invalidate_local(
+        self,
+        keys: Optional[List[str]] = None,
+        pattern: Optional[str] = None,
+    ) -> None:
+        """
+        Drop keys from the local cache and tell other workers to do the same.
+        
+        Args:
+            keys: Exact keys to drop
+            pattern: Glob pattern of keys to drop
+        """
+        if self.local_cache is None:
+            return
+        
+        message = {"origin": self.instance_id, "keys": keys or [], "pattern": pattern}
+        self._apply_invalidation(message)
+        await self._publish_invalidation(message)
+    
+    async def _publish_invalidation(self, message: Dict[str, Any]) -> None:
+        try:
+            redis = await get_redis()
+            await redis.publish(self.invalidation_channel, json.dumps(message))
+        except Exception as e:
+            # Peers fall back to their local TTL if the broadcast is lost
+            logger.warning(f"Cache invalidation broadcast failed: {e}")
+    
+    def _apply_invalidation(self, message: Dict[str, Any]) -> None:
+        if message.get("cache"):
+            local_cache = self._shared_caches.get(message["cache"])
+        else:
+            local_cache = self.local_cache
+        if local_cache is None:
+            return
+        
+        for key in message.get("keys", []):
+            local_cache.delete(key)
+        if message.get("pattern"):
+            local_cache.delete_pattern(message["pattern"])
+    
+    def _clear_local(self) -> None:
+        for local_cache in (self.local_cache, *self._shared_caches.values()):
+            if local_cache is not None:
+                local_cache.clear()
+    
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            redis = None
+            pubsub = None
+            try:
+                redis = await create_dedicated_client()
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(self.invalidation_channel)
+                
+                # Anything published while unsubscribed is lost, so start clean
+                self._clear_local()
+                
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        payload = json.loads(message["data"])
+                    except (TypeError, json.JSONDecodeError):
+                        continue
+                    if payload.get("origin") == self.instance_id:
+                        continue
+                    self._apply_invalidation(payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}")
+                self._clear_local()
+                await asyncio.sleep(1)
+            finally:
+                if pubsub is not None:
+                    with suppress(Exception):
+                        await pubsub.aclose()
+                if redis is not None:
+                    with suppress(Exception):
+                        await redis.aclose()
+    
+    async def _listen_for_tracking_invalidations(self) -> None:
+        while True:
+            receiver = None
+            tracker = None
+            try:
+                # Invalidations are redirected from the tracking connection to
+                # a second connection subscribed to the invalidation channel
+                receiver = await create_dedicated_client()
+                tracker = await create_dedicated_client()
+                receiver_id = await receiver.client_id()
+                
+                await receiver.connection.send_command("SUBSCRIBE", TRACKING_INVALIDATION_CHANNEL)
+                await receiver.connection.read_response()
+                
+                prefix_args: List[str] = []
+                for prefix in self.tracking_prefixes:
+                    prefix_args.extend(["PREFIX", prefix])
+                await tracker.execute_command(
+                    "CLIENT", "TRACKING", "ON", "REDIRECT", receiver_id, "BCAST", *prefix_args
+                )
+                
+                self.local_cache.clear()
+                
+                while True:
+                    response = await receiver.connection.read_response(
+                        timeout=settings.CACHE_TRACKING_HEALTH_CHECK_INTERVAL
+                    )
+                    if response is None:
+                        # Idle: make sure the tracking connection is still alive
+                        await tracker.ping()
+                        continue
+                    
+                    if not isinstance(response, list) or response[0] != "message":
+                        continue
+                    
+                    keys = response[2]
+                    if keys is None:
+                        # Sent on FLUSHALL/FLUSHDB
+                        self.local_cache.clear()
+                        self.tracking_invalidations += 1
+                        continue
+                    
+                    for key in keys:
+                        self.local_cache.delete(key)
+                    self.tracking_invalidations += len(keys)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Client tracking listener error: {e}")
+                self.local_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                for client in (tracker, receiver):
+                    if client is not None:
+                        with suppress(Exception):
+                            await client.aclose()
 
 
 # Rate limiting utilities
+
+# Sliding-window counter over any number of (limit, window) pairs.
+# Each key is a hash holding the current window id and the counts for
+# the current and previous windows; the previous count is weighted by
+# how much of it still overlaps the sliding window. The request is only
+# counted if every limit allows it, so all limits are checked and
+# consumed atomically in one evaluation.
+#
+# KEYS: one hash per limit
+# ARGV: cost, then limit and window seconds for each key
+# Returns: {allowed, limit, remaining, reset_seconds} for the tightest limit
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local allowed = 1
+local state = {}
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 2])
+    local window = tonumber(ARGV[i * 2 + 1])
+    local current_window = math.floor(now / window)
+    local elapsed = now - current_window * window
+    
+    local data = redis.call("HMGET", key, "w", "c", "p")
+    local stored_window = tonumber(data[1])
+    local current = tonumber(data[2]) or 0
+    local previous = tonumber(data[3]) or 0
+    
+    if stored_window == nil then
+        current, previous = 0, 0
+    elseif stored_window == current_window - 1 then
+        current, previous = 0, current
+    elseif stored_window ~= current_window then
+        current, previous = 0, 0
+    end
+    
+    local estimate = previous * (1 - elapsed / window) + current
+    if estimate + cost > limit then
+        allowed = 0
+    end
+    state[i] = {current_window, current, previous, estimate, limit, window, elapsed}
+end
+
+local result_limit, result_remaining, result_reset = 0, -1, 0
+for i, key in ipairs(KEYS) do
+    local s = state[i]
+    local current, estimate = s[2], s[4]
+    if allowed == 1 then
+        current = current + cost
+        estimate = estimate + cost
+    end
+    redis.call("HSET", key, "w", s[1], "c", current, "p", s[3])
+    redis.call("EXPIRE", key, s[6] * 2)
+    
+    local remaining = math.max(0, math.floor(s[5] - estimate))
+    if result_remaining < 0 or remaining < result_remaining then
+        result_limit = s[5]
+        result_remaining = remaining
+        result_reset = math.ceil(s[6] - s[7])
+    end
+end
+
+return {allowed, result_limit, result_remaining, result_reset}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check for the most constrained limit."""
+    
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+
+
 class RateLimiter:
     """
     Rate limiter using Redis.
     
-    Provides rate limiting functionality using Redis
-    with sliding window algorithm.
+    Provides rate limiting functionality using Redis with a
+    sliding window counter evaluated atomically in a Lua script.
+    Several windows (e.g. per minute and per hour) are checked in
+    a single round trip.
     """
     
-    def __init__(self, redis_key_prefix: str = "rate_limit"):
+    def __init__(
+        self,
+        redis_key_prefix: str = "rate_limit",
+        limits: Optional[List[Tuple[int, int]]] = None,
+    ):
         self.redis_key_prefix = redis_key_prefix
+        self.limits = limits or [
+            (settings.RATE_LIMIT_PER_MINUTE, 60),
+            (settings.RATE_LIMIT_PER_HOUR, 3600),
+        ]
+        self._script = LuaScript(SLIDING_WINDOW_SCRIPT)
+    
+    async def load_scripts(self) -> None:
+        """
+        Load the rate limiting script into the Redis script cache.
+        
+        Called on startup so requests only need EVALSHA.
+        """
+        await self._script.load(await get_redis())
+    
+    async def check(
+        self,
+        identifier: str,
+        limits: Optional[List[Tuple[int, int]]] = None,
+        cost: int = 1,
+    ) -> RateLimitResult:
+        """
+        Check and consume rate limit budget for identifier.
+        
+        Args:
+            identifier: Unique identifier (e.g., IP, user ID)
+            limits: (max_requests, window_seconds) pairs; defaults to
+                the configured per-minute and per-hour limits
+            cost: Budget consumed by this request; 0 only inspects
+            
+        Returns:
+            RateLimitResult for the most constrained limit
+        """
+        limits = limits or self.limits
+        
+        # Hash tag keeps all of an identifier's windows in one cluster slot
+        keys = [
+            f"{self.redis_key_prefix}:{{{identifier}}}:{window}"
+            for _, window in limits
+        ]
+        args: List[int] = [cost]
+        for max_requests, window in limits:
+            args.extend([max_requests, window])
+        
+        redis = await get_redis()
+        result = await self._script(redis, keys, args)
+        
+        allowed, limit, remaining, reset = (int(value) for value in result)
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=remaining,
+            reset=reset,
+        )
     
     async def is_allowed(
         self,
@@ -268,28 +1545,14 @@ class RateLimiter:
         Returns:
             True if request is allowed
         """
-        redis = await get_redis()
-        key = f"{self.redis_key_prefix}:{identifier}"
-        
-        # Get current count
-        current = await redis.get(key)
-        current_count = int(current) if current else 0
-        
-        if current_count >= max_requests:
-            return False
-        
-        # Increment counter
-        pipe = redis.pipeline()
-        pipe.incr(key)
-        pipe.expire(key, window_seconds)
-        await pipe.execute()
-        
-        return True
+        result = await self.check(identifier, [(max_requests, window_seconds)])
+        return result.allowed
     
     async def get_remaining(
         self,
         identifier: str,
         max_requests: int,
+        window_seconds: int = 60,
     ) -> int:
         """
         Get remaining requests for identifier.
@@ -297,29 +1560,85 @@ class RateLimiter:
         Args:
             identifier: Unique identifier
             max_requests: Maximum requests allowed
+            window_seconds: Time window in seconds
             
         Returns:
             Number of remaining requests
         """
-        redis = await get_redis()
-        key = f"{self.redis_key_prefix}:{identifier}"
-        
-        current = await redis.get(key)
-        current_count = int(current) if current else 0
-        
-        return max(0, max_requests - current_count)
+        result = await self.check(identifier, [(max_requests, window_seconds)], cost=0)
+        return result.remaining
 
 
 # Session management utilities
+
+# Replaces a session's fields and sets its TTL atomically
+CREATE_SESSION_SCRIPT = """
+redis.call("DEL", KEYS[1])
+if #ARGV > 1 then
+    redis.call("HSET", KEYS[1], unpack(ARGV, 2))
+end
+redis.call("EXPIRE", KEYS[1], ARGV[1])
+return 1
+"""
+
+# Returns all session fields and slides the TTL in one round trip
+READ_AND_TOUCH_SESSION_SCRIPT = """
+local data = redis.call("HGETALL", KEYS[1])
+if #data > 0 then
+    redis.call("EXPIRE", KEYS[1], ARGV[1])
+end
+return data
+"""
+
+# Sets fields on an existing session and slides its TTL
+UPDATE_SESSION_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("HSET", KEYS[1], unpack(ARGV, 2))
+redis.call("EXPIRE", KEYS[1], ARGV[1])
+return 1
+"""
+
+
 class SessionManager:
     """
     Session manager using Redis.
     
-    Provides session storage and management using Redis.
+    Provides session storage and management using Redis. Sessions
+    are stored as hashes with one JSON-encoded value per field, so
+    single fields can be read and updated without rewriting the whole
+    session. Reads slide the TTL atomically, and recently validated
+    sessions can be served from a small per-worker cache. Writes and
+    deletes drop the session from that cache on every worker through
+    the cache manager's invalidation channel.
     """
     
-    def __init__(self, session_ttl: int = 3600):
+    def __init__(
+        self,
+        session_ttl: int = 3600,
+        local_cache: Optional[LocalCache] = None,
+        invalidations: Optional[CacheManager] = None,
+    ):
         self.session_ttl = session_ttl
+        self.local_cache = local_cache
+        self.invalidations = invalidations
+        if local_cache is not None and invalidations is not None:
+            invalidations.share_invalidations("sessions", local_cache)
+        self._create = LuaScript(CREATE_SESSION_SCRIPT)
+        self._read_and_touch = LuaScript(READ_AND_TOUCH_SESSION_SCRIPT)
+        self._update = LuaScript(UPDATE_SESSION_SCRIPT)
+    
+    async def load_scripts(self) -> None:
+        """
+        Load the session scripts into the Redis script cache.
+        
+        Called on startup so requests only need EVALSHA.
+        """
+        redis = await get_redis()
+        await self._create.load(redis)
+        await self._read_and_touch.load(redis)
+        await self._update.load(redis)
     
     async def create_session(
         self,
@@ -339,28 +1658,78 @@ class SessionManager:
             True if session was created
         """
         redis = await get_redis()
-        key = f"session:{session_id}"
         ttl = ttl or self.session_ttl
         
-        return await redis.setex(key, ttl, json.dumps(data))
+        args: List[Any] = [ttl]
+        for field, value in self._encode_fields(data).items():
+            args.extend([field, value])
+        await self._create(redis, [self._key(session_id)], args)
+        
+        await self._forget(session_id)
+        return True
     
-    async def get_session(self, session_id: str) -> Optional[dict]:
+    async def get_session(
+        self,
+        session_id: str,
+        touch: bool = True,
+        ttl: Optional[int] = None,
+    ) -> Optional[dict]:
         """
         Get session data.
         
         Args:
             session_id: Session identifier
+            touch: Whether to slide the session TTL
+            ttl: TTL to slide to, defaults to the manager's session TTL
             
         Returns:
             Session data or None if not found
         """
+        if self.local_cache is not None:
+            found, cached = self.local_cache.get(session_id)
+            if found:
+                return dict(cached)
+        
+        redis = await get_redis()
+        key = self._key(session_id)
+        
+        if touch:
+            flat = await self._read_and_touch(redis, [key], [ttl or self.session_ttl])
+            raw = dict(zip(flat[::2], flat[1::2]))
+        else:
+            raw = await redis.hgetall(key)
+        
+        if not raw:
+            return None
+        
+        session = {field: json.loads(value) for field, value in raw.items()}
+        if self.local_cache is not None:
+            self.local_cache.set(session_id, session, size=1)
+        return dict(session)
+    
+    async def get_session_field(
+        self,
+        session_id: str,
+        field: str,
+        default: Any = None,
+    ) -> Any:
+        """
+        Get a single session field.
+        
+        Args:
+            session_id: Session identifier
+            field: Field name
+            default: Value returned if the session or field is missing
+            
+        Returns:
+            Field value or default
+        """
         redis = await get_redis()
-        key = f"session:{session_id}"
+        value = await redis.hget(self._key(session_id), field)
         
-        data = await redis.get(key)
-        if data:
-            return json.loads(data)
-        return None
+        if value is None:
+            return default
+        return json.loads(value)
     
     async def update_session(
         self,
@@ -371,19 +1740,50 @@ class SessionManager:
         """
         Update session data.
         
+        Only the given fields are written; other fields are kept.
+        
         Args:
             session_id: Session identifier
-            data: New session data
+            data: Fields to set
             ttl: Time to live in seconds
             
         Returns:
-            True if session was updated
+            True if session was updated, False if it does not exist
         """
         redis = await get_redis()
-        key = f"session:{session_id}"
         ttl = ttl or self.session_ttl
         
-        return await redis.setex(key, ttl, json.dumps(data))
+        args: List[Any] = [ttl]
+        for field, value in self._encode_fields(data).items():
+            args.extend([field, value])
+        
+        if len(args) == 1:
+            updated = await redis.expire(self._key(session_id), ttl)
+        else:
+            updated = await self._update(redis, [self._key(session_id)], args)
+        
+        await self._forget(session_id)
+        return bool(updated)
+    
+    async def delete_session_fields(self, session_id: str, *fields: str) -> int:
+        """
+        Remove fields from a session.
+        
+        Args:
+            session_id: Session identifier
+            *fields: Field names to remove
+            
+        Returns:
+            Number of fields removed
+        """
+        if not fields:
+            return 0
+        
+        redis = await get_redis()
+        removed = await redis.hdel(self._key(session_id), *fields)
+        
+        await self._forget(session_id)
+        return removed
     
     async def delete_session(self, session_id: str) -> bool:
         """
@@ -396,9 +1796,10 @@ class SessionManager:
             True if session was deleted
         """
         redis = await get_redis()
-        key = f"session:{session_id}"
+        deleted = bool(await redis.delete(self._key(session_id)))
         
-        return bool(await redis.delete(key))
+        await self._forget(session_id)
+        return deleted
     
     async def extend_session(
         self,
@@ -416,13 +1817,396 @@ class SessionManager:
             True if session was extended
         """
         redis = await get_redis()
-        key = f"session:{session_id}"
         ttl = ttl or self.session_ttl
         
-        return bool(await redis.expire(key, ttl))
+        return bool(await redis.expire(self._key(session_id), ttl))
+    
+    def _key(self, session_id: str) -> str:
+        return f"session:{session_id}"
+    
+    def _encode_fields(self, data: dict) -> Dict[str, str]:
+        return {field: json.dumps(value) for field, value in data.items()}
+    
+    async def _forget(self, session_id: str) -> None:
+        if self.local_cache is None:
+            return
+        if self.invalidations is None:
+            # Other workers' copies expire within SESSION_LOCAL_CACHE_TTL
+            self.local_cache.delete(session_id)
+            return
+        await self.invalidations.invalidate_shared("sessions", [session_id])
+
+
+# Distributed locking and leader election
+
+# Extends a lock only if it is still held by the caller's token
+EXTEND_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Records the fencing token of a task run; a token below the highest
+# one recorded belongs to a holder whose lease has since been taken over
+FENCE_SCRIPT = """
+local highest = tonumber(redis.call("GET", KEYS[1]) or "0")
+if tonumber(ARGV[1]) < highest then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[1])
+return 1
+"""
+
+_extend_lock_script = LuaScript(EXTEND_LOCK_SCRIPT)
+_fence_script = LuaScript(FENCE_SCRIPT)
+_release_lock_script = LuaScript(RELEASE_LOCK_SCRIPT)
+
+LOCK_WAIT_SECONDS = Histogram(
+    "redis_lock_wait_seconds",
+    "Time spent waiting to acquire a distributed lock",
+    ["name", "outcome"],
+)
+LOCK_HOLD_SECONDS = Histogram(
+    "redis_lock_hold_seconds",
+    "Time a distributed lock was held",
+    ["name"],
+)
+LOCK_CONTENDED_TOTAL = Counter(
+    "redis_lock_contended_total",
+    "Lock acquisition attempts that found the lock already held",
+    ["name"],
+)
+
+
+class LockNotAcquiredError(Exception):
+    """Raised when a distributed lock cannot be acquired in time."""
+
+
+class DistributedLock:
+    """
+    Redlock-style distributed lock.
+    
+    The lock is taken on a majority of independent Redis masters
+    (LOCK_REDIS_URLS), or on the main Redis deployment when none are
+    configured. While held, the lock is renewed in the background; if
+    renewal loses the quorum, `lost` is set and the holder must stop.
+    
+    Each acquisition also takes a fencing token from a single counter
+    on the main Redis deployment. The token is drawn after the quorum
+    and only counts if it arrives while the lease is still valid, so
+    a later holder always gets a larger token than an earlier one.
+    Storage that records the highest token it has seen can reject
+    writes from a holder that was paused past its lease.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[int] = None,
+        auto_renew: bool = True,
+    ):
+        self.name = name
+        self.ttl = ttl or settings.LOCK_TTL
+        self.auto_renew = auto_renew
+        self.token: Optional[str] = None
+        self.fencing_token: Optional[int] = None
+        self.lost = asyncio.Event()
+        self._key = f"lock:{{{name}}}"
+        self._fence_key = f"lock:{{{name}}}:fence"
+        self._acquired_at: Optional[float] = None
+        self._renew_task: Optional[asyncio.Task] = None
+    
+    @property
+    def held(self) -> bool:
+        return self.token is not None and not self.lost.is_set()
+    
+    async def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Acquire the lock.
+        
+        Args:
+            blocking: Retry until timeout instead of trying once
+            timeout: Seconds to keep retrying (defaults to LOCK_TIMEOUT)
+            
+        Returns:
+            The fencing token if the lock was acquired, None otherwise
+        """
+        clients = await get_lock_clients()
+        quorum = len(clients) // 2 + 1
+        ttl_ms = self.ttl * 1000
+        timeout = settings.LOCK_TIMEOUT if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        contended = False
+        
+        while True:
+            token = uuid.uuid4().hex
+            attempt_started = time.monotonic()
+            results = await asyncio.gather(
+                *[self._acquire_on(client, token, ttl_ms) for client in clients]
+            )
+            fencing_token = await self._next_fencing_token() if sum(results) >= quorum else None
+            
+            # Validity left after the round trips, minus an allowance for clock drift.
+            # The fencing token is only trusted if it was drawn inside the lease
+            elapsed_ms = (time.monotonic() - attempt_started) * 1000
+            validity_ms = ttl_ms - elapsed_ms - (ttl_ms * 0.01 + 2)
+            
+            if fencing_token is not None and validity_ms > 0:
+                self.token = token
+                self.fencing_token = fencing_token
+                self.lost.clear()
+                self._acquired_at = time.monotonic()
+                LOCK_WAIT_SECONDS.labels(self.name, "acquired").observe(self._acquired_at - started)
+                if self.auto_renew:
+                    self._renew_task = asyncio.create_task(self._renew())
+                return fencing_token
+            
+            # Undo a partial acquisition so other contenders can get a quorum
+            await self._release_on_all(clients, token)
+            
+            if not contended:
+                contended = True
+                LOCK_CONTENDED_TOTAL.labels(self.name).inc()
+            
+            if not blocking or time.monotonic() >= deadline:
+                LOCK_WAIT_SECONDS.labels(self.name, "timeout").observe(time.monotonic() - started)
+                return None
+            
+            await asyncio.sleep(random.uniform(0.05, 0.2))
+    
+    async def extend(self) -> bool:
+        """
+        Reset the lock TTL.
+        
+        Returns:
+            True if the lock is still held on a quorum of masters
+        """
+        if self.token is None:
+            return False
+        
+        clients = await get_lock_clients()
+        results = await asyncio.gather(
+            *[self._extend_on(client, self.token) for client in clients]
+        )
+        return sum(results) >= len(clients) // 2 + 1
+    
+    async def release(self) -> None:
+        """Release the lock if held."""
+        if self.token is None:
+            return
+        
+        if self._renew_task is not None:
+            self._renew_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._renew_task
+            self._renew_task = None
+        
+        await self._release_on_all(await get_lock_clients(), self.token)
+        LOCK_HOLD_SECONDS.labels(self.name).observe(time.monotonic() - self._acquired_at)
+        self.token = None
+        self.fencing_token = None
+    
+    async def __aenter__(self) -> "DistributedLock":
+        if not await self.acquire():
+            raise LockNotAcquiredError(f"Could not acquire lock {self.name}")
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.release()
+    
+    async def _renew(self) -> None:
+        interval = self.ttl / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self.extend()
+            except Exception as e:
+                logger.warning(f"Lock {self.name} renewal failed: {e}")
+                renewed = False
+            
+            if not renewed:
+                logger.warning(f"Lock {self.name} lost")
+                self.lost.set()
+                return
+    
+    async def _next_fencing_token(self) -> Optional[int]:
+        # One counter on one deployment, so tokens are totally ordered;
+        # it never expires and is only bumped after a quorum
+        try:
+            redis = await get_redis()
+            return int(await redis.incr(self._fence_key))
+        except Exception as e:
+            logger.warning(f"Lock {self.name} could not draw a fencing token: {e}")
+            return None
+    
+    async def _acquire_on(self, client: Redis, token: str, ttl_ms: int) -> bool:
+        try:
+            return bool(await client.set(self._key, token, nx=True, px=ttl_ms))
+        except Exception as e:
+            logger.warning(f"Lock {self.name} acquire failed on one instance: {e}")
+            return False
+    
+    async def _extend_on(self, client: Redis, token: str) -> bool:
+        try:
+            return bool(await _extend_lock_script(client, [self._key], [token, self.ttl * 1000]))
+        except Exception:
+            return False
+    
+    async def _release_on_all(self, clients: List[Redis], token: str) -> None:
+        async def release_on(client: Redis) -> None:
+            with suppress(Exception):
+                await _release_lock_script(client, [self._key], [token])
+        
+        await asyncio.gather(*[release_on(client) for client in clients])
+
+
+class LeaderElection:
+    """
+    Lease-based leader election for periodic work.
+    
+    Every worker runs an election loop; the one holding the leader
+    lock runs the scheduled tasks, so each task runs on exactly one
+    worker. Leadership is renewed with the lock and given up if the
+    lease is lost, at which point another worker takes over.
+    
+    Before each run the leader records its fencing token on the main
+    Redis deployment and steps down if a newer leader has already
+    recorded a larger one, so a leader paused past its lease never
+    starts a task again. Tasks receive the token to pass on to
+    storage that should reject writes from earlier leaders.
+    """
+    
+    def __init__(self, name: str = "scheduler", lease_ttl: Optional[int] = None):
+        self.name = name
+        self.lease_ttl = lease_ttl or settings.LEADER_LEASE_TTL
+        self._tasks: Dict[str, Tuple[float, Callable[[int], Awaitable[Any]]]] = {}
+        self._lock: Optional[DistributedLock] = None
+        self._fence_key = f"leader:{{{name}}}:fence"
+        self._loop_task: Optional[asyncio.Task] = None
+    
+    @property
+    def is_leader(self) -> bool:
+        return self._lock is not None and self._lock.held
+    
+    @property
+    def fencing_token(self) -> Optional[int]:
+        return self._lock.fencing_token if self.is_leader else None
+    
+    def schedule(
+        self,
+        name: str,
+        interval: float,
+    ) -> Callable[[Callable[[int], Awaitable[Any]]], Callable[[int], Awaitable[Any]]]:
+        """
+        Register a coroutine function to run periodically on the leader.
+        
+        The function is called with the leader's fencing token.
+        
+        Args:
+            name: Task name
+            interval: Seconds between runs
+            
+        Returns:
+            Decorator registering the task
+        """
+        def decorator(func: Callable[[int], Awaitable[Any]]) -> Callable[[int], Awaitable[Any]]:
+            self._tasks[name] = (interval, func)
+            return func
+        
+        return decorator
+    
+    async def start(self) -> None:
+        """Start taking part in the election."""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the election loop and give up leadership."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._loop_task
+            self._loop_task = None
+    
+    async def _run(self) -> None:
+        while True:
+            lock = DistributedLock(f"leader:{self.name}", ttl=self.lease_ttl)
+            try:
+                acquired = await lock.acquire(blocking=False)
+            except Exception as e:
+                logger.warning(f"Leader election {self.name} failed: {e}")
+                acquired = False
+            
+            if not acquired:
+                await asyncio.sleep(self.lease_ttl / 2)
+                continue
+            
+            self._lock = lock
+            logger.info(f"Became leader for {self.name} (fencing token {lock.fencing_token})")
+            try:
+                await self._lead(lock)
+            finally:
+                self._lock = None
+                with suppress(Exception):
+                    await lock.release()
+                logger.info(f"Stepped down as leader for {self.name}")
+            # Leave the lease to whoever superseded this worker
+            await asyncio.sleep(self.lease_ttl / 2)
+    
+    async def _lead(self, lock: DistributedLock) -> None:
+        next_run = {name: time.monotonic() for name in self._tasks}
+        
+        while not lock.lost.is_set():
+            now = time.monotonic()
+            for name, (interval, func) in self._tasks.items():
+                if now < next_run[name]:
+                    continue
+                next_run[name] = now + interval
+                if not await self._fence(lock):
+                    logger.warning(f"Leader {self.name} was superseded, stepping down")
+                    lock.lost.set()
+                    return
+                try:
+                    await func(lock.fencing_token)
+                except Exception as e:
+                    logger.exception(f"Scheduled task {name} failed: {e}")
+            
+            next_due = min(next_run.values(), default=now + 1)
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(lock.lost.wait(), timeout=max(0.1, next_due - time.monotonic()))
+    
+    async def _fence(self, lock: DistributedLock) -> bool:
+        try:
+            redis = await get_redis()
+            return bool(await _fence_script(redis, [self._fence_key], [lock.fencing_token]))
+        except Exception as e:
+            # Without the check this leader cannot tell it is still the newest
+            logger.warning(f"Leader {self.name} could not record its fencing token: {e}")
+            return False
 
 
 # Global instances
-cache_manager = CacheManager()
+cache_manager = CacheManager(
+    serializer=CacheSerializer(
+        format=settings.CACHE_SERIALIZER,
+        compression=settings.CACHE_COMPRESSION,
+        compression_threshold=settings.CACHE_COMPRESSION_THRESHOLD,
+    ),
+    local_cache=LocalCache(
+        max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+        max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+        default_ttl=settings.CACHE_LOCAL_TTL,
+    ) if settings.CACHE_LOCAL_ENABLED else None,
+    tracking_prefixes=settings.CACHE_TRACKING_PREFIXES if settings.CACHE_CLIENT_TRACKING else None,
+)
 rate_limiter = RateLimiter()
-session_manager = SessionManager()
+session_manager = SessionManager(
+    local_cache=LocalCache(
+        max_entries=settings.SESSION_LOCAL_CACHE_MAX_ENTRIES,
+        default_ttl=settings.SESSION_LOCAL_CACHE_TTL,
+    ) if settings.SESSION_LOCAL_CACHE_TTL > 0 else None,
+    invalidations=cache_manager,
+)
+leader_election = LeaderElection()
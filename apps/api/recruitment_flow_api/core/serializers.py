@@ -0,0 +1,211 @@
+"""
+Cache value serialization.
+
+This module provides the codecs used by the cache layer to turn
+Python values into bytes and back. Every encoded value starts with a
+header byte identifying its format and compression, so readers can
+decode values written with any codec configuration.
+"""
+
+import dataclasses
+import enum
+import json
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Union
+
+from recruitment_flow_api.core.logging import get_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# Logger
+logger = get_logger("serializers")
+
+# Header byte layout: low bits select the format, higher bits the compression.
+# Legacy values (plain JSON text) always start with a printable character,
+# so any first byte at or below MAX_HEADER marks a headered value.
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FORMAT_MASK = 0x03
+COMPRESSION_ZSTD = 0x04
+COMPRESSION_LZ4 = 0x08
+MAX_HEADER = 0x0F
+
+FORMATS = {
+    "json": FORMAT_JSON,
+    "msgpack": FORMAT_MSGPACK,
+}
+
+COMPRESSIONS = {
+    "none": 0,
+    "zstd": COMPRESSION_ZSTD,
+    "lz4": COMPRESSION_LZ4,
+}
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Encode the non-JSON types orjson supports natively, the way orjson does.
+    
+    Also used for msgpack, so every format accepts the same values.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class CacheSerializer:
+    """
+    Pluggable serializer for cache values.
+    
+    Encodes with JSON (orjson when installed) or msgpack, and
+    compresses values above a size threshold with zstd or lz4.
+    Decoding is driven by the header byte, so any serializer can read
+    values written by any other, as well as legacy un-headered JSON.
+    """
+    
+    def __init__(
+        self,
+        format: str = "json",
+        compression: str = "none",
+        compression_threshold: int = 1024,
+        compression_level: int = 3,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown cache serializer format: {format}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        
+        if format == "msgpack" and msgpack is None:
+            logger.warning("msgpack is not installed, falling back to JSON cache values")
+            format = "json"
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, cache compression disabled")
+            compression = "none"
+        if compression == "lz4" and lz4_frame is None:
+            logger.warning("lz4 is not installed, cache compression disabled")
+            compression = "none"
+        
+        self.format = format
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        
+        self._zstd_compressor = (
+            zstandard.ZstdCompressor(level=compression_level)
+            if compression == "zstd" else None
+        )
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+    
+    def dumps(self, value: Any) -> bytes:
+        """
+        Encode a value.
+        
+        Args:
+            value: Value to encode
+            
+        Returns:
+            Header byte followed by the (possibly compressed) payload
+        """
+        header = FORMATS[self.format]
+        
+        if header == FORMAT_MSGPACK:
+            body = msgpack.packb(value, use_bin_type=True, default=_json_default)
+        elif orjson is not None:
+            body = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            # Same bytes as orjson: compact, UTF-8, ISO 8601 dates
+            body = json.dumps(
+                value,
+                default=_json_default,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+        
+        if self.compression != "none" and len(body) >= self.compression_threshold:
+            if self.compression == "zstd":
+                compressed = self._zstd_compressor.compress(body)
+            else:
+                compressed = lz4_frame.compress(body, compression_level=self.compression_level)
+            
+            # Incompressible payloads are stored as-is
+            if len(compressed) < len(body):
+                header |= COMPRESSIONS[self.compression]
+                body = compressed
+        
+        return bytes([header]) + body
+    
+    def loads(self, raw: Union[bytes, str]) -> Any:
+        """
+        Decode a value written by any serializer.
+        
+        Un-headered values are treated as legacy JSON and returned
+        unchanged (as text where possible) if they do not parse.
+        
+        Args:
+            raw: Raw value read from Redis
+            
+        Returns:
+            Decoded value
+        """
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        
+        if not raw or raw[0] > MAX_HEADER:
+            return self._loads_legacy(raw)
+        
+        header = raw[0]
+        body = raw[1:]
+        
+        if header & COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                raise RuntimeError("zstandard is required to decode this cache value")
+            body = self._zstd_decompressor.decompress(body)
+        elif header & COMPRESSION_LZ4:
+            if lz4_frame is None:
+                raise RuntimeError("lz4 is required to decode this cache value")
+            body = lz4_frame.decompress(body)
+        
+        if header & FORMAT_MASK == FORMAT_MSGPACK:
+            if msgpack is None:
+                raise RuntimeError("msgpack is required to decode this cache value")
+            return msgpack.unpackb(body, raw=False)
+        
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+    
+    def _loads_legacy(self, raw: bytes) -> Any:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            pass
+        
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return raw
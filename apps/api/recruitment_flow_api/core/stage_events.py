@@ -0,0 +1,68 @@
+"""
+Candidate stage event log.
+
+Every candidate status transition is appended to an event log in the
+same commit as the change, giving analytics the full history that the
+candidates table (current status only) and the pipeline-stage
+counters (daily totals) cannot provide:
+    
+    CREATE TABLE candidate_stage_events (
+        id bigserial PRIMARY KEY,
+        organization_id text NOT NULL,
+        candidate_id text NOT NULL,
+        role_id text,
+        source text,
+        from_status text,
+        to_status text,
+        occurred_at timestamptz NOT NULL DEFAULT now()
+    );
+    CREATE INDEX candidate_stage_events_org_id
+        ON candidate_stage_events (organization_id, id);
+    REVOKE UPDATE, DELETE ON candidate_stage_events FROM PUBLIC;
+
+The log is append-only: rows are never updated or deleted, so readers
+can load it incrementally by ID. from_status is NULL for a new
+candidate and to_status is NULL for a deleted one.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from recruitment_flow_api.core.config import TABLES
+from recruitment_flow_api.core.database import UnitOfWork
+
+
+def append_stage_event(
+    uow: UnitOfWork,
+    organization_id: str,
+    candidate_id: str,
+    role_id: Optional[str],
+    source: Optional[str],
+    from_status: Optional[str],
+    to_status: Optional[str],
+    occurred_at: Optional[datetime] = None,
+) -> None:
+    """
+    Queue a stage event in the unit of work changing the candidate.
+    
+    Args:
+        uow: Unit of work changing the candidate
+        organization_id: Candidate's organization
+        candidate_id: Candidate ID
+        role_id: Candidate's role
+        source: Candidate's source
+        from_status: Status before the change
+        to_status: Status after the change
+        occurred_at: Time of the transition (defaults to the commit's now())
+    """
+    row = {
+        "organization_id": organization_id,
+        "candidate_id": candidate_id,
+        "role_id": role_id,
+        "source": source,
+        "from_status": from_status,
+        "to_status": to_status,
+    }
+    if occurred_at is not None:
+        row["occurred_at"] = occurred_at
+    uow.stage(TABLES["candidate_stage_events"], row)
@@ -19,8 +19,21 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from recruitment_flow_api.core.config import settings
 from recruitment_flow_api.core.logging import setup_logging
 from recruitment_flow_api.api.v1.api import api_router
-from recruitment_flow_api.core.database import init_db, close_db
-from recruitment_flow_api.core.redis import init_redis, close_redis
+from recruitment_flow_api.core.database import init_db, close_db, replica_router
+from recruitment_flow_api.core.middleware import (
+    QueryTrackingMiddleware,
+    RateLimitMiddleware,
+    RequestDeadlineMiddleware,
+)
+from recruitment_flow_api.core.pagination import InvalidCursorError
+from recruitment_flow_api.core.redis import (
+    init_redis,
+    close_redis,
+    cache_manager,
+    leader_election,
+    rate_limiter,
+    session_manager,
+)
 
 # Setup logging
 setup_logging()
@@ -45,11 +58,33 @@ async def lifespan(app: FastAPI):
     await init_redis()
     logger.info("Redis connection initialized")
     
+    # Route read-only requests to replicas within the lag threshold
+    await replica_router.start()
+    
+    # Preload Lua scripts so requests only need EVALSHA
+    await rate_limiter.load_scripts()
+    await session_manager.load_scripts()
+    
+    # Start cross-worker cache invalidation
+    await cache_manager.start_invalidation_listener()
+    
+    # Run scheduled jobs on exactly one worker
+    await leader_election.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Recruitment Flow AI API...")
     
+    # Give up leadership so another worker takes over promptly
+    await leader_election.stop()
+    
+    # Stop replica lag monitoring
+    await replica_router.stop()
+    
+    # Stop cache invalidation listener
+    await cache_manager.stop_invalidation_listener()
+    
     # Close Redis connection
     await close_redis()
     logger.info("Redis connection closed")
@@ -79,6 +114,16 @@ def create_application() -> FastAPI:
         lifespan=lifespan,
     )
     
+    # Count database statements per request for N+1 detection
+    app.add_middleware(QueryTrackingMiddleware)
+    
+    # Give each request a deadline that bounds database retries
+    app.add_middleware(RequestDeadlineMiddleware)
+    
+    # Add rate limiting middleware (so 429s still get CORS headers)
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(RateLimitMiddleware)
+    
     # Add CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -106,6 +151,10 @@ def create_application() -> FastAPI:
         RequestValidationError,
         validation_exception_handler,
     )
+    app.add_exception_handler(
+        InvalidCursorError,
+        invalid_cursor_exception_handler,
+    )
     
     return app
 
@@ -172,6 +221,32 @@ async def validation_exception_handler(
     )
 
 
+async def invalid_cursor_exception_handler(
+    request: Request,
+    exc: InvalidCursorError,
+) -> JSONResponse:
+    """
+    Handle invalid pagination cursors.
+    
+    Args:
+        request: The incoming request
+        exc: The cursor error
+        
+    Returns:
+        JSONResponse: Error response
+    """
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={
+            "error": {
+                "type": "invalid_cursor",
+                "message": str(exc),
+                "status_code": status.HTTP_400_BAD_REQUEST,
+            }
+        },
+    )
+
+
 # Create the application instance
 app = create_application()
 
@@ -0,0 +1,58 @@
+"""
+Background job worker for Recruitment Flow AI.
+
+This module runs the job queue consumer and the outbox relay.
+Start as many worker processes as throughput requires alongside
+the API:
+    
+    python -m recruitment_flow_api.worker
+"""
+
+import asyncio
+import logging
+import signal
+
+from recruitment_flow_api.core.logging import setup_logging
+from recruitment_flow_api.core.database import close_db
+from recruitment_flow_api.core.jobs import job_queue
+from recruitment_flow_api.core.outbox import outbox_relay
+from recruitment_flow_api.core.redis import init_redis, close_redis
+
+# Importing these modules registers their job handlers
+from recruitment_flow_api.api.v1 import candidates  # noqa: F401
+from recruitment_flow_api.core import eeo_rollups  # noqa: F401
+
+# Setup logging
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Run the worker until SIGINT or SIGTERM."""
+    await init_redis()
+    logger.info("Redis connection initialized")
+    
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    
+    try:
+        await asyncio.gather(
+            job_queue.run_worker(stop_event=stop_event),
+            outbox_relay.run(stop_event=stop_event),
+        )
+    finally:
+        await close_redis()
+        logger.info("Redis connection closed")
+        await close_db()
+        logger.info("Database connection closed")
+
+
+def run() -> None:
+    """Console script entry point."""
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
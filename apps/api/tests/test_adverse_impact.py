@@ -0,0 +1,123 @@
+"""
+Tests for the adverse impact statistics.
+
+Expected values were computed with scipy.stats (fisher_exact,
+chi2_contingency with Yates' correction, norm and chi2 tails) and are
+fixed here so the suite only needs NumPy.
+"""
+
+import numpy as np
+import pytest
+
+from recruitment_flow_api.core.adverse_impact import (
+    analyze,
+    fisher_exact,
+    pair_index,
+)
+
+# Tail probabilities come from an erfc approximation (relative error < 1.2e-7)
+APPROX = 1e-6
+
+
+@pytest.mark.parametrize(
+    "table, expected",
+    [
+        ([[3, 2], [1, 4]], 0.5238095238095238),
+        ([[8, 2], [1, 5]], 0.034965034965034975),
+        ([[120, 380], [80, 420]], 0.0019987507847553537),
+        ([[0, 10], [5, 5]], 0.032507739938080496),
+    ],
+)
+def test_fisher_exact_matches_reference(table, expected):
+    (a, b), (c, d) = table
+    p_value = fisher_exact(np.array([a]), np.array([b]), np.array([c]), np.array([d]))
+    assert p_value[0] == pytest.approx(expected, rel=1e-9)
+
+
+def test_fisher_exact_keeps_shape_and_batches():
+    a = np.array([[3, 8], [120, 0]])
+    b = np.array([[2, 2], [380, 10]])
+    c = np.array([[1, 1], [80, 5]])
+    d = np.array([[4, 5], [420, 5]])
+    p_values = fisher_exact(a, b, c, d)
+    assert p_values.shape == (2, 2)
+    assert p_values == pytest.approx(
+        np.array([[0.5238095238095238, 0.034965034965034975], [0.0019987507847553537, 0.032507739938080496]]),
+        rel=1e-9,
+    )
+
+
+def test_fisher_exact_is_nan_for_empty_margins_and_negative_cells():
+    p_values = fisher_exact(
+        np.array([0, 5, 0, 5]),
+        np.array([0, 5, 5, -2]),
+        np.array([3, 0, 0, 1]),
+        np.array([4, 0, 5, 4]),
+    )
+    assert np.isnan(p_values).all()
+
+
+def test_analyze_two_proportion_tests():
+    result = analyze([[100, 100]], [[30, 15]])
+    assert result["selection_rates"][0] == pytest.approx([0.3, 0.15])
+    assert result["impact_ratios"][0] == pytest.approx([1.0, 0.5])
+    assert result["four_fifths_violations"][0].tolist() == [False, True]
+    assert result["z"][0, 0] == pytest.approx(2.5400025400038095, rel=1e-12)
+    assert result["z_p_values"][0, 0] == pytest.approx(0.011085166380602711, rel=APPROX)
+    assert result["chi_square"][0, 0] == pytest.approx(5.6200716845878125, rel=1e-12)
+    assert result["chi_square_p_values"][0, 0] == pytest.approx(0.01775592261403611, rel=APPROX)
+
+
+def test_analyze_cochran_mantel_haenszel():
+    result = analyze([[100, 100], [50, 50]], [[30, 15], [10, 5]])
+    assert result["cmh_chi_square"][0] == pytest.approx(7.531968228752978, rel=1e-12)
+    assert result["cmh_p_values"][0] == pytest.approx(0.006061365123190436, rel=APPROX)
+
+
+def test_analyze_group_without_applicants():
+    result = analyze([[100, 0, 100]], [[30, 0, 15]])
+    assert np.isnan(result["selection_rates"][0, 1])
+    assert np.isnan(result["impact_ratios"][0, 1])
+    # Pairs are (0, 1), (0, 2), (1, 2); only (0, 2) avoids the empty group
+    for name in ("z", "chi_square", "fisher_p_values"):
+        assert np.isnan(result[name][0, [0, 2]]).all()
+        assert not np.isnan(result[name][0, 1])
+
+
+def test_analyze_without_selections():
+    result = analyze([[100, 100]], [[0, 0]])
+    assert result["selection_rates"][0].tolist() == [0.0, 0.0]
+    assert np.isnan(result["impact_ratios"]).all()
+    for name in ("z", "z_p_values", "chi_square", "chi_square_p_values", "fisher_p_values", "cmh_p_values"):
+        assert np.isnan(result[name]).all()
+
+
+def test_analyze_single_group():
+    result = analyze([[100]], [[30]])
+    assert result["impact_ratios"][0].tolist() == [1.0]
+    assert result["pairs"].shape == (2, 0)
+    assert result["fisher_p_values"].shape == (1, 0)
+    assert result["cmh_p_values"].shape == (0,)
+
+
+def test_analyze_treats_impossible_cells_as_empty():
+    result = analyze([[10, 10, 5]], [[12, 3, -1]])
+    assert np.isnan(result["selection_rates"][0, [0, 2]]).all()
+    assert result["selection_rates"][0, 1] == pytest.approx(0.3)
+    for name in ("z", "chi_square", "fisher_p_values"):
+        assert np.isnan(result[name]).all()
+
+
+def test_p_values_stay_within_unit_interval():
+    result = analyze([[50, 50], [40, 40]], [[10, 10], [8, 8]])
+    for name in ("z_p_values", "chi_square_p_values", "fisher_p_values", "cmh_p_values"):
+        values = result[name][~np.isnan(result[name])]
+        assert ((values >= 0) & (values <= 1)).all()
+
+
+@pytest.mark.parametrize("n_groups", [2, 3, 5, 9])
+def test_pair_index_follows_triu_order(n_groups):
+    first, second = np.triu_indices(n_groups, k=1)
+    positions = np.arange(len(first))
+    assert pair_index(n_groups, first, second).tolist() == positions.tolist()
+    assert pair_index(n_groups, second, first).tolist() == positions.tolist()
@@ -0,0 +1,83 @@
+"""
+Tests for the Redis Streams job queue.
+"""
+
+import asyncio
+import types
+
+from recruitment_flow_api.core import jobs
+from recruitment_flow_api.core.jobs import JobQueue
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+    
+    async def execute(self):
+        for name, args, kwargs in self.commands:
+            await getattr(self.redis, name)(*args, **kwargs)
+
+
+class FakeRedis:
+    """Just enough of a Redis client for JobQueue._process."""
+    
+    def __init__(self, job):
+        self.hashes = {}
+        self.job = job
+        self.acked = []
+        self.heartbeats = 0
+        self.heartbeat_failed = asyncio.Event()
+    
+    async def hgetall(self, key):
+        return dict(self.job)
+    
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+    
+    async def hdel(self, key, *fields):
+        pass
+    
+    async def expire(self, key, ttl):
+        pass
+    
+    async def xack(self, stream, group, message_id):
+        self.acked.append(message_id)
+    
+    async def xclaim(self, *args, **kwargs):
+        self.heartbeats += 1
+        self.heartbeat_failed.set()
+        raise ConnectionError("connection reset")
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+async def test_heartbeat_failure_does_not_fail_the_job(monkeypatch):
+    # Beat without waiting out the visibility timeout
+    sleep = asyncio.sleep
+    monkeypatch.setattr(jobs, "asyncio", types.SimpleNamespace(
+        **{name: getattr(asyncio, name) for name in ("CancelledError", "create_task", "Event")},
+        sleep=lambda delay: sleep(0),
+    ))
+    redis = FakeRedis({"type": "report", "status": "pending", "attempts": "0", "max_attempts": "3", "payload": "{}"})
+    queue = JobQueue()
+    
+    @queue.handler("report")
+    async def handler(payload):
+        # Keep running through two failed beats
+        for _ in range(2):
+            redis.heartbeat_failed.clear()
+            await asyncio.wait_for(redis.heartbeat_failed.wait(), timeout=1)
+        return {"ok": True}
+    
+    await queue._process(redis, "worker-1", "default", "1-0", "job-1")
+    
+    job = redis.hashes[queue._job_key("job-1")]
+    assert redis.heartbeats > 1
+    assert job["status"] == "succeeded"
+    assert job["result"] == '{"ok": true}'
+    assert redis.acked == ["1-0"]
@@ -0,0 +1,52 @@
+"""
+Tests for the leased rate limiting middleware.
+"""
+
+import asyncio
+
+from recruitment_flow_api.core.middleware import RateLimitMiddleware
+from recruitment_flow_api.core.redis import RateLimitResult
+
+
+class FakeLimiter:
+    """Fixed budget that, like the Redis limiter, never refunds claimed tokens."""
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self.claimed = 0
+        self.calls = 0
+    
+    async def check(self, identifier, cost=1):
+        self.calls += 1
+        allowed = self.claimed + cost <= self.limit
+        if allowed:
+            self.claimed += cost
+        return RateLimitResult(allowed=allowed, limit=self.limit, remaining=self.limit - self.claimed, reset=60)
+
+
+def middleware(limiter):
+    return RateLimitMiddleware(None, limiter=limiter, lease_size=10, lease_ttl=0.05, route_costs={})
+
+
+async def test_sparse_client_is_not_throttled():
+    limiter = FakeLimiter(limit=20)
+    rate_limit = middleware(limiter)
+    
+    # One request per lease TTL; claiming full leases would exhaust the budget after two
+    for _ in range(10):
+        result = await rate_limit._acquire("client", 1)
+        assert result.allowed
+        await asyncio.sleep(0.06)
+    
+    assert limiter.claimed == 10
+
+
+async def test_busy_client_spends_from_leases():
+    limiter = FakeLimiter(limit=1000)
+    rate_limit = middleware(limiter)
+    
+    for _ in range(100):
+        assert (await rate_limit._acquire("client", 1)).allowed
+    
+    assert limiter.calls < 30
+    assert limiter.claimed <= 100 + 10
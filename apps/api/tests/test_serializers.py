@@ -0,0 +1,84 @@
+"""
+Tests for the cache value serializers.
+"""
+
+import enum
+import uuid
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from recruitment_flow_api.core import serializers
+from recruitment_flow_api.core.serializers import CacheSerializer
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+VALUE = {
+    "aware": datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+    "naive": datetime(2024, 1, 2, 3, 4, 5),
+    "day": date(2024, 1, 2),
+    "time": time(1, 2, 3),
+    "id": uuid.UUID(int=5),
+    "color": Color.RED,
+    "name": "Zoë",
+    "items": [1, 2.5, None, True],
+}
+
+EXPECTED = (
+    b'\x01{"aware":"2024-01-02T03:04:05.000678+00:00","naive":"2024-01-02T03:04:05",'
+    b'"day":"2024-01-02","time":"01:02:03","id":"00000000-0000-0000-0000-000000000005",'
+    b'"color":"red","name":"Zo\xc3\xab","items":[1,2.5,null,true]}'
+)
+
+
+def test_stdlib_json_matches_orjson_output(monkeypatch):
+    monkeypatch.setattr(serializers, "orjson", None)
+    assert CacheSerializer().dumps(VALUE) == EXPECTED
+
+
+def test_orjson_output():
+    pytest.importorskip("orjson")
+    assert CacheSerializer().dumps(VALUE) == EXPECTED
+
+
+# VALUE as any format decodes it
+DECODED = {
+    "aware": "2024-01-02T03:04:05.000678+00:00",
+    "naive": "2024-01-02T03:04:05",
+    "day": "2024-01-02",
+    "time": "01:02:03",
+    "id": "00000000-0000-0000-0000-000000000005",
+    "color": "red",
+    "name": "Zoë",
+    "items": [1, 2.5, None, True],
+}
+
+
+@pytest.mark.parametrize(
+    "format, compression, module",
+    [
+        ("json", "none", None),
+        ("json", "zstd", "zstandard"),
+        ("json", "lz4", "lz4.frame"),
+        ("msgpack", "none", None),
+        ("msgpack", "zstd", "zstandard"),
+        ("msgpack", "lz4", "lz4.frame"),
+    ],
+)
+def test_mixed_types_round_trip_through_every_format(format, compression, module):
+    if module is not None:
+        pytest.importorskip(module)
+    if format == "msgpack":
+        pytest.importorskip("msgpack")
+    serializer = CacheSerializer(format=format, compression=compression, compression_threshold=0)
+    value = {**VALUE, "padding": "x" * 512}
+    assert serializer.loads(serializer.dumps(value)) == {**DECODED, "padding": "x" * 512}
+
+
+def test_stdlib_json_rejects_unknown_types(monkeypatch):
+    monkeypatch.setattr(serializers, "orjson", None)
+    with pytest.raises(TypeError):
+        CacheSerializer().dumps({"value": object()})